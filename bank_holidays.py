@@ -0,0 +1,114 @@
+# ======================
+# UK BANK HOLIDAYS
+# Offline-first provider: process memory -> disk cache -> gov.uk -> packaged snapshot
+# ======================
+
+import json
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+from ir35_profiling import timed
+from ir35_tax_config import BANK_HOLIDAY_DIVISIONS
+
+# ----------
+# CONSTANTS
+# ----------
+BANK_HOLIDAYS_URL = "https://www.gov.uk/bank-holidays.json"
+REGIONS = ("england-and-wales", "scotland", "northern-ireland")
+DEFAULT_REGION = "england-and-wales"
+
+CACHE_TTL_SECONDS = 24 * 60 * 60
+RETRY_AFTER_SECONDS = 60 * 60
+REQUEST_TIMEOUT_SECONDS = 3.0
+
+SNAPSHOT_PATH = Path(__file__).resolve().parent / "data" / "bank_holidays.json"
+CACHE_PATH = Path(
+    os.environ.get("IR35_CACHE_DIR", Path.home() / ".cache" / "ir35_calculator")
+) / "bank_holidays.json"
+
+# Shared by every Streamlit session in the process
+_lock = threading.Lock()
+_memory = {"holidays": None, "expires_at": 0.0, "source": None}
+
+# ----------
+# LOADING
+# ----------
+def _parse(data):
+    return {
+        region: frozenset(date.fromisoformat(event["date"]) for event in data[region]["events"])
+        for region in REGIONS
+    }
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return _parse(json.load(f))
+
+def _write_cache(data):
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CACHE_PATH.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        pass
+
+def fetch_bank_holidays(timeout=REQUEST_TIMEOUT_SECONDS):
+    import requests
+
+    response = requests.get(BANK_HOLIDAYS_URL, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    holidays = _parse(data)
+    _write_cache(data)
+    return holidays
+
+def _load(ttl, timeout):
+    try:
+        age = time.time() - CACHE_PATH.stat().st_mtime
+        if age < ttl:
+            return _read(CACHE_PATH), "cache", ttl - age
+    except (OSError, ValueError, KeyError):
+        pass
+    try:
+        return fetch_bank_holidays(timeout), "gov.uk", ttl
+    except Exception:
+        pass
+    for path, source in ((CACHE_PATH, "stale cache"), (SNAPSHOT_PATH, "snapshot")):
+        try:
+            return _read(path), source, RETRY_AFTER_SECONDS
+        except (OSError, ValueError, KeyError):
+            continue
+    return {region: frozenset() for region in REGIONS}, "none", RETRY_AFTER_SECONDS
+
+def _store(holidays, source, lifetime):
+    _memory.update(holidays=holidays, source=source, expires_at=time.monotonic() + lifetime)
+
+# ----------
+# PUBLIC API
+# ----------
+@timed("get_bank_holidays")
+def get_bank_holidays(region=DEFAULT_REGION, ttl=CACHE_TTL_SECONDS, timeout=REQUEST_TIMEOUT_SECONDS):
+    if region not in REGIONS:
+        raise ValueError(f"Unknown bank holiday region: {region}")
+    if _memory["holidays"] is None or time.monotonic() >= _memory["expires_at"]:
+        with _lock:
+            if _memory["holidays"] is None or time.monotonic() >= _memory["expires_at"]:
+                _store(*_load(ttl, timeout))
+    return _memory["holidays"][region]
+
+def get_tax_region_holidays(ttl=CACHE_TTL_SECONDS, timeout=REQUEST_TIMEOUT_SECONDS):
+    # Keyed by tax region, for batches that mix Scottish and rUK placements
+    return {region: get_bank_holidays(division, ttl, timeout) for region, division in BANK_HOLIDAY_DIVISIONS.items()}
+
+def refresh_bank_holidays(ttl=CACHE_TTL_SECONDS, timeout=REQUEST_TIMEOUT_SECONDS):
+    holidays = fetch_bank_holidays(timeout)
+    with _lock:
+        _store(holidays, "gov.uk", ttl)
+    return holidays
+
+def bank_holiday_source():
+    return _memory["source"]
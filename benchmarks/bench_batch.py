@@ -0,0 +1,82 @@
+# ======================
+# BENCHMARK: batch engine vs scalar ir35_tax_calculator loop
+# Run: python benchmarks/bench_batch.py [rows]
+# ======================
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_core import ir35_tax_calculator
+from ir35_batch import ir35_tax_calculator_batch
+
+PLANS = ["None", "Plan 1", "Plan 2", "Plan 4", "Plan 5", "Postgraduate Loan"]
+STATUSES = ["Inside IR35", "Outside IR35"]
+
+def make_book(rows, seed=35):
+    rng = np.random.default_rng(seed)
+    return {
+        "pay_rate": rng.uniform(100, 1500, rows).round(2),
+        "working_days": rng.integers(0, 260, rows),
+        "pension_contribution_percent": rng.choice([0.0, 3.0, 5.0, 8.0], rows),
+        "student_loan_plan": rng.choice(PLANS, rows).astype(object),
+        "status": rng.choice(STATUSES, rows).astype(object),
+        "vat_registered": rng.random(rows) < 0.5,
+        "allowable_expenses": rng.choice([0.0, 1500.0, 5000.0], rows),
+        "salary_amount": rng.choice([9100.0, 12570.0, 50270.0], rows),
+        "employer_pension_percent": rng.choice([3.0, 5.0], rows)
+    }
+
+def scalar_loop(book):
+    rows = len(book["pay_rate"])
+    return [
+        ir35_tax_calculator(
+            float(book["pay_rate"][i]),
+            int(book["working_days"][i]),
+            float(book["pension_contribution_percent"][i]),
+            book["student_loan_plan"][i],
+            book["status"][i],
+            bool(book["vat_registered"][i]),
+            float(book["allowable_expenses"][i]),
+            float(book["salary_amount"][i]),
+            float(book["employer_pension_percent"][i])
+        )
+        for i in range(rows)
+    ]
+
+def check_equal(book, scalar_results, batch_results):
+    for i, result in enumerate(scalar_results):
+        assert result["Net Take-Home Pay"] == batch_results["Net Take-Home Pay"][i], i
+        if book["status"][i] == "Inside IR35":
+            for key in ("Income Tax", "Employee NI", "Student Loan Repayment", "Employee Pension"):
+                assert result[key] == batch_results[key][i], (i, key)
+        else:
+            personal = result["Personal Breakdown"]
+            assert personal["Salary Income Tax"] == batch_results["Income Tax"][i], i
+            assert personal["Dividend Tax"] == batch_results["Dividend Tax"][i], i
+            assert personal["Student Loan Repayment"] == batch_results["Student Loan Repayment"][i], i
+            assert result["VAT Amount"] == batch_results["VAT Amount"][i], i
+
+def main(rows=50000):
+    book = make_book(rows)
+
+    start = time.perf_counter()
+    scalar_results = scalar_loop(book)
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_results = ir35_tax_calculator_batch(**book)
+    batch_seconds = time.perf_counter() - start
+
+    check_equal(book, scalar_results, batch_results)
+    print(f"rows:          {rows}")
+    print(f"scalar loop:   {scalar_seconds:.3f}s  ({rows / scalar_seconds:,.0f} rows/s)")
+    print(f"batch engine:  {batch_seconds:.3f}s  ({rows / batch_seconds:,.0f} rows/s)")
+    print(f"speed-up:      {scalar_seconds / batch_seconds:.1f}x (results identical)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,88 @@
+# ======================
+# BENCHMARK: month-end rerun of a placement book with the persistent result cache
+# Run: python benchmarks/bench_cache.py [rows] [--changed 0.05] [--split-tax-years]
+# ======================
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_bulk import run
+from ir35_cache import ResultCache
+
+def make_placements(rows, seed=35):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2025-01-01") + rng.integers(0, 540, rows)
+    return pd.DataFrame({
+        "placement_id": np.arange(rows),
+        "client_rate": rng.uniform(300, 1500, rows).round(2),
+        "start_date": start.astype(str),
+        "end_date": (start + rng.integers(20, 500, rows)).astype(str),
+        "margin_percent": rng.choice([15.0, 20.0, 23.0], rows),
+        "status": rng.choice(["Inside IR35", "Outside IR35"], rows),
+        "student_loan": rng.choice(["None", "Plan 2"], rows),
+        "days_per_week": rng.integers(3, 6, rows)
+    })
+
+def timed_run(input_path, output_path, split_tax_years, cache=None):
+    start = time.perf_counter()
+    run(input_path, output_path, workers=0, split_tax_years=split_tax_years, cache=cache)
+    return time.perf_counter() - start, pd.read_csv(output_path)
+
+def main(rows=200000, changed=0.05, split_tax_years=False):
+    with tempfile.TemporaryDirectory() as directory:
+        book = make_placements(rows)
+        input_path = os.path.join(directory, "placements.csv")
+        book.to_csv(input_path, index=False)
+        cache = ResultCache(os.path.join(directory, "results.sqlite"))
+
+        uncached, expected = timed_run(input_path, os.path.join(directory, "plain.csv"), split_tax_years)
+        cold, first = timed_run(input_path, os.path.join(directory, "cold.csv"), split_tax_years, cache)
+        warm, second = timed_run(input_path, os.path.join(directory, "warm.csv"), split_tax_years, cache)
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected)
+
+        # Month end: new placements are added to the end of the book, so the earlier chunks are unchanged
+        added = make_placements(int(rows * changed), seed=36)
+        added["placement_id"] += rows
+        book = pd.concat([book, added], ignore_index=True)
+        book.to_csv(input_path, index=False)
+        plain_appended, expected = timed_run(input_path, os.path.join(directory, "plain_appended.csv"), split_tax_years)
+        appended, third = timed_run(input_path, os.path.join(directory, "appended.csv"), split_tax_years, cache)
+        pd.testing.assert_frame_equal(third, expected)
+
+        # A share of placements get a new rate, scattered through the book: every chunk changes
+        rng = np.random.default_rng(36)
+        moved = rng.random(len(book)) < changed
+        book.loc[moved, "client_rate"] += 25
+        book.to_csv(input_path, index=False)
+        plain_rerun, expected = timed_run(input_path, os.path.join(directory, "plain_rerun.csv"), split_tax_years)
+        rerun, fourth = timed_run(input_path, os.path.join(directory, "rerun.csv"), split_tax_years, cache)
+        pd.testing.assert_frame_equal(fourth, expected)
+
+        print(f"{rows:,} placements{' split by tax year' if split_tax_years else ''}, {changed:.0%} added or changed")
+        print(f"uncached run        {uncached:8.2f} s")
+        print(f"cache, cold         {cold:8.2f} s")
+        print(f"cache, unchanged    {warm:8.2f} s")
+        print(f"uncached, appended  {plain_appended:8.2f} s")
+        print(f"cache, appended     {appended:8.2f} s")
+        print(f"uncached, scattered {plain_rerun:8.2f} s")
+        print(f"cache, scattered    {rerun:8.2f} s")
+        for name, value in cache.report().items():
+            print(f"  {name:<16} {value}")
+        cache.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="?", type=int, default=200000)
+    parser.add_argument("--changed", type=float, default=0.05)
+    parser.add_argument("--split-tax-years", action="store_true")
+    args = parser.parse_args()
+    main(args.rows, args.changed, args.split_tax_years)
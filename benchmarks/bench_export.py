@@ -0,0 +1,58 @@
+# ======================
+# BENCHMARK: streamed Arrow export vs building one DataFrame and writing it at the end
+# Run: python benchmarks/bench_export.py [rows] [--chunk-size 50000]
+# ======================
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_cache import make_placements
+from bank_holidays import get_bank_holidays
+from ir35_batch import calculate_placements
+from ir35_bulk import read_chunks
+from ir35_export import placement_batches, write_results
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+def main(rows=500000, chunk_size=50000):
+    bank_holidays = get_bank_holidays()
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "placements.csv")
+        make_placements(rows).to_csv(input_path, index=False)
+
+        def whole_frame():
+            calculate_placements(pd.read_csv(input_path), bank_holidays).to_parquet(os.path.join(directory, "frame.parquet"))
+
+        def streamed(suffix):
+            def run():
+                write_results(placement_batches(read_chunks(input_path, chunk_size), bank_holidays),
+                              os.path.join(directory, f"export.{suffix}"))
+            return run
+
+        print(f"{rows:,} placements, {chunk_size:,} per batch")
+        for name, run in [("DataFrame to_parquet", whole_frame), ("streamed Parquet", streamed("parquet")),
+                          ("streamed Feather", streamed("feather"))]:
+            seconds, peak = measure(run)
+            print(f"{name:<22} {seconds:7.2f} s   peak {peak / 1e6:8.1f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="?", type=int, default=500000)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+    main(args.rows, args.chunk_size)
@@ -0,0 +1,40 @@
+# ======================
+# BENCHMARK: cold-start import time of the calculation core
+# Run: python benchmarks/bench_import.py [runs]
+# ======================
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = {
+    "ir35_core (headless)": "import ir35_core",
+    "ir35_calculator (UI)": "import ir35_calculator",
+    "previous top-level imports": (
+        "import streamlit, PIL.Image, fpdf, requests, pandas; import ir35_core"
+    )
+}
+
+def cold_import_seconds(statement, runs):
+    timer = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; "
+        "print(time.perf_counter() - start)"
+    )
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", timer], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+def main(runs=5):
+    for name, statement in STATEMENTS.items():
+        print(f"{name:<28} {cold_import_seconds(statement, runs) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
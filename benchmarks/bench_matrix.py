@@ -0,0 +1,69 @@
+# ======================
+# BENCHMARK: scenario matrix (one batched call) vs a calculate_scenario loop
+# Run: python benchmarks/bench_matrix.py [scenarios]
+# ======================
+
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank_holidays import get_bank_holidays
+from ir35_core import calculate_scenario, calculate_working_days
+from ir35_scenarios import calculate_scenario_matrix
+
+START_DATE = date(2025, 4, 7)
+END_DATE = date(2026, 3, 31)
+
+def make_scenarios(n, seed=35):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "name": [f"Scenario {i + 1}" for i in range(n)],
+        "rate": rng.uniform(300, 1500, n).round(),
+        "margin_percent": rng.choice([15.0, 20.0, 23.0], n),
+        "status": rng.choice(["Inside IR35", "Outside IR35"], n),
+        "employee_pension": rng.choice([0.0, 5.0, 8.0], n),
+        "days_per_week": rng.integers(3, 6, n),
+        "vat_registered": rng.random(n) < 0.5,
+        "outside_salary": rng.choice([9100.0, 12570.0], n)
+    })
+
+def scalar_loop(scenarios, bank_holidays):
+    net = []
+    for row in scenarios.itertuples():
+        outside = row.status == "Outside IR35"
+        working_days = calculate_working_days(START_DATE, END_DATE, int(row.days_per_week), bank_holidays)
+        scenario = calculate_scenario(
+            "Client Rate", row.rate, row.margin_percent, working_days, row.status,
+            0.0 if outside else row.employee_pension, "None", bool(row.vat_registered) and outside,
+            0.0, row.outside_salary
+        )
+        net.append(scenario["Results"]["Net Take-Home Pay"])
+    return net
+
+def main(n=50):
+    bank_holidays = get_bank_holidays()
+    scenarios = make_scenarios(n)
+    # Warm the busday calendar and pandas code paths once, as a long-running app would have
+    calculate_scenario_matrix(scenarios.head(1), START_DATE, END_DATE, bank_holidays)
+
+    start = time.perf_counter()
+    matrix = calculate_scenario_matrix(scenarios, START_DATE, END_DATE, bank_holidays)
+    batched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    net = scalar_loop(scenarios, bank_holidays)
+    looped = time.perf_counter() - start
+
+    assert np.allclose(matrix["Net Take-Home Pay"], net)
+    print(f"{n} scenarios")
+    print(f"scenario matrix      {batched * 1000:8.2f} ms")
+    print(f"calculate_scenario   {looped * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
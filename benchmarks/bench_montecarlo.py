@@ -0,0 +1,33 @@
+# ======================
+# BENCHMARK: Monte Carlo draws per second, inline and in a process pool
+# Run: python benchmarks/bench_montecarlo.py [draws]
+# ======================
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_montecarlo import simulate
+
+def main(draws=1000000):
+    start = time.perf_counter()
+    inline = simulate(800, 20, 220, draws=draws, seed=35)
+    inline_seconds = time.perf_counter() - start
+
+    workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    pooled = simulate(800, 20, 220, draws=draws, seed=35, workers=workers)
+    pool_seconds = time.perf_counter() - start
+
+    # Chunks draw from their own child seeds, so the pool reproduces the inline run exactly
+    assert inline == pooled
+    print(f"draws:             {draws}")
+    print(f"inline:            {inline_seconds:.3f}s  ({draws / inline_seconds:,.0f} draws/s)")
+    print(f"pool ({workers} workers): {pool_seconds:.3f}s  ({draws / pool_seconds:,.0f} draws/s)")
+    for status, percentiles in inline["Net Take-Home Pay"].items():
+        print(f"  {status:<13} " + "  ".join(f"{label} £{value:,.0f}" for label, value in percentiles.items()))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,54 @@
+# ======================
+# BENCHMARK: salary optimiser vs a brute-force salary grid
+# Run: python benchmarks/bench_optimizer.py [contractors]
+# ======================
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_core import ir35_tax_calculator
+from ir35_optimizer import optimise_salary, optimise_salary_batch
+
+WORKING_DAYS = 220
+GRID_STEP = 100
+
+def grid_best_net(pay_rate, student_loan_plan):
+    best = 0
+    for salary in range(0, int(pay_rate * WORKING_DAYS), GRID_STEP):
+        results = ir35_tax_calculator(pay_rate, WORKING_DAYS, 0, student_loan_plan, "Outside IR35", salary_amount=salary)
+        # A salary the company cannot fund from profit is not a real option
+        if results["Company Breakdown"]["Profit Before Tax"] < 0:
+            break
+        best = max(best, results["Net Take-Home Pay"])
+    return best
+
+def main(count=5000):
+    rng = np.random.default_rng(35)
+    pay_rates = rng.uniform(200, 1500, count)
+    plans = rng.choice(["None", "Plan 1", "Plan 2", "Postgraduate Loan"], count).astype(object)
+
+    sample = min(count, 50)
+    start = time.perf_counter()
+    grid = [grid_best_net(pay_rate, plan) for pay_rate, plan in zip(pay_rates[:sample], plans[:sample])]
+    grid_seconds = (time.perf_counter() - start) * count / sample
+
+    start = time.perf_counter()
+    batch = optimise_salary_batch(pay_rates, WORKING_DAYS, student_loan_plan=plans)
+    batch_seconds = time.perf_counter() - start
+
+    for index, expected in enumerate(grid):
+        solved = optimise_salary(pay_rates[index], WORKING_DAYS, student_loan_plan=plans[index])
+        assert solved["Net Take-Home Pay"] >= expected, (index, solved, expected)
+        assert batch["Net Take-Home Pay"][index] == solved["Net Take-Home Pay"]
+
+    print(f"contractors:        {count}")
+    print(f"£{GRID_STEP} salary grid:    {grid_seconds:.1f}s (estimated from {sample})")
+    print(f"optimiser batch:    {batch_seconds:.3f}s  {batch['Evaluations'] / count:.1f} evaluations/contractor")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,57 @@
+# ======================
+# BENCHMARK: batch PDF reports vs generate_pdf in a loop
+# Run: python benchmarks/bench_pdf.py [reports]
+# ======================
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_core import calculate_scenario
+from ir35_pdf import generate_pdf, generate_pdf_batch
+
+def make_reports(count):
+    reports = []
+    for index in range(count):
+        status = "Inside IR35" if index % 2 else "Outside IR35"
+        scenario = calculate_scenario("Client Rate", 400.0 + (index % 100) * 10, 20.0, 180 + index % 40, status)
+        reports.append({
+            "result": scenario["Results"],
+            "calculation_mode": "Client Rate",
+            "client_rate": scenario["Client Rate"],
+            "base_rate": scenario["Base Rate"],
+            "pay_rate": scenario["Pay Rate"],
+            "margin": scenario["Margin"],
+            "employer_deductions": scenario["Employer Deductions"],
+            "status": status,
+            "file_name": f"contractor_{index:05d}.pdf"
+        })
+    return reports
+
+def main(count=500):
+    reports = make_reports(count)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        for report in reports:
+            with open(os.path.join(directory, report["file_name"]), "wb") as f:
+                f.write(generate_pdf(*[report[key] for key in list(report)[:-1]]))
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        generate_pdf_batch(reports, os.path.join(directory, "reports.zip"), mode="zip")
+        zip_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        generate_pdf_batch(reports, os.path.join(directory, "reports.pdf"), mode="merged")
+        merged_seconds = time.perf_counter() - start
+
+    print(f"reports:             {count}")
+    print(f"generate_pdf loop:   {count / loop_seconds:8.0f} reports/s")
+    print(f"batch zip (pool):    {count / zip_seconds:8.0f} reports/s")
+    print(f"batch merged (pool): {count / merged_seconds:8.0f} reports/s")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
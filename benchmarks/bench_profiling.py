@@ -0,0 +1,33 @@
+# ======================
+# BENCHMARK: cost of the profiling timers on the scalar calculator, disabled vs enabled
+# Run: python benchmarks/bench_profiling.py [calls]
+# ======================
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMER = (
+    "import time; from ir35_core import ir35_tax_calculator; "
+    "start = time.perf_counter(); "
+    "[ir35_tax_calculator(520, 220, 5, 'Plan 2', 'Inside IR35') for _ in range({calls})]; "
+    "print((time.perf_counter() - start) / {calls})"
+)
+
+def seconds_per_call(calls, profile):
+    env = {**os.environ, "IR35_PROFILE": "1" if profile else "0"}
+    output = subprocess.run(
+        [sys.executable, "-c", TIMER.format(calls=calls)], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def main(calls=200000):
+    disabled = min(seconds_per_call(calls, False) for _ in range(3))
+    enabled = min(seconds_per_call(calls, True) for _ in range(3))
+    print(f"IR35_PROFILE=0     {disabled * 1e6:8.2f} µs/call")
+    print(f"IR35_PROFILE=1     {enabled * 1e6:8.2f} µs/call  (+{(enabled - disabled) * 1e6:.2f} µs per timed call)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
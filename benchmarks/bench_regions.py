@@ -0,0 +1,48 @@
+# ======================
+# BENCHMARK: one batch mixing Scottish and rUK contractors vs a single-config batch and a per-row loop
+# Run: python benchmarks/bench_regions.py [rows]
+# ======================
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_batch import ir35_tax_calculator_batch, tax_years_by_region
+from ir35_core import ir35_tax_calculator, regional_tax_year
+
+def best_of(function, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main(rows=1000000):
+    rng = np.random.default_rng(35)
+    pay_rate = rng.uniform(150, 1500, rows)
+    working_days = rng.integers(20, 261, rows)
+    status = rng.choice(np.array(["Inside IR35", "Outside IR35"], dtype=object), rows)
+    regions = rng.choice(np.array(["rUK", "Scotland"], dtype=object), rows, p=[0.9, 0.1])
+
+    single = best_of(lambda: ir35_tax_calculator_batch(pay_rate, working_days, status=status))
+    mixed = best_of(lambda: ir35_tax_calculator_batch(
+        pay_rate, working_days, status=status, tax_year=tax_years_by_region(regions)
+    ))
+    sample = min(rows, 20000)
+    loop = best_of(lambda: [
+        ir35_tax_calculator(pay_rate[i], working_days[i], status=status[i], tax_year=regional_tax_year(regions[i]))
+        for i in range(sample)
+    ], repeats=1) * rows / sample
+
+    print(f"{rows:,} contractors, {np.mean(regions == 'Scotland'):.0%} Scottish")
+    print(f"single config batch   {single:8.3f} s")
+    print(f"mixed config batch    {mixed:8.3f} s")
+    print(f"scalar loop (est.)    {loop:8.3f} s")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
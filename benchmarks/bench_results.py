@@ -0,0 +1,59 @@
+# ======================
+# BENCHMARK: scalar result dicts vs the columnar ResultTable (build time, memory, to pandas)
+# Run: python benchmarks/bench_results.py [rows]
+# ======================
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_core import ir35_tax_calculator
+from ir35_results import ir35_result_table
+
+def make_inputs(n, seed=35):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(200, 1500, n),
+        rng.integers(100, 261, n),
+        rng.choice(np.array(["Inside IR35", "Outside IR35"], dtype=object), n)
+    )
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main(n=100000):
+    pay_rate, working_days, status = make_inputs(n)
+
+    dicts, dict_seconds, dict_bytes = measure(lambda: [
+        ir35_tax_calculator(rate, days, 5, "None", row_status)
+        for rate, days, row_status in zip(pay_rate.tolist(), working_days.tolist(), status)
+    ])
+    table, table_seconds, table_bytes = measure(lambda: ir35_result_table(pay_rate, working_days, 5, "None", status))
+
+    start = time.perf_counter()
+    pd.json_normalize(dicts)
+    dict_frame_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    table.to_pandas()
+    table_frame_seconds = time.perf_counter() - start
+
+    assert all(table[i]["Net Take-Home Pay"] == dicts[i]["Net Take-Home Pay"] for i in range(0, n, max(1, n // 1000)))
+    print(f"{n:,} results")
+    print(f"{'':<16} {'build':>10} {'peak memory':>12} {'to pandas':>10}")
+    print(f"{'scalar dicts':<16} {dict_seconds * 1000:8.1f} ms {dict_bytes / 1e6:9.1f} MB {dict_frame_seconds * 1000:7.1f} ms")
+    print(f"{'ResultTable':<16} {table_seconds * 1000:8.1f} ms {table_bytes / 1e6:9.1f} MB {table_frame_seconds * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
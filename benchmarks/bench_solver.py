@@ -0,0 +1,68 @@
+# ======================
+# BENCHMARK: target-net solver vs bisection on the scalar calculator
+# Run: python benchmarks/bench_solver.py [targets]
+# ======================
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_core import calculate_scenario
+from ir35_solver import solve_client_rate, solve_client_rate_batch
+
+WORKING_DAYS = 220
+MARGIN = 20
+
+def net_at(client_rate, status):
+    scenario = calculate_scenario("Client Rate", client_rate, MARGIN, WORKING_DAYS, status, student_loan_plan="Plan 2")
+    return scenario["Results"]["Net Take-Home Pay"]
+
+def bisect_client_rate(target_net, status, tolerance=0.01):
+    low, high, evaluations = 0.0, 10000.0, 0
+    while high - low > tolerance:
+        middle = (low + high) / 2
+        evaluations += 1
+        if net_at(middle, status) < target_net:
+            low = middle
+        else:
+            high = middle
+    return high, evaluations
+
+def main(count=2000):
+    rng = np.random.default_rng(35)
+    targets = rng.uniform(20000, 250000, count)
+    statuses = np.where(rng.random(count) < 0.5, "Inside IR35", "Outside IR35")
+
+    start = time.perf_counter()
+    bisection = [bisect_client_rate(target, status) for target, status in zip(targets, statuses)]
+    bisect_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solved = [
+        solve_client_rate(target, WORKING_DAYS, MARGIN, status, student_loan_plan="Plan 2")
+        for target, status in zip(targets, statuses)
+    ]
+    solver_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = solve_client_rate_batch(targets, WORKING_DAYS, MARGIN, statuses, student_loan_plan="Plan 2")
+    batch_seconds = time.perf_counter() - start
+
+    # Net pay is rounded to the pound, so the solved rate lands within a pound of the target
+    worst = max(abs(net_at(row["Client Rate"], status) - target) for row, target, status in zip(solved, targets, statuses))
+    assert worst <= 1, worst
+    assert np.allclose(batch["Client Rate"], [row["Client Rate"] for row in solved])
+    assert np.allclose(batch["Client Rate"], [rate for rate, _ in bisection], atol=0.05)
+
+    print(f"targets:       {count}")
+    print(f"bisection:     {bisect_seconds:.3f}s  {sum(e for _, e in bisection) / count:.1f} evaluations/target")
+    print(f"band solver:   {solver_seconds:.3f}s  {sum(row['Evaluations'] for row in solved) / count:.1f} evaluations/target")
+    print(f"batch solver:  {batch_seconds:.3f}s  {batch['Evaluations']} evaluations in total")
+    print(f"worst miss:    £{worst:.2f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
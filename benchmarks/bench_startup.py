@@ -0,0 +1,60 @@
+# ======================
+# BENCHMARK: time to first paint of the Streamlit page, cold process and warm rerun
+# Run: python benchmarks/bench_startup.py [runs] [--latency seconds] [--app path]
+# gov.uk is simulated: each fetch sleeps for --latency, then fails over to the packaged snapshot
+# ======================
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMER = """
+import sys, time
+sys.path.insert(0, {root!r})
+import bank_holidays
+
+def slow_fetch(timeout=None):
+    time.sleep({latency})
+    raise OSError("simulated gov.uk timeout")
+
+bank_holidays.fetch_bank_holidays = slow_fetch
+from streamlit.testing.v1 import AppTest
+
+for _ in range(2):
+    app = AppTest.from_file({app!r}, default_timeout=60)
+    start = time.perf_counter()
+    app.run()
+    print(time.perf_counter() - start)
+"""
+
+def first_paint_seconds(app, latency, runs):
+    cold, warm = [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            output = subprocess.run(
+                [sys.executable, "-c", TIMER.format(root=ROOT, latency=latency, app=app)],
+                cwd=ROOT, env={**os.environ, "IR35_CACHE_DIR": cache_dir}, capture_output=True, text=True, check=True
+            ).stdout
+        first, second = [float(line) for line in output.strip().splitlines()[-2:]]
+        cold.append(first)
+        warm.append(second)
+    return statistics.median(cold), statistics.median(warm)
+
+def main(runs=3, latency=1.0, app=os.path.join(ROOT, "ir35_calculator.py")):
+    cold, warm = first_paint_seconds(app, latency, runs)
+    print(f"{os.path.basename(app)} with {latency:.1f}s gov.uk latency")
+    print(f"cold process   {cold * 1000:8.1f} ms")
+    print(f"warm rerun     {warm * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("runs", nargs="?", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--app", default=os.path.join(ROOT, "ir35_calculator.py"))
+    args = parser.parse_args()
+    main(args.runs, args.latency, args.app)
@@ -0,0 +1,69 @@
+# ======================
+# BENCHMARK: result tables per rerun, pandas Styler vs plain HTML
+# Run: python benchmarks/bench_tables.py [reruns]
+# ======================
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_core import calculate_holiday_components, calculate_scenario
+from ir35_tables import render_table, table_css
+
+GREY = "#515D7A"
+LIGHT_GREY = "#F5F5F5"
+WHITE = "#FFFFFF"
+
+def styled_dataframe(df, title=""):
+    return df.style.set_table_styles([
+        {'selector': 'thead', 'props': [('background-color', GREY), ('color', WHITE)]},
+        {'selector': 'tbody tr:nth-child(even)', 'props': [('background-color', LIGHT_GREY)]},
+        {'selector': 'tbody tr:nth-child(odd)', 'props': [('background-color', WHITE)]},
+        {'selector': 'th.col_heading', 'props': [('text-align', 'left')]},
+        {'selector': 'td', 'props': [('text-align', 'left')]},
+        {'selector': '', 'props': [('border', f'1px solid {GREY}')]}
+    ]).set_caption(title)
+
+def inside_tables(scenario):
+    results, margin, deductions = scenario["Results"], scenario["Margin"], scenario["Employer Deductions"]
+    pay_rate, working_days = scenario["Pay Rate"], scenario["Working Days"]
+    basic_rate, holiday_pay = calculate_holiday_components(pay_rate)
+    return [
+        ([[key, f"£{value}"] for key, value in margin.items()], ["Metric", "Value"]),
+        ([[key, f"£{value}"] for key, value in deductions.items()], ["Deduction", "Amount"]),
+        ([
+            ["Daily Rates", f"£{round(pay_rate)}", f"£{round(results['Net Take-Home Pay'] / working_days)}"],
+            ["Monthly Rates (20 days)", f"£{round(pay_rate * 20)}", f"£{round(results['Net Take-Home Pay'] / working_days * 20)}"],
+            [f"Project Total ({working_days} days)", f"£{round(pay_rate * working_days)}", f"£{round(results['Net Take-Home Pay'])}"]
+        ], ["Period", "Gross", "Net"]),
+        ([["Basic Daily Rate (excl. holiday pay)", f"£{basic_rate}"], ["Holiday Pay (per day)", f"£{holiday_pay}"]],
+         ["Component", "Amount"]),
+        ([[key, f"£{value}"] for key, value in results.items() if key != "Disclaimer"], ["Item", "Amount"])
+    ]
+
+def main(reruns=200):
+    tables = inside_tables(calculate_scenario("Client Rate", 800, 20, 220))
+
+    # Styler output is rendered to HTML, which is where its per-rerun cost lands
+    start = time.perf_counter()
+    for _ in range(reruns):
+        styler_html = [styled_dataframe(pd.DataFrame(rows, columns=columns)).to_html() for rows, columns in tables]
+    styler_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(reruns):
+        table_css(GREY, LIGHT_GREY, WHITE)
+        plain_html = [render_table(rows, columns) for rows, columns in tables]
+    html_seconds = time.perf_counter() - start
+
+    assert len(styler_html) == len(plain_html)
+    print(f"tables per rerun: {len(tables)}")
+    print(f"pandas Styler:    {styler_seconds / reruns * 1000:.3f} ms/rerun")
+    print(f"plain HTML:       {html_seconds / reruns * 1000:.3f} ms/rerun  ({styler_seconds / html_seconds:.0f}x)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,69 @@
+# ======================
+# BENCHMARK: timesheet ledger vs rerunning ir35_tax_calculator on year-to-date pay every week
+# Run: python benchmarks/bench_timesheet.py [entries]
+# ======================
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ir35_core import ir35_tax_calculator
+from ir35_timesheet import TimesheetLedger
+
+def timesheets(entries, seed=35):
+    # Weekday entries from 6 April, every contractor filing each day, some in hours
+    rng = np.random.default_rng(seed)
+    contractors = max(1, entries // 260)
+    days = pd.bdate_range("2025-04-07", periods=-(-entries // contractors)).to_numpy(dtype="datetime64[D]")
+    frame = pd.DataFrame({
+        "contractor_id": np.tile(np.arange(contractors), len(days))[:entries],
+        "date": np.repeat(days, contractors)[:entries],
+        "days": np.where(rng.random(entries) < 0.8, 1.0, np.nan),
+        "hours": rng.uniform(4, 9, entries).round(1)
+    })
+    frame.loc[frame["days"].notna(), "hours"] = np.nan
+    terms = pd.DataFrame({
+        "contractor_id": np.arange(contractors),
+        "client_rate": rng.uniform(300, 1200, contractors),
+        "student_loan": rng.choice(["None", "Plan 2"], contractors),
+        "tax_region": rng.choice(["rUK", "Scotland"], contractors, p=[0.9, 0.1])
+    })
+    return terms, frame
+
+def main(entries=500000):
+    terms, frame = timesheets(entries)
+    start = time.perf_counter()
+    ledger = TimesheetLedger.from_frame(terms)
+    payslips = []
+    for offset in range(0, len(frame), 50000):
+        payslips += ledger.add_chunk(frame.iloc[offset:offset + 50000])
+    payslips += ledger.close()
+    seconds = time.perf_counter() - start
+
+    # From scratch: each closed week sums the contractor's entries so far and reruns the annual calculator
+    sample = terms.iloc[:max(1, len(terms) // 20)]
+    subset = frame[frame["contractor_id"].isin(sample["contractor_id"])]
+    start = time.perf_counter()
+    history = {contractor: [] for contractor in sample["contractor_id"]}
+    weeks = {}
+    for contractor, day, days, hours in zip(
+        subset["contractor_id"].tolist(), subset["date"].to_numpy(dtype="datetime64[W]").astype(np.int64).tolist(),
+        subset["days"].fillna(0).tolist(), subset["hours"].fillna(0).tolist()
+    ):
+        if weeks.get(contractor, day) != day:
+            ir35_tax_calculator(500.0, sum(history[contractor]))
+        weeks[contractor] = day
+        history[contractor].append(days + hours / 7.5)
+    rerun = (time.perf_counter() - start) * len(terms) / len(sample)
+
+    print(f"{entries:,} entries, {len(terms):,} contractors, {len(payslips):,} payslips")
+    print(f"ledger                {seconds:8.3f} s   {seconds / entries * 1e6:6.2f} us/entry")
+    print(f"weekly reruns (est.)  {rerun:8.3f} s   {rerun / entries * 1e6:6.2f} us/entry")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
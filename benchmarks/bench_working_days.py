@@ -0,0 +1,63 @@
+# ======================
+# BENCHMARK: calculate_working_days vs the original per-day loop
+# Run: python benchmarks/bench_working_days.py [ranges]
+# ======================
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank_holidays import get_bank_holidays
+from ir35_core import calculate_working_days
+from ir35_batch import calculate_working_days_batch
+
+def reference_working_days(start_date, end_date, days_per_week, bank_holidays):
+    if start_date >= end_date:
+        return 0
+    total_days = (end_date - start_date).days + 1
+    working_days = 0
+    for day in range(total_days):
+        current_date = start_date + timedelta(days=day)
+        if current_date.weekday() < 5 and current_date not in bank_holidays:
+            working_days += 1
+    full_weeks = working_days // 5
+    remaining_days = working_days % 5
+    return (full_weeks * days_per_week) + min(remaining_days, days_per_week)
+
+def make_ranges(count, seed=35):
+    rng = np.random.default_rng(seed)
+    starts = [date(2023, 1, 1) + timedelta(days=int(offset)) for offset in rng.integers(0, 1600, count)]
+    ends = [start + timedelta(days=int(length)) for start, length in zip(starts, rng.integers(-10, 1100, count))]
+    return starts, ends, rng.integers(1, 6, count)
+
+def main(count=5000):
+    holidays = get_bank_holidays()
+    holiday_list = sorted(holidays)
+    starts, ends, days_per_week = make_ranges(count)
+
+    start = time.perf_counter()
+    expected = [reference_working_days(*row, holiday_list) for row in zip(starts, ends, days_per_week)]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    closed_form = [calculate_working_days(*row, holidays) for row in zip(starts, ends, days_per_week)]
+    closed_form_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculate_working_days_batch(starts, ends, days_per_week, holidays)
+    batch_seconds = time.perf_counter() - start
+
+    assert closed_form == expected
+    assert batch.tolist() == expected
+    print(f"date ranges:   {count}")
+    print(f"per-day loop:  {loop_seconds:.3f}s")
+    print(f"closed form:   {closed_form_seconds:.3f}s  ({loop_seconds / closed_form_seconds:.0f}x)")
+    print(f"busday batch:  {batch_seconds:.3f}s  ({loop_seconds / batch_seconds:.0f}x)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
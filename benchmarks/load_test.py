@@ -0,0 +1,91 @@
+# ======================
+# LOAD TEST: latency percentiles and throughput for the IR35 API
+# Run: uvicorn ir35_api:app --port 8000 &
+#      python benchmarks/load_test.py --requests 2000 --concurrency 32
+#      python benchmarks/load_test.py --in-process     (no server; calls the ASGI app directly)
+# ======================
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PAYLOADS = {
+    "calculate": lambda rng: {
+        "rate": rng.randrange(300, 1500, 5),
+        "margin_percent": rng.choice([15, 20, 23]),
+        "status": rng.choice(["Inside IR35", "Outside IR35"]),
+        "start_date": "2025-04-07",
+        "end_date": "2026-03-31"
+    },
+    "compare": lambda rng: {
+        "inside_pay_rate": rng.randrange(200, 900, 5),
+        "outside_base_rate": rng.randrange(300, 1200, 5),
+        "working_days": 220
+    },
+    "batch": lambda rng: [
+        {"client_rate": rng.randrange(300, 1500), "start_date": "2025-04-07", "end_date": "2026-03-31"}
+        for _ in range(1000)
+    ],
+    "pdf": lambda rng: {"rate": rng.randrange(300, 1500, 5), "working_days": 220}
+}
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+async def run(client, endpoint, requests, concurrency, seed):
+    rng = random.Random(seed)
+    payloads = [PAYLOADS[endpoint](rng) for _ in range(requests)]
+    latencies = []
+    errors = 0
+    queue = iter(payloads)
+
+    async def worker():
+        nonlocal errors
+        for payload in queue:
+            start = time.perf_counter()
+            response = await client.post(f"/{endpoint}", json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the IR35 API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=PAYLOADS, default="calculate")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=35)
+    parser.add_argument("--in-process", action="store_true", help="Call the ASGI app directly instead of --url")
+    args = parser.parse_args(argv)
+
+    if args.in_process:
+        from ir35_api import app, lifespan
+
+        async with lifespan(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://ir35", timeout=60) as client:
+                latencies, errors, seconds = await run(client, args.endpoint, args.requests, args.concurrency, args.seed)
+    else:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+            latencies, errors, seconds = await run(client, args.endpoint, args.requests, args.concurrency, args.seed)
+
+    print(f"endpoint:     /{args.endpoint}")
+    print(f"requests:     {len(latencies)} ({errors} errors) at concurrency {args.concurrency}")
+    print(f"throughput:   {len(latencies) / seconds:,.0f} req/s")
+    print(f"p50 latency:  {percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"p99 latency:  {percentile(latencies, 99) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    asyncio.run(main())
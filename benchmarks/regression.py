@@ -0,0 +1,99 @@
+# ======================
+# TIMING BASELINES for the hot paths
+# Run:    python benchmarks/regression.py
+# Update: python benchmarks/regression.py --update-baselines    (on the machine you compare against)
+# Exits non-zero if a hot path slows down. Golden values and fast-path equivalence are checked by pytest tests/
+# ======================
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ir35_batch import ir35_tax_calculator_batch
+from ir35_core import (
+    calculate_corporation_tax,
+    calculate_dividend_tax,
+    calculate_scenario,
+    calculate_working_days,
+    ir35_tax_calculator
+)
+from ir35_pdf import generate_pdf
+
+BASELINES_PATH = os.path.join(ROOT, "benchmarks", "baselines.json")
+SNAPSHOT_PATH = os.path.join(ROOT, "data", "bank_holidays.json")
+
+# The packaged snapshot, not the live provider, so timings never depend on gov.uk
+with open(SNAPSHOT_PATH, encoding="utf-8") as f:
+    HOLIDAYS = frozenset(date.fromisoformat(event["date"]) for event in json.load(f)["england-and-wales"]["events"])
+
+# ----------
+# TIMING BASELINES
+# ----------
+def _timed(function, loops, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+def measure():
+    batch_rates = np.linspace(100, 2000, 100000)
+    scenario = calculate_scenario("Client Rate", 800, 20, 220, "Inside IR35", student_loan_plan="Plan 2")
+    report = (scenario["Results"], "Client Rate", scenario["Client Rate"], scenario["Base Rate"], scenario["Pay Rate"],
+              scenario["Margin"], scenario["Employer Deductions"], "Inside IR35")
+    return {
+        "calculate_working_days": _timed(
+            lambda: calculate_working_days(date(2025, 4, 6), date(2026, 4, 5), 5, HOLIDAYS), 20000),
+        "ir35_tax_calculator (Inside IR35)": _timed(
+            lambda: ir35_tax_calculator(520, 220, 5, "Plan 2", "Inside IR35"), 20000),
+        "ir35_tax_calculator (Outside IR35)": _timed(
+            lambda: ir35_tax_calculator(616, 220, 0, "Plan 2", "Outside IR35"), 20000),
+        "calculate_dividend_tax": _timed(lambda: calculate_dividend_tax(12570, 80000), 50000),
+        "calculate_corporation_tax": _timed(lambda: calculate_corporation_tax(120000), 50000),
+        "generate_pdf": _timed(lambda: generate_pdf(*report), 50),
+        "ir35_tax_calculator_batch (100k rows)": _timed(
+            lambda: ir35_tax_calculator_batch(batch_rates, 220, status="Outside IR35"), 5)
+    }
+
+def check_baselines(update, tolerance):
+    current = measure()
+    for name, seconds in current.items():
+        print(f"  {name:<40} {seconds * 1e6:12.2f} µs")
+    if update or not os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=1, sort_keys=True)
+        print(f"baselines written to {BASELINES_PATH}")
+        return []
+    with open(BASELINES_PATH, encoding="utf-8") as f:
+        baselines = json.load(f)
+    return [
+        f"slower: {name} {seconds * 1e6:.2f} µs vs baseline {baselines[name] * 1e6:.2f} µs"
+        for name, seconds in current.items()
+        if name in baselines and seconds > baselines[name] * (1 + tolerance)
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Timing baselines for the hot paths.")
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed slowdown before failing (0.3 = 30%%)")
+    args = parser.parse_args(argv)
+
+    print("timings:")
+    failures = check_baselines(args.update_baselines, args.tolerance)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+# ======================
+# IR35 API
+# ASGI service for CRM / timesheet integrations
+#
+#   uvicorn ir35_api:app --host 0.0.0.0 --port 8000
+# ======================
+
+import asyncio
+import copy
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import date
+from functools import lru_cache
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from bank_holidays import get_bank_holidays, get_tax_region_holidays
+from ir35_batch import LTD_COMPANY, PLACEMENT_DEFAULTS, STUDENT_LOAN_PLANS
+from ir35_core import (
+    RESULT_CACHE_SIZE,
+    calculate_comparison,
+    calculate_scenario,
+    calculate_working_days,
+    regional_tax_year
+)
+from ir35_tax_config import BANK_HOLIDAY_DIVISIONS, DEFAULT_TAX_REGION
+
+# ----------
+# CONSTANTS
+# ----------
+API_WORKERS = int(os.environ.get("IR35_API_WORKERS", 0)) or os.cpu_count() or 1
+BATCH_CHUNK_SIZE = 5000
+# Batches up to this size are cheaper to run inline than to ship to a worker
+INLINE_BATCH_ROWS = 500
+DIVIDEND_STRATEGY = "Distribute all profit after corporation tax"
+REQUIRED_PLACEMENT_FIELDS = ("client_rate", "start_date", "end_date")
+PLACEMENT_NUMBERS = (
+    "client_rate", "margin_percent", "employee_pension", "employer_pension_percent", "allowable_expenses", "outside_salary"
+)
+STATUSES = ("Inside IR35", "Outside IR35")
+CALCULATION_MODES = ("Client Rate", "Base Rate", "Pay Rate")
+STUDENT_LOANS = ("None", *STUDENT_LOAN_PLANS)
+BUSINESS_TYPES = (LTD_COMPANY,)
+
+# ----------
+# SCENARIO CACHE
+# ----------
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _cached_scenario(inputs):
+    return calculate_scenario(*inputs)
+
+def cached_scenario(inputs):
+    # Cached dicts are shared between callers, so hand each one its own copy
+    return copy.deepcopy(_cached_scenario(inputs))
+
+# ----------
+# REQUEST PARSING
+# ----------
+def _working_days(body):
+    if "working_days" in body:
+        return int(body["working_days"])
+    start_date = date.fromisoformat(body["start_date"])
+    end_date = date.fromisoformat(body["end_date"])
+    if start_date >= end_date:
+        raise ValueError("end_date must be after start_date")
+    # The tax region's bank holidays unless the request names a holiday region
+    region = body.get("region") or BANK_HOLIDAY_DIVISIONS.get(body.get("tax_region", DEFAULT_TAX_REGION))
+    if region is None:
+        raise ValueError(f"Unknown tax region: {body.get('tax_region')}")
+    return calculate_working_days(start_date, end_date, int(body.get("days_per_week", 5)), get_bank_holidays(region))
+
+def _rate(value, name):
+    rate = float(value)
+    if rate <= 0:
+        raise ValueError(f"{name} must be positive")
+    return rate
+
+def _choice(value, choices, name):
+    if value not in choices:
+        raise ValueError(f"Unknown {name}: {value}")
+    return value
+
+def _margin(value):
+    # Rates are divided by (1 - margin), and margins by the client rate
+    margin = float(value)
+    if not 0 <= margin < 100:
+        raise ValueError("margin_percent must be at least 0 and below 100")
+    return margin
+
+def _tax_year(body):
+    return regional_tax_year(body.get("tax_region", DEFAULT_TAX_REGION)).label
+
+def _scenario_inputs(body):
+    status = _choice(body.get("status", "Inside IR35"), STATUSES, "IR35 status")
+    outside = status == "Outside IR35"
+    return (
+        _choice(body.get("calculation_mode", "Client Rate"), CALCULATION_MODES, "calculation mode"),
+        _rate(body["rate"], "rate"),
+        _margin(body.get("margin_percent", 23.0)),
+        _working_days(body),
+        status,
+        0.0 if outside else float(body.get("employee_pension", 5.0)),
+        _choice(body.get("student_loan", "None"), STUDENT_LOANS, "student loan plan"),
+        bool(body.get("vat_registered", False)) and outside,
+        float(body.get("allowable_expenses", 0.0)) if outside else 0.0,
+        float(body.get("outside_salary", 12570.0)) if outside else 12570.0,
+        float(body.get("employer_pension_percent", 3.0)),
+        _choice(body.get("outside_business_type", LTD_COMPANY), BUSINESS_TYPES, "business type"),
+        body.get("dividend_strategy", DIVIDEND_STRATEGY),
+        _tax_year(body)
+    )
+
+def _placement(record):
+    # Coerced and checked up front, so a bad record is a 400 rather than an error inside a worker
+    if not isinstance(record, dict):
+        raise ValueError("must be an object")
+    missing = [field for field in REQUIRED_PLACEMENT_FIELDS if field not in record]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    # Defaults filled per record, so a field only some records give is never missing in the frame
+    placement = {**PLACEMENT_DEFAULTS, **record}
+    for field in PLACEMENT_NUMBERS:
+        placement[field] = float(placement[field])
+    _rate(placement["client_rate"], "client_rate")
+    _margin(placement["margin_percent"])
+    start_date, end_date = date.fromisoformat(placement["start_date"]), date.fromisoformat(placement["end_date"])
+    if start_date >= end_date:
+        raise ValueError("end_date must be after start_date")
+    placement["start_date"], placement["end_date"] = start_date.isoformat(), end_date.isoformat()
+    placement["days_per_week"] = int(placement["days_per_week"])
+    if not 1 <= placement["days_per_week"] <= 5:
+        raise ValueError("days_per_week must be between 1 and 5")
+    _choice(placement["status"], STATUSES, "IR35 status")
+    _choice(placement["student_loan"], STUDENT_LOANS, "student loan plan")
+    _choice(placement["outside_business_type"], BUSINESS_TYPES, "business type")
+    placement["vat_registered"] = bool(placement["vat_registered"])
+    regional_tax_year(placement["tax_region"])
+    return placement
+
+async def _json_body(request, types=dict):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ValueError("Request body must be JSON")
+    # Anything else would fail on body.get as an AttributeError, a 500 rather than a 400
+    if not isinstance(body, types):
+        raise ValueError("Request body must be a JSON object")
+    return body
+
+def _error(message, status_code=400):
+    return JSONResponse({"error": message}, status_code=status_code)
+
+# ----------
+# WORKERS
+# ----------
+def _calculate_chunk(records, bank_holidays):
+    import pandas as pd
+
+    from ir35_batch import calculate_placements
+
+    frame = calculate_placements(pd.DataFrame.from_records(records), bank_holidays)
+    lines = frame.to_json(orient="records", lines=True)
+    return (lines if lines.endswith("\n") else lines + "\n").encode("utf-8")
+
+async def _stream_batch(pool, records, bank_holidays):
+    loop = asyncio.get_running_loop()
+    chunks = (records[start:start + BATCH_CHUNK_SIZE] for start in range(0, len(records), BATCH_CHUNK_SIZE))
+    pending = deque()
+    for chunk in chunks:
+        pending.append(loop.run_in_executor(pool, _calculate_chunk, chunk, bank_holidays))
+        # Bound in-flight chunks so a huge batch does not queue entirely in memory; stream in input order
+        if len(pending) >= API_WORKERS * 2:
+            yield await pending.popleft()
+    while pending:
+        yield await pending.popleft()
+
+# ----------
+# ENDPOINTS
+# ----------
+async def health(request):
+    return JSONResponse({"status": "ok"})
+
+async def calculate(request):
+    try:
+        scenario = cached_scenario(_scenario_inputs(await _json_body(request)))
+    except (KeyError, ValueError, TypeError, ZeroDivisionError) as e:
+        return _error(f"Invalid request: {e}")
+    return JSONResponse(scenario)
+
+async def compare(request):
+    try:
+        body = await _json_body(request)
+        comparison = calculate_comparison(
+            _rate(body["inside_pay_rate"], "inside_pay_rate"),
+            _rate(body["outside_base_rate"], "outside_base_rate"),
+            _working_days(body),
+            _margin(body.get("margin_percent", 23.0)),
+            float(body.get("employee_pension", 5.0)),
+            _choice(body.get("student_loan", "None"), STUDENT_LOANS, "student loan plan"),
+            _choice(body.get("outside_student_loan", "None"), STUDENT_LOANS, "student loan plan"),
+            bool(body.get("outside_vat", False)),
+            float(body.get("allowable_expenses", 0.0)),
+            float(body.get("outside_salary", 12570.0)),
+            float(body.get("employer_pension_percent", 3.0)),
+            _choice(body.get("outside_business_type", LTD_COMPANY), BUSINESS_TYPES, "business type"),
+            body.get("dividend_strategy", DIVIDEND_STRATEGY),
+            _tax_year(body)
+        )
+    except (KeyError, ValueError, TypeError, ZeroDivisionError) as e:
+        return _error(f"Invalid request: {e}")
+    return JSONResponse(comparison)
+
+async def batch(request):
+    try:
+        # A bare list of placements is accepted as well as {"placements": [...]}
+        body = await _json_body(request, (dict, list))
+        records = body["placements"] if isinstance(body, dict) else body
+        region = body.get("region") if isinstance(body, dict) else None
+        bank_holidays = get_bank_holidays(region) if region else get_tax_region_holidays()
+        if not isinstance(records, list):
+            raise ValueError("placements must be a list")
+        placements = []
+        for index, record in enumerate(records):
+            try:
+                placements.append(_placement(record))
+            except (KeyError, ValueError, TypeError) as e:
+                raise ValueError(f"placement {index}: {e}") from None
+        records = placements
+    except (KeyError, ValueError, TypeError, AttributeError) as e:
+        return _error(f"Invalid request: {e}")
+
+    if len(records) <= INLINE_BATCH_ROWS:
+        content = await run_in_threadpool(_calculate_chunk, records, bank_holidays) if records else b""
+        return Response(content, media_type="application/x-ndjson")
+    return StreamingResponse(
+        _stream_batch(request.app.state.pool, records, bank_holidays), media_type="application/x-ndjson"
+    )
+
+async def pdf(request):
+    from ir35_pdf import generate_pdf
+
+    try:
+        inputs = _scenario_inputs(await _json_body(request))
+        scenario = cached_scenario(inputs)
+    except (KeyError, ValueError, TypeError, ZeroDivisionError) as e:
+        return _error(f"Invalid request: {e}")
+    content = await run_in_threadpool(
+        generate_pdf,
+        scenario["Results"],
+        inputs[0],
+        scenario["Client Rate"],
+        scenario["Base Rate"],
+        scenario["Pay Rate"],
+        scenario["Margin"],
+        scenario["Employer Deductions"],
+        inputs[4],
+        inputs[-1]
+    )
+    return Response(
+        content,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="IR35_Report_{date.today():%Y%m%d}.pdf"'}
+    )
+
+# ----------
+# APPLICATION
+# ----------
+@asynccontextmanager
+async def lifespan(app):
+    # Load holidays before the first request so no request pays for the gov.uk fetch
+    await run_in_threadpool(get_bank_holidays)
+    app.state.pool = ProcessPoolExecutor(API_WORKERS)
+    try:
+        yield
+    finally:
+        app.state.pool.shutdown()
+
+app = Starlette(
+    routes=[
+        Route("/health", health, methods=["GET"]),
+        Route("/calculate", calculate, methods=["POST"]),
+        Route("/compare", compare, methods=["POST"]),
+        Route("/batch", batch, methods=["POST"]),
+        Route("/pdf", pdf, methods=["POST"])
+    ],
+    lifespan=lifespan
+)
@@ -0,0 +1,427 @@
+# ======================
+# IR35 BATCH ENGINE
+# Vectorized ir35_tax_calculator over arrays of contractors
+# ======================
+
+import numpy as np
+
+from ir35_core import get_tax_year, regional_tax_year
+from ir35_tax_config import DEFAULT_TAX_REGION
+from ir35_profiling import timed
+
+# ----------
+# CONSTANTS
+# ----------
+LTD_COMPANY = "Limited Company (Director/Shareholder)"
+
+STUDENT_LOAN_PLANS = {
+    "Plan 1": (22015, 0.09),
+    "Plan 2": (27295, 0.09),
+    "Plan 4": (31395, 0.09),
+    "Plan 5": (27295, 0.09),
+    "Postgraduate Loan": (21000, 0.06)
+}
+
+RESULT_COLUMNS = [
+    "Gross Income",
+    "Employee Pension",
+    "Income Tax",
+    "Employee NI",
+    "Student Loan Repayment",
+    "Net Take-Home Pay",
+    "Working Days",
+    "Daily Rate",
+    "VAT Amount",
+    "Project Total",
+    "Turnover",
+    "Employer NI",
+    "Employer Pension",
+    "Profit Before Tax",
+    "Corporation Tax",
+    "Profit After Tax",
+    "Dividends Available",
+    "Dividend Tax",
+    "Total Personal Tax"
+]
+
+FRAME_COLUMNS = {
+    "pay_rate": "pay_rate",
+    "working_days": "working_days",
+    "pension_contribution_percent": "employee_pension",
+    "student_loan_plan": "student_loan",
+    "status": "status",
+    "vat_registered": "vat_registered",
+    "allowable_expenses": "allowable_expenses",
+    "salary_amount": "outside_salary",
+    "employer_pension_percent": "employer_pension_percent",
+    "outside_business_type": "outside_business_type"
+}
+
+PLACEMENT_DEFAULTS = {
+    "margin_percent": 23.0,
+    "status": "Inside IR35",
+    "employee_pension": 5.0,
+    "employer_pension_percent": 3.0,
+    "student_loan": "None",
+    "days_per_week": 5,
+    "vat_registered": False,
+    "allowable_expenses": 0.0,
+    "outside_salary": 12570.0,
+    "outside_business_type": LTD_COMPANY,
+    "tax_region": DEFAULT_TAX_REGION
+}
+
+# Types of the numeric and flag columns when placements are read from CSV; every other column (dates, plans,
+# statuses, ids) is text, so a chunk whose rows all say "None" reads the same as one that says "Plan 2"
+PLACEMENT_TYPES = {
+    "client_rate": "float64",
+    "margin_percent": "float64",
+    "employee_pension": "float64",
+    "employer_pension_percent": "float64",
+    "days_per_week": "int64",
+    "vat_registered": "bool",
+    "allowable_expenses": "float64",
+    "outside_salary": "float64"
+}
+
+# ----------
+# BAND ARITHMETIC
+# ----------
+def _band_tax(table, amount):
+    band = np.searchsorted(table.thresholds, amount, side="left") - 1
+    clipped = np.maximum(band, 0)
+    cumulative = np.asarray(table.cumulative, dtype=float)[clipped]
+    thresholds = np.asarray(table.thresholds, dtype=float)[clipped]
+    rates = np.asarray(table.rates, dtype=float)[clipped]
+    return np.where(band < 0, 0.0, cumulative + ((amount - thresholds) * rates))
+
+def _corporation_tax(profit, bands):
+    return np.select(
+        [profit <= 0, profit <= bands.lower_limit, profit >= bands.upper_limit],
+        [0.0, profit * bands.small_profits_rate, profit * bands.main_rate],
+        (profit * bands.main_rate) - ((bands.upper_limit - profit) * bands.marginal_relief_fraction)
+    )
+
+def _dividend_tax(salary, dividends, bands):
+    personal_allowance = bands.personal_allowance
+
+    remaining_allowance = np.maximum(0, personal_allowance - salary)
+    taxable_dividends = np.maximum(0, dividends - remaining_allowance - bands.dividend_allowance)
+    taxable_salary = np.maximum(0, salary - personal_allowance)
+
+    remaining_basic = np.maximum(0, bands.basic_band - taxable_salary)
+    basic_dividends = np.minimum(remaining_basic, taxable_dividends)
+    remaining_dividends = taxable_dividends - basic_dividends
+
+    remaining_higher = np.maximum(0, bands.higher_band - taxable_salary - basic_dividends)
+    higher_dividends = np.minimum(remaining_higher, remaining_dividends)
+    additional_dividends = np.maximum(0, remaining_dividends - higher_dividends)
+
+    return (
+        (basic_dividends * bands.dividend_basic_rate)
+        + (higher_dividends * bands.dividend_higher_rate)
+        + (additional_dividends * bands.dividend_additional_rate)
+    )
+
+def _student_loan_terms(student_loan_plan):
+    thresholds = np.zeros(student_loan_plan.shape)
+    rates = np.zeros(student_loan_plan.shape)
+    for plan, (threshold, rate) in STUDENT_LOAN_PLANS.items():
+        on_plan = student_loan_plan == plan
+        thresholds[on_plan] = threshold
+        rates[on_plan] = rate
+    return thresholds, rates
+
+def _student_loan(income, thresholds, rates):
+    return np.where(income > thresholds, (income - thresholds) * rates, 0.0)
+
+# ----------
+# BATCH CALCULATOR
+# ----------
+def count_business_days(start_dates, stop_dates, bank_holidays, tax_region=DEFAULT_TAX_REGION):
+    # Weekdays from start up to stop that are not bank holidays. bank_holidays is one set for every row, or a
+    # dict of sets by tax region (bank_holidays.get_tax_region_holidays) picked per row from tax_region
+    if not isinstance(bank_holidays, dict):
+        calendar = np.busdaycalendar(holidays=np.array(sorted(bank_holidays), dtype="datetime64[D]"))
+        return np.busday_count(start_dates, stop_dates, busdaycal=calendar)
+    tax_region = np.broadcast_to(np.asarray(tax_region, dtype=object), np.shape(start_dates))
+    counts = np.zeros(np.shape(start_dates), dtype=np.int64)
+    for region in set(tax_region.ravel().tolist()):
+        if region not in bank_holidays:
+            raise ValueError(f"Unknown tax region: {region}")
+        rows = tax_region == region
+        counts[rows] = count_business_days(start_dates[rows], stop_dates[rows], bank_holidays[region])
+    return counts
+
+def calculate_working_days_batch(start_dates, end_dates, days_per_week, bank_holidays, tax_region=DEFAULT_TAX_REGION):
+    start_dates = np.asarray(start_dates, dtype="datetime64[D]")
+    end_dates = np.asarray(end_dates, dtype="datetime64[D]")
+    valid = start_dates < end_dates
+    working_days = count_business_days(
+        start_dates, np.where(valid, end_dates + np.timedelta64(1, "D"), start_dates), bank_holidays, tax_region
+    )
+    days_per_week = np.asarray(days_per_week)
+    full_weeks, remaining_days = np.divmod(working_days, 5)
+    return np.where(valid, (full_weeks * days_per_week) + np.minimum(remaining_days, days_per_week), 0)
+
+def calculate_base_rate_batch(client_rate, margin_percent):
+    return np.asarray(client_rate, dtype=float) * (1 - np.asarray(margin_percent, dtype=float) / 100)
+
+def calculate_pay_rate_batch(base_rate, status="Inside IR35"):
+    base_rate = np.asarray(base_rate, dtype=float)
+    return np.where(np.asarray(status, dtype=object) == "Inside IR35", base_rate / 1.185, base_rate)
+
+def calculate_client_rate_batch(base_rate, margin_percent):
+    return np.asarray(base_rate, dtype=float) / (1 - np.asarray(margin_percent, dtype=float) / 100)
+
+def calculate_base_rate_from_pay_batch(pay_rate, status="Inside IR35"):
+    pay_rate = np.asarray(pay_rate, dtype=float)
+    return np.where(np.asarray(status, dtype=object) == "Inside IR35", pay_rate * 1.185, pay_rate)
+
+def calculate_rates_batch(calculation_mode, rate, margin_percent, status="Inside IR35"):
+    calculation_mode, rate, margin_percent, status = np.broadcast_arrays(
+        np.asarray(calculation_mode, dtype=object),
+        np.asarray(rate, dtype=float),
+        np.asarray(margin_percent, dtype=float),
+        np.asarray(status, dtype=object)
+    )
+    from_client = calculation_mode == "Client Rate"
+    from_base = calculation_mode == "Base Rate"
+    base_rate = np.where(
+        from_client, calculate_base_rate_batch(rate, margin_percent),
+        np.where(from_base, rate, calculate_base_rate_from_pay_batch(rate, status))
+    )
+    client_rate = np.where(from_client, rate, calculate_client_rate_batch(base_rate, margin_percent))
+    pay_rate = np.where(from_client | from_base, calculate_pay_rate_batch(base_rate, status), rate)
+    return client_rate, base_rate, pay_rate
+
+def round_decimals(values, digits):
+    # round(x, digits) for every element. np.round scales by 10**digits first, so a value next to a tie can
+    # round the other way; those few go through round() itself
+    values = np.asarray(values, dtype=float)
+    rounded = np.array(np.round(values, digits))
+    scaled = values * 10 ** digits
+    with np.errstate(invalid="ignore"):
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, digits) for value in values[near_tie].tolist()]
+    return rounded[()]
+
+def calculate_margin_batch(client_rate, base_rate, working_days):
+    daily_margin = client_rate - base_rate
+    margin_percent = ((client_rate - base_rate) / client_rate) * 100
+    return {
+        "Daily Margin": np.round(daily_margin),
+        "Total Margin": np.round(daily_margin * working_days),
+        "Margin Percentage": round_decimals(margin_percent, 1)
+    }
+
+def calculate_employer_deductions_batch(base_rate, working_days, employer_pension_percent=3.0):
+    daily_ni = base_rate * 0.15
+    daily_pension = base_rate * (np.asarray(employer_pension_percent, dtype=float) / 100)
+    daily_levy = base_rate * 0.005
+    return {
+        "Daily Employer NI": np.round(daily_ni),
+        "Daily Employer Pension": np.round(daily_pension),
+        "Daily Apprentice Levy": np.round(daily_levy),
+        "Total Employer NI": np.round(daily_ni * working_days),
+        "Total Employer Pension": np.round(daily_pension * working_days),
+        "Total Apprentice Levy": np.round(daily_levy * working_days),
+        "Total Employer Deductions": np.round((daily_ni + daily_pension + daily_levy) * working_days)
+    }
+
+@timed("ir35_tax_calculator_batch")
+def ir35_tax_calculator_batch(pay_rate, working_days, pension_contribution_percent=5,
+                              student_loan_plan="None", status="Inside IR35", vat_registered=False,
+                              allowable_expenses=0.0, salary_amount=12570.0,
+                              employer_pension_percent=3.0, outside_business_type=LTD_COMPANY,
+                              tax_year=None):
+    if np.ndim(tax_year):
+        return _mixed_tax_years(
+            pay_rate, working_days, pension_contribution_percent, student_loan_plan, status, vat_registered,
+            allowable_expenses, salary_amount, employer_pension_percent, outside_business_type, tax_year
+        )
+    bands = get_tax_year(tax_year)
+    pay_rate, working_days, pension, expenses, salary, employer_pension = np.broadcast_arrays(
+        np.asarray(pay_rate, dtype=float),
+        np.asarray(working_days, dtype=float),
+        np.asarray(pension_contribution_percent, dtype=float),
+        np.asarray(allowable_expenses, dtype=float),
+        np.asarray(salary_amount, dtype=float),
+        np.asarray(employer_pension_percent, dtype=float)
+    )
+    shape = pay_rate.shape
+    student_loan_plan = np.broadcast_to(np.asarray(student_loan_plan, dtype=object), shape)
+    outside = np.broadcast_to(np.asarray(status, dtype=object) == "Outside IR35", shape)
+    ltd = outside & np.broadcast_to(np.asarray(outside_business_type, dtype=object) == LTD_COMPANY, shape)
+    vat_registered = np.broadcast_to(np.asarray(vat_registered, dtype=bool), shape)
+
+    annual_income = pay_rate * working_days
+
+    # Inside IR35: PAYE on gross less net-pay pension
+    pension = np.where(outside, 0.0, pension)
+    employee_pension = annual_income * (pension / 100)
+    taxable_income = annual_income - employee_pension
+    inside_tax = _band_tax(bands.income_tax, taxable_income)
+    inside_ni = _band_tax(bands.employee_ni, annual_income)
+    loan_thresholds, loan_rates = _student_loan_terms(student_loan_plan)
+    inside_loan = _student_loan(annual_income, loan_thresholds, loan_rates)
+    inside_net = annual_income - (inside_tax + inside_ni + inside_loan + employee_pension)
+
+    # Outside IR35: limited company then director's personal taxes
+    employer_ni = np.maximum(0, salary - bands.employer_ni_threshold) * bands.employer_ni_rate
+    employer_pension_cost = salary * (employer_pension / 100)
+    profit_before_tax = annual_income - expenses - salary - employer_ni - employer_pension_cost
+    corporation_tax = _corporation_tax(profit_before_tax, bands)
+    profit_after_tax = profit_before_tax - corporation_tax
+    dividends = np.maximum(0, profit_after_tax)
+    salary_tax = _band_tax(bands.income_tax, salary)
+    salary_ni = _band_tax(bands.employee_ni, salary)
+    dividend_tax = _dividend_tax(salary, dividends, bands)
+    outside_loan = _student_loan(salary + dividends, loan_thresholds, loan_rates)
+    total_personal_tax = salary_tax + salary_ni + dividend_tax + outside_loan
+    outside_net = np.round(salary + dividends - total_personal_tax)
+
+    def ltd_only(values):
+        return np.where(ltd, values, np.nan)
+
+    return {
+        "Gross Income": np.round(annual_income),
+        "Employee Pension": np.round(employee_pension),
+        "Income Tax": np.round(np.where(outside, ltd_only(salary_tax), inside_tax)),
+        "Employee NI": np.round(np.where(outside, ltd_only(salary_ni), inside_ni)),
+        "Student Loan Repayment": np.round(np.where(outside, ltd_only(outside_loan), inside_loan)),
+        "Net Take-Home Pay": np.where(outside, np.where(ltd, outside_net, 0.0), np.round(inside_net)),
+        "Working Days": working_days,
+        "Daily Rate": np.round(pay_rate),
+        "VAT Amount": np.where(outside & vat_registered, np.round(annual_income * 0.2), 0.0),
+        "Project Total": np.round(annual_income),
+        "Turnover": ltd_only(annual_income),
+        "Employer NI": ltd_only(employer_ni),
+        "Employer Pension": ltd_only(employer_pension_cost),
+        "Profit Before Tax": ltd_only(profit_before_tax),
+        "Corporation Tax": ltd_only(corporation_tax),
+        "Profit After Tax": ltd_only(profit_after_tax),
+        "Dividends Available": ltd_only(dividends),
+        "Dividend Tax": np.round(ltd_only(dividend_tax)),
+        "Total Personal Tax": np.round(ltd_only(total_personal_tax))
+    }
+
+def _mixed_tax_years(*args):
+    import pandas as pd
+
+    # One tax year (label or compiled handle) per row: rows are grouped by config and each group
+    # runs through the vectorised calculator once, so no config is looked up or compiled per row
+    *inputs, tax_year = args
+    shape = np.broadcast_shapes(*(np.shape(value) for value in args))
+    # Scalar inputs stay scalar, so only real per-row columns are gathered for each group
+    inputs = [np.broadcast_to(np.asarray(value), shape).ravel() if np.ndim(value) else value for value in inputs]
+    codes, configs = pd.factorize(np.broadcast_to(np.asarray(tax_year, dtype=object), shape).ravel(), use_na_sentinel=False)
+    results = None
+    for code, config in enumerate(configs):
+        rows = np.flatnonzero(codes == code)
+        group = ir35_tax_calculator_batch(*[value[rows] if np.ndim(value) else value for value in inputs], tax_year=config)
+        if results is None:
+            results = {name: np.empty(codes.shape) for name in group}
+        for name, values in group.items():
+            results[name][rows] = values
+    if results is None:
+        return ir35_tax_calculator_batch(*inputs)
+    return {name: values.reshape(shape) for name, values in results.items()}
+
+def tax_years_by_region(regions, resolve=regional_tax_year):
+    import pandas as pd
+
+    # Each distinct region is resolved once and its rows share the compiled handle
+    if not np.ndim(regions):
+        return resolve(regions)
+    codes, uniques = pd.factorize(np.asarray(regions, dtype=object), use_na_sentinel=False)
+    handles = np.empty(len(uniques), dtype=object)
+    handles[:] = [resolve(region) for region in uniques]
+    return handles[codes]
+
+def ir35_tax_calculator_frame(df, columns=None):
+    from ir35_results import ir35_result_table
+
+    columns = {**FRAME_COLUMNS, **(columns or {})}
+    kwargs = {arg: df[column].to_numpy() for arg, column in columns.items() if column in df}
+    return ir35_result_table(**kwargs).to_pandas(index=df.index, fields=RESULT_COLUMNS)
+
+def placement_inputs(df, bank_holidays):
+    # Shared by calculate_placements and ir35_export.placement_batches: the per-row rates, working days and the
+    # calculator arguments after pay rate and working days, with PLACEMENT_DEFAULTS for any missing column
+    columns = {key: df[key].to_numpy() if key in df else value for key, value in PLACEMENT_DEFAULTS.items()}
+    client_rate = df["client_rate"].to_numpy(dtype=float)
+    working_days = calculate_working_days_batch(
+        df["start_date"].to_numpy(dtype="datetime64[D]"),
+        df["end_date"].to_numpy(dtype="datetime64[D]"),
+        columns["days_per_week"],
+        bank_holidays,
+        columns["tax_region"]
+    )
+    base_rate = calculate_base_rate_batch(client_rate, columns["margin_percent"])
+    pay_rate = calculate_pay_rate_batch(base_rate, columns["status"])
+    tax_inputs = (
+        columns["employee_pension"],
+        columns["student_loan"],
+        columns["status"],
+        columns["vat_registered"],
+        columns["allowable_expenses"],
+        columns["outside_salary"],
+        columns["employer_pension_percent"],
+        columns["outside_business_type"],
+        tax_years_by_region(columns["tax_region"])
+    )
+    return columns, client_rate, working_days, base_rate, pay_rate, tax_inputs
+
+def calculate_placements(df, bank_holidays):
+    import pandas as pd
+
+    columns, client_rate, working_days, base_rate, pay_rate, tax_inputs = placement_inputs(df, bank_holidays)
+    inside = np.asarray(columns["status"], dtype=object) == "Inside IR35"
+    results = ir35_tax_calculator_batch(pay_rate, working_days, *tax_inputs)
+    margin = calculate_margin_batch(client_rate, base_rate, working_days)
+    deductions = calculate_employer_deductions_batch(base_rate, working_days, columns["employer_pension_percent"])
+    deductions = {key: np.where(inside, value, np.nan) for key, value in deductions.items()}
+
+    output = pd.DataFrame({"Base Rate": base_rate, "Pay Rate": pay_rate}, index=df.index)
+    return pd.concat(
+        [df, output, pd.DataFrame({**results, **margin, **deductions}, index=df.index)],
+        axis=1
+    )
+
+def rate_sweep(client_rates, margins, working_days, statuses=("Inside IR35", "Outside IR35"), student_loan_plans=None,
+               **calculator_args):
+    import pandas as pd
+
+    status_grid, margin_grid, rate_grid = np.broadcast_arrays(
+        np.asarray(statuses, dtype=object)[:, None, None],
+        np.asarray(margins, dtype=float)[None, :, None],
+        np.asarray(client_rates, dtype=float)[None, None, :]
+    )
+    if student_loan_plans:
+        # A plan per status, as the app keeps one for each
+        calculator_args["student_loan_plan"] = np.asarray(
+            [student_loan_plans[status] for status in statuses], dtype=object
+        )[:, None, None]
+    base_rate = calculate_base_rate_batch(rate_grid, margin_grid)
+    pay_rate = calculate_pay_rate_batch(base_rate, status_grid)
+    results = ir35_tax_calculator_batch(pay_rate, working_days, status=status_grid, **calculator_args)
+    net = results["Net Take-Home Pay"]
+    return pd.DataFrame({
+        "Status": status_grid.ravel(),
+        "Margin Percentage": margin_grid.ravel(),
+        "Client Rate": rate_grid.ravel(),
+        "Pay Rate": pay_rate.ravel(),
+        "Net Take-Home Pay": net.ravel(),
+        "Daily Net": (net / working_days if working_days else np.zeros_like(net)).ravel()
+    })
+
+def downsample_sweep(sweep, max_points):
+    if len(sweep) <= max_points:
+        return sweep
+    # Keep every step-th client rate within each series, always including the last point
+    step = -(-len(sweep) // max_points)
+    points_per_series = len(sweep) // sweep.groupby(["Status", "Margin Percentage"]).ngroups
+    position = np.arange(len(sweep)) % points_per_series
+    return sweep[(position % step == 0) | (position == points_per_series - 1)]
@@ -0,0 +1,208 @@
+# ======================
+# IR35 BULK CALCULATOR
+# Command line: placements CSV/Parquet in, per-row tax breakdown out
+#
+#   python ir35_bulk.py placements.csv results.parquet --workers 8
+# ======================
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from bank_holidays import REGIONS, get_bank_holidays, get_tax_region_holidays
+from ir35_batch import PLACEMENT_TYPES, calculate_placements
+from ir35_cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES, ResultCache, chunk_digest, run_context
+from ir35_tax_years import calculate_placements_by_tax_year
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Set in each worker by the pool initializer so holidays are sent once per process
+_worker_holidays = None
+
+# ----------
+# WORKERS
+# ----------
+def _init_worker(bank_holidays):
+    global _worker_holidays
+    _worker_holidays = bank_holidays
+
+def _calculate_chunk(chunk, bank_holidays=None, split_tax_years=False):
+    start = time.perf_counter()
+    calculate = calculate_placements_by_tax_year if split_tax_years else calculate_placements
+    result = calculate(chunk, bank_holidays if bank_holidays is not None else _worker_holidays)
+    return result, time.perf_counter() - start
+
+# ----------
+# INPUT / OUTPUT
+# ----------
+def _is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, types=PLACEMENT_TYPES):
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+
+        # Declared types rather than per-chunk inference, and only empty cells are missing: pandas would
+        # otherwise read a chunk of "None" student loans as an all-NaN float column
+        yield from pd.read_csv(
+            path, chunksize=chunk_size, dtype=defaultdict(lambda: "str", types), keep_default_na=False, na_values=[""]
+        )
+
+class ChunkWriter:
+    def __init__(self, path):
+        self.path = path
+        self.parquet = _is_parquet(path)
+        self.writer = None
+        self.schema = None
+        self.rows = 0
+
+    def _open(self, schema):
+        if self.parquet:
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(self.path, schema)
+        import pyarrow.csv as pa_csv
+
+        return pa_csv.CSVWriter(self.path, schema)
+
+    def write(self, frame):
+        import pyarrow as pa
+
+        self.write_table(pa.Table.from_pandas(frame, preserve_index=False))
+
+    def write_table(self, table):
+        if self.writer is None:
+            self.schema = table.schema
+            self.writer = self._open(self.schema)
+        self.writer.write_table(table.cast(self.schema))
+        self.rows += table.num_rows
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+# ----------
+# PIPELINE
+# ----------
+def run(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, region=None,
+        split_tax_years=False, cache=None):
+    timings = {"read": 0.0, "cache": 0.0, "calculate": 0.0, "write": 0.0}
+    wall_start = time.perf_counter()
+    # One holiday region for every row if given, otherwise each row's tax region picks its own
+    bank_holidays = get_bank_holidays(region) if region else get_tax_region_holidays()
+    writer = ChunkWriter(output_path)
+    context = run_context(cache, bank_holidays, split_tax_years) if cache else None
+
+    def lookup(chunk):
+        # An unchanged chunk of a previous run is served whole; any other chunk goes to the calculator
+        if cache is None:
+            return None, None
+        start = time.perf_counter()
+        digest = chunk_digest(chunk, context)
+        cached = cache.get(digest)
+        timings["cache"] += time.perf_counter() - start
+        return (None, cached) if cached is not None else (digest, None)
+
+    def write(result, digest=None):
+        import pyarrow as pa
+
+        frame, seconds = result
+        timings["calculate"] += seconds
+        if not isinstance(frame, pa.Table):
+            start = time.perf_counter()
+            frame = pa.Table.from_pandas(frame, preserve_index=False)
+            timings["write"] += time.perf_counter() - start
+        if digest is not None:
+            start = time.perf_counter()
+            cache.put(digest, frame)
+            timings["cache"] += time.perf_counter() - start
+        start = time.perf_counter()
+        writer.write_table(frame)
+        timings["write"] += time.perf_counter() - start
+
+    chunks = read_chunks(input_path, chunk_size)
+    try:
+        if workers == 0:
+            while True:
+                start = time.perf_counter()
+                chunk = next(chunks, None)
+                timings["read"] += time.perf_counter() - start
+                if chunk is None:
+                    break
+                digest, cached = lookup(chunk)
+                write((cached, 0.0) if cached is not None else _calculate_chunk(chunk, bank_holidays, split_tax_years),
+                      digest)
+        else:
+            workers = workers or os.cpu_count() or 1
+            pending = deque()
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(bank_holidays,)) as pool:
+                while True:
+                    start = time.perf_counter()
+                    chunk = next(chunks, None)
+                    timings["read"] += time.perf_counter() - start
+                    if chunk is None:
+                        break
+                    digest, cached = lookup(chunk)
+                    if cached is None:
+                        future = pool.submit(_calculate_chunk, chunk, None, split_tax_years)
+                    else:
+                        future = Future()
+                        future.set_result((cached, 0.0))
+                    pending.append((future, digest))
+                    # Bound in-flight chunks so memory stays flat; write in input order
+                    if len(pending) >= workers * 2:
+                        future, digest = pending.popleft()
+                        write(future.result(), digest)
+                while pending:
+                    future, digest = pending.popleft()
+                    write(future.result(), digest)
+    finally:
+        writer.close()
+
+    timings["wall"] = time.perf_counter() - wall_start
+    return writer.rows, timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the IR35 calculator over a CSV or Parquet file of placements.")
+    parser.add_argument("input", help="Placements file (.csv or .parquet)")
+    parser.add_argument("output", help="Results file (.csv or .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 runs inline)")
+    parser.add_argument("--region", choices=REGIONS, default=None,
+                        help="Bank holiday region for every row (default: the one for each row's tax_region)")
+    parser.add_argument("--split-tax-years", action="store_true",
+                        help="One output row per placement and tax year, each taxed with that year's bands")
+    parser.add_argument("--cache", nargs="?", const=str(DEFAULT_CACHE_PATH), default=None, metavar="PATH",
+                        help="Reuse results of unchanged chunks from a persistent cache (default path if none given)")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024,
+                        help="Evict least recently used results above this size")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.cache, int(args.cache_max_mb * 1024 * 1024)) if args.cache else None
+    try:
+        rows, timings = run(
+            args.input, args.output, args.chunk_size, args.workers, args.region, args.split_tax_years, cache
+        )
+    finally:
+        if cache is not None:
+            report = cache.report()
+            cache.close()
+    print(f"Rows: {rows}", file=sys.stderr)
+    print(f"Throughput: {rows / timings['wall']:,.0f} rows/s", file=sys.stderr)
+    for stage in ("read", "cache", "calculate", "write", "wall"):
+        print(f"  {stage:<10} {timings[stage]:8.3f}s", file=sys.stderr)
+    if cache is not None:
+        print("Cache:", file=sys.stderr)
+        for name, value in report.items():
+            print(f"  {name:<16} {value}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
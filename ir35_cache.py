@@ -0,0 +1,209 @@
+# ======================
+# IR35 RESULT CACHE
+# Persistent SQLite cache of whole output chunks for repeat bulk runs
+#
+#   python ir35_bulk.py placements.csv results.parquet --cache
+#   python ir35_cache.py [--clear] [path]
+# ======================
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from ir35_core import TAX_YEARS
+
+# ----------
+# CONSTANTS
+# ----------
+# Bump when the calculation code changes the outputs for unchanged inputs
+CACHE_FORMAT = 2
+DEFAULT_CACHE_PATH = Path(
+    os.environ.get("IR35_CACHE_DIR", Path.home() / ".cache" / "ir35_calculator")
+) / "results.sqlite"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Eviction frees down to this share of the limit, so a run at the limit does not evict on every chunk
+EVICT_TO = 0.9
+# Rough per-row SQLite overhead on top of key and payload
+ROW_OVERHEAD_BYTES = 64
+RECENCY_SECONDS = 3600
+# A chunk's payload is megabytes: large pages keep a write to a few page allocations
+PAGE_SIZE = 65536
+PAYLOAD_COMPRESSION = "lz4"
+
+def config_version():
+    payload = json.dumps({"format": CACHE_FORMAT, "tax_years": TAX_YEARS}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def holidays_digest(bank_holidays):
+    # One set for every row, or a dict of sets by tax region
+    if isinstance(bank_holidays, dict):
+        text = ";".join(f"{region}={holidays_digest(days)}" for region, days in sorted(bank_holidays.items()))
+    else:
+        text = ",".join(sorted(day.isoformat() for day in bank_holidays))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+# ----------
+# STORE
+# ----------
+class ResultCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.version = config_version()
+        self.stats = {"Hits": 0, "Misses": 0, "Writes": 0, "Evictions": 0, "Invalidations": 0}
+        self.connection = sqlite3.connect(self.path)
+        # Only takes effect on a new file
+        self.connection.execute(f"PRAGMA page_size={PAGE_SIZE}")
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._check_version()
+
+    def _meta(self, name):
+        row = self.connection.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name, value):
+        self.connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def _reset(self):
+        # Drop and recreate rather than delete, so a cache from an older format gets the current table layout
+        self.connection.execute("DROP TABLE IF EXISTS results")
+        self.connection.execute(
+            "CREATE TABLE results (digest TEXT NOT NULL UNIQUE, payload BLOB NOT NULL, size INTEGER NOT NULL, "
+            "last_used REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX results_last_used ON results (last_used)")
+        self.connection.execute("DELETE FROM meta")
+        self._set_meta("config_version", self.version)
+        self._set_meta("size_bytes", "0")
+
+    def _check_version(self):
+        # A changed tax configuration (or cache format) makes every stored chunk stale
+        stored = self._meta("config_version")
+        if stored == self.version:
+            return
+        with self.connection:
+            self._reset()
+        if stored is not None:
+            self.stats["Invalidations"] += 1
+
+    def get(self, digest):
+        import pyarrow as pa
+
+        row = self.connection.execute("SELECT payload, last_used FROM results WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            self.stats["Misses"] += 1
+            return None
+        self.stats["Hits"] += 1
+        # Recency is kept to the hour, so back-to-back runs do not rewrite every chunk they read
+        now = time.time()
+        if row[1] < now - RECENCY_SECONDS:
+            with self.connection:
+                self.connection.execute("UPDATE results SET last_used = ? WHERE digest = ?", (now, digest))
+        return pa.ipc.open_stream(pa.py_buffer(row[0])).read_all()
+
+    def put(self, digest, table):
+        import pyarrow as pa
+
+        # Arrow IPC carries its own schema, so a payload always decodes with the types it was written with
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=PAYLOAD_COMPRESSION)
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        payload = sink.getvalue()
+        size = payload.size + len(digest) + ROW_OVERHEAD_BYTES
+        with self.connection:
+            replaced = self.connection.execute("SELECT size FROM results WHERE digest = ?", (digest,)).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (digest, payload, size, last_used) VALUES (?, ?, ?, ?)",
+                (digest, memoryview(payload), size, time.time())
+            )
+            total = self.size_bytes() + size - (replaced[0] if replaced else 0)
+            self._set_meta("size_bytes", str(total))
+        self.stats["Writes"] += 1
+        if total > self.max_bytes:
+            self._evict(total)
+
+    def size_bytes(self):
+        # A running total in meta, so a write never sums the whole table
+        return int(self._meta("size_bytes") or 0)
+
+    def _evict(self, total):
+        # Least recently used chunks go first, down to EVICT_TO of the limit
+        target = total - (self.max_bytes * EVICT_TO)
+        freed, digests = 0, []
+        for digest, size in self.connection.execute("SELECT digest, size FROM results ORDER BY last_used"):
+            digests.append((digest,))
+            freed += size
+            if freed >= target:
+                break
+        with self.connection:
+            self.connection.executemany("DELETE FROM results WHERE digest = ?", digests)
+            self._set_meta("size_bytes", str(total - freed))
+        self.stats["Evictions"] += len(digests)
+
+    def clear(self):
+        with self.connection:
+            self._reset()
+
+    def report(self):
+        lookups = self.stats["Hits"] + self.stats["Misses"]
+        return {
+            "Path": str(self.path),
+            "Config Version": self.version,
+            "Chunks": self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0],
+            "Size (MB)": round(self.size_bytes() / 1e6, 2),
+            "Max Size (MB)": round(self.max_bytes / 1e6, 2),
+            **self.stats,
+            "Hit Rate": f"{(self.stats['Hits'] / lookups * 100) if lookups else 0:.1f}%"
+        }
+
+    def close(self):
+        self.connection.close()
+
+# ----------
+# CHUNKS
+# ----------
+def run_context(cache, bank_holidays, split_tax_years):
+    return f"{cache.version}:{holidays_digest(bank_holidays)}:{int(split_tax_years)}"
+
+def chunk_digest(chunk, context):
+    import pyarrow as pa
+
+    # The Arrow buffers of the input chunk, hashed as they are: an unchanged chunk of a rerun is a single
+    # lookup, and its stored output is written without calculating or converting anything
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    digest = hashlib.sha256(f"{context}\x1e{table.schema}".encode("utf-8"))
+    for column in table.columns:
+        for array in column.chunks:
+            digest.update(f"\x1e{array.offset}:{len(array)}".encode("utf-8"))
+            for buffer in array.buffers():
+                if buffer is not None:
+                    digest.update(buffer)
+    return digest.hexdigest()
+
+# ----------
+# COMMAND LINE
+# ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show or clear the IR35 bulk result cache.")
+    parser.add_argument("path", nargs="?", default=DEFAULT_CACHE_PATH, help="Cache file")
+    parser.add_argument("--clear", action="store_true", help="Delete every cached result")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.path)
+    if args.clear:
+        cache.clear()
+    for name, value in cache.report().items():
+        print(f"{name:<16} {value}")
+    cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -3,54 +3,56 @@
 # Final Version 5.0
 # ======================
 
+import os
+
 import streamlit as st
-from PIL import Image
-from fpdf import FPDF
-import requests
 from datetime import datetime, timedelta
 import pandas as pd
 
+from ir35_core import (
+    calculate_comparison,
+    calculate_holiday_components,
+    calculate_working_days,
+    tax_results_cache_info,
+    tax_year_for
+)
+from ir35_export import (
+    FORMATS as EXPORT_FORMATS,
+    MIME_TYPES,
+    comparison_batches,
+    export_bytes,
+    scenario_batch,
+    tax_year_batches
+)
+from ir35_pdf import generate_pdf
+from ir35_batch import downsample_sweep, rate_sweep
+from ir35_graph import build_scenario_graph
+from ir35_montecarlo import simulate
+from ir35_profiling import (
+    ENABLED as PROFILING_ENABLED,
+    export as export_profile,
+    reset as reset_profile,
+    stage,
+    summary_rows
+)
+from ir35_scenarios import SALARY_STRATEGIES, calculate_scenario_matrix
+from ir35_solver import solve_client_rate
+from ir35_startup import logo_bytes, start_warmup, warm_bank_holidays
+from ir35_tax_config import BANK_HOLIDAY_DIVISIONS, DEFAULT_TAX_REGION, TAX_REGIONS
+from ir35_tax_years import tax_year_segments
+from ir35_tables import render_table, table_css
+
 # ----------
 # CONSTANTS
 # ----------
-TAX_YEAR_CONFIG = {
-    "tax_year_label": "2025/26 (rUK)",
-    "income_tax": {
-        "personal_allowance": 12570,
-        "basic_rate_limit": 50270,
-        "higher_rate_limit": 125140,
-        "basic_rate": 0.20,
-        "higher_rate": 0.40,
-        "additional_rate": 0.45
-    },
-    "dividend_tax": {
-        "allowance": 500,
-        "basic_rate": 0.0875,
-        "higher_rate": 0.3375,
-        "additional_rate": 0.3935
-    },
-    "national_insurance": {
-        "employee_primary_threshold": 12570,
-        "employee_upper_earnings_limit": 50270,
-        "employee_main_rate": 0.08,
-        "employee_additional_rate": 0.02,
-        "employer_secondary_threshold": 9100,
-        "employer_rate": 0.138
-    },
-    "corporation_tax": {
-        "small_profits_rate": 0.19,
-        "main_rate": 0.25,
-        "lower_limit": 50000,
-        "upper_limit": 250000,
-        "marginal_relief_fraction": 0.015
-    }
-}
-
 GREY = "#515D7A"
 ORANGE = "#F39200"
 LIGHT_GREY = "#F5F5F5"
 WHITE = "#FFFFFF"
 
+MAX_SWEEP_CHART_POINTS = 2000
+PROFILE_EXPORT_DIR = "profiles"
+
 TOOLTIPS = {
     "client_rate": "The daily rate charged to your end client (before deductions)",
     "base_rate": "Rate before employer deductions (Client Rate minus Margin)",
@@ -65,7 +67,8 @@ TOOLTIPS = {
     "outside_salary": "Annual director salary paid through PAYE",
     "dividend_strategy": "How remaining profit is distributed as dividends",
     "employer_pension": "Mandatory employer pension contribution (3% minimum)",
-    "holiday_pay": "Statutory holiday pay included (Inside IR35)"
+    "holiday_pay": "Statutory holiday pay included (Inside IR35)",
+    "tax_region": "Scottish taxpayers pay Scottish income tax on earnings; NI and dividend tax are UK-wide"
     
 }
 
@@ -79,6 +82,7 @@ def initialize_session_state():
             'compare_mode': False,
             'calculation_mode': "Client Rate",
             'status': "Inside IR35",
+            'tax_region': DEFAULT_TAX_REGION,
             'working_days': 0,
             'employee_pension': 5.0,
             'employer_pension_percent': 3.0,
@@ -97,435 +101,135 @@ def initialize_session_state():
             'pay_rate': 400.0,
             'margin_percent': 23.0,
             'margin': None,
+            'scenario_graph': build_scenario_graph(),
+            'rendered_tables': {},
+            'table_renders': {},
             'initialized': True
         }
         for key, value in defaults.items():
             st.session_state[key] = value
 
 # ----------
-# CALCULATION FUNCTIONS
+# REFERENCE DATA
 # ----------
-def get_uk_bank_holidays():
-    try:
-        response = requests.get('https://www.gov.uk/bank-holidays.json')
-        data = response.json()
-        england_holidays = data['england-and-wales']['events']
-        return [datetime.strptime(event['date'], '%Y-%m-%d').date() for event in england_holidays]
-    except:
-        return [
-            datetime(2023, 1, 2).date(), datetime(2023, 4, 7).date(),
-            datetime(2023, 4, 10).date(), datetime(2023, 5, 1).date(),
-            datetime(2023, 5, 8).date(), datetime(2023, 5, 29).date(),
-            datetime(2023, 8, 28).date(), datetime(2023, 12, 25).date(),
-            datetime(2023, 12, 26).date()
-        ]
+# Working days use the bank holidays of the taxpayer's region; rUK takes the England and Wales list
+def get_uk_bank_holidays(tax_region=None):
+    return warm_bank_holidays(BANK_HOLIDAY_DIVISIONS[tax_region or st.session_state.tax_region])
 
-def calculate_working_days(start_date, end_date, days_per_week, bank_holidays):
-    if start_date >= end_date:
-        return 0
-    total_days = (end_date - start_date).days + 1
-    working_days = 0
-    for day in range(total_days):
-        current_date = start_date + timedelta(days=day)
-        if current_date.weekday() < 5 and current_date not in bank_holidays:
-            working_days += 1
-    full_weeks = working_days // 5
-    remaining_days = working_days % 5
-    return (full_weeks * days_per_week) + min(remaining_days, days_per_week)
-
-def calculate_holiday_components(pay_rate):
-    basic_daily_rate = pay_rate / (1 + 0.1454)
-    holiday_pay = pay_rate - basic_daily_rate
-    return round(basic_daily_rate), round(holiday_pay)
-
-def calculate_base_rate(client_rate, margin_percent):
-    return client_rate * (1 - margin_percent/100)
-
-def calculate_client_rate(base_rate, margin_percent):
-    return base_rate / (1 - margin_percent/100)
-
-def calculate_pay_rate(base_rate, status="Inside IR35"):
-    return base_rate / 1.185 if status == "Inside IR35" else base_rate
-
-def calculate_base_rate_from_pay(pay_rate, status="Inside IR35"):
-    return pay_rate * 1.185 if status == "Inside IR35" else pay_rate
-
-def calculate_employer_deductions(base_rate, working_days):
-    daily_ni = base_rate * 0.15
-    daily_pension = base_rate * (st.session_state.employer_pension_percent / 100)
-    daily_levy = base_rate * 0.005
-    return {
-        "Daily Employer NI": round(daily_ni),
-        "Daily Employer Pension": round(daily_pension),
-        "Daily Apprentice Levy": round(daily_levy),
-        "Total Employer NI": round(daily_ni * working_days),
-        "Total Employer Pension": round(daily_pension * working_days),
-        "Total Apprentice Levy": round(daily_levy * working_days),
-        "Total Employer Deductions": round((daily_ni + daily_pension + daily_levy) * working_days)
-    }
-
-def calculate_margin(client_rate, base_rate, working_days):
-    daily_margin = client_rate - base_rate
-    margin_percent = ((client_rate - base_rate) / client_rate) * 100
-    return {
-        "Daily Margin": round(daily_margin),
-        "Total Margin": round(daily_margin * working_days),
-        "Margin Percentage": round(margin_percent, 1)
-    }
-
-def calculate_corporation_tax(profit):
-    corp_tax_config = TAX_YEAR_CONFIG["corporation_tax"]
-    if profit <= 0:
-        return 0
-    if profit <= corp_tax_config["lower_limit"]:
-        return profit * corp_tax_config["small_profits_rate"]
-    if profit >= corp_tax_config["upper_limit"]:
-        return profit * corp_tax_config["main_rate"]
-    # Marginal relief formula (UK): CT = profit * main_rate - (upper_limit - profit) * marginal_relief_fraction
-    return (profit * corp_tax_config["main_rate"]) - (
-        (corp_tax_config["upper_limit"] - profit) * corp_tax_config["marginal_relief_fraction"]
-    )
-
-def calculate_ltd_company_finances(pay_rate, working_days, allowable_expenses, salary, employer_pension_percent, vat_registered):
-    turnover = pay_rate * working_days
-    employer_ni_threshold = TAX_YEAR_CONFIG["national_insurance"]["employer_secondary_threshold"]
-    employer_ni_rate = TAX_YEAR_CONFIG["national_insurance"]["employer_rate"]
-    employer_ni = max(0, salary - employer_ni_threshold) * employer_ni_rate
-    employer_pension = salary * (employer_pension_percent / 100)
-    profit_before_tax = turnover - allowable_expenses - salary - employer_ni - employer_pension
-    corporation_tax = calculate_corporation_tax(profit_before_tax)
-    profit_after_tax = profit_before_tax - corporation_tax
-    dividends_available = max(0, profit_after_tax)
-    vat_output = turnover * 0.2 if vat_registered else 0
-    return {
-        "Turnover": turnover,
-        "Allowable Expenses": allowable_expenses,
-        "Director Salary": salary,
-        "Employer NI": employer_ni,
-        "Employer Pension": employer_pension,
-        "Profit Before Tax": profit_before_tax,
-        "Corporation Tax": corporation_tax,
-        "Profit After Tax": profit_after_tax,
-        "Dividends Available": dividends_available,
-        "VAT Output": vat_output
-    }
-
-def calculate_employee_income_tax(income):
-    tax_config = TAX_YEAR_CONFIG["income_tax"]
-    personal_allowance = tax_config["personal_allowance"]
-    basic_limit = tax_config["basic_rate_limit"]
-    higher_limit = tax_config["higher_rate_limit"]
-    if income <= personal_allowance:
-        return 0
-    if income <= basic_limit:
-        return (income - personal_allowance) * tax_config["basic_rate"]
-    if income <= higher_limit:
-        return ((basic_limit - personal_allowance) * tax_config["basic_rate"]) + (
-            (income - basic_limit) * tax_config["higher_rate"]
-        )
-    return ((basic_limit - personal_allowance) * tax_config["basic_rate"]) + (
-        (higher_limit - basic_limit) * tax_config["higher_rate"]
-    ) + ((income - higher_limit) * tax_config["additional_rate"])
-
-def calculate_employee_ni(income):
-    ni_config = TAX_YEAR_CONFIG["national_insurance"]
-    threshold = ni_config["employee_primary_threshold"]
-    uel = ni_config["employee_upper_earnings_limit"]
-    if income <= threshold:
-        return 0
-    if income <= uel:
-        return (income - threshold) * ni_config["employee_main_rate"]
-    return ((uel - threshold) * ni_config["employee_main_rate"]) + (
-        (income - uel) * ni_config["employee_additional_rate"]
-    )
-
-def calculate_dividend_tax(salary, dividends):
-    tax_config = TAX_YEAR_CONFIG["income_tax"]
-    dividend_config = TAX_YEAR_CONFIG["dividend_tax"]
-    personal_allowance = tax_config["personal_allowance"]
-    basic_band = tax_config["basic_rate_limit"] - personal_allowance
-    higher_band = tax_config["higher_rate_limit"] - personal_allowance
-
-    remaining_allowance = max(0, personal_allowance - salary)
-    taxable_dividends = max(0, dividends - remaining_allowance - dividend_config["allowance"])
-    taxable_salary = max(0, salary - personal_allowance)
-
-    remaining_basic = max(0, basic_band - taxable_salary)
-    basic_dividends = min(remaining_basic, taxable_dividends)
-    remaining_dividends = taxable_dividends - basic_dividends
-
-    remaining_higher = max(0, higher_band - taxable_salary - basic_dividends)
-    higher_dividends = min(remaining_higher, remaining_dividends)
-    additional_dividends = max(0, remaining_dividends - higher_dividends)
-
-    dividend_tax = (
-        (basic_dividends * dividend_config["basic_rate"])
-        + (higher_dividends * dividend_config["higher_rate"])
-        + (additional_dividends * dividend_config["additional_rate"])
-    )
-    return dividend_tax
-
-def calculate_student_loan_repayment(total_income, student_loan_plan):
-    if student_loan_plan == "Plan 1" and total_income > 22015:
-        return (total_income - 22015) * 0.09
-    if student_loan_plan in ["Plan 2", "Plan 5"] and total_income > 27295:
-        return (total_income - 27295) * 0.09
-    if student_loan_plan == "Plan 4" and total_income > 31395:
-        return (total_income - 31395) * 0.09
-    if student_loan_plan == "Postgraduate Loan" and total_income > 21000:
-        return (total_income - 21000) * 0.06
-    return 0
-
-def calculate_personal_taxes(salary, dividends, student_loan_plan):
-    income_tax = calculate_employee_income_tax(salary)
-    employee_ni = calculate_employee_ni(salary)
-    dividend_tax = calculate_dividend_tax(salary, dividends)
-    total_income = salary + dividends
-    student_loan_repayment = calculate_student_loan_repayment(total_income, student_loan_plan)
-    total_tax = income_tax + employee_ni + dividend_tax + student_loan_repayment
-    net_income = total_income - total_tax
-    return {
-        "Salary Income Tax": round(income_tax),
-        "Employee NI": round(employee_ni),
-        "Dividend Tax": round(dividend_tax),
-        "Student Loan Repayment": round(student_loan_repayment),
-        "Total Personal Tax": round(total_tax),
-        "Net Personal Income": round(net_income)
-    }
-
-def ir35_tax_calculator(pay_rate, working_days, pension_contribution_percent=5,
-                       student_loan_plan="None", status="Inside IR35", vat_registered=False,
-                       allowable_expenses=0.0, salary_amount=12570.0,
-                       employer_pension_percent=3.0, outside_business_type="Limited Company (Director/Shareholder)",
-                       dividend_strategy="Distribute all profit after corporation tax"):
-    if status == "Outside IR35":
-        annual_income = pay_rate * working_days
-        vat_amount = annual_income * 0.2 if vat_registered else 0
-        if outside_business_type == "Limited Company (Director/Shareholder)":
-            company_breakdown = calculate_ltd_company_finances(
-                pay_rate,
-                working_days,
-                allowable_expenses,
-                salary_amount,
-                employer_pension_percent,
-                vat_registered
-            )
-            dividends = company_breakdown["Dividends Available"]
-            personal_breakdown = calculate_personal_taxes(
-                salary_amount,
-                dividends,
-                student_loan_plan
-            )
-            net_take_home = personal_breakdown["Net Personal Income"]
-        else:
-            company_breakdown = {}
-            personal_breakdown = {}
-            net_take_home = 0
-        return {
-            "Base Rate": pay_rate,
-            "Pay Rate": pay_rate,
-            "VAT Amount": round(vat_amount),
-            "Working Days": working_days,
-            "Project Total": round(annual_income),
-            "Daily Rate": round(pay_rate),
-            "Company Breakdown": company_breakdown,
-            "Personal Breakdown": personal_breakdown,
-            "Net Take-Home Pay": round(net_take_home),
-            "Dividend Strategy": dividend_strategy,
-            "Disclaimer": (
-                f"Assumes UK tax year {TAX_YEAR_CONFIG['tax_year_label']} and that this contract is your only "
-                "income source. As a self-employed consultant, you are responsible for calculating and paying your "
-                "own taxes and National Insurance via Self Assessment. These figures are illustrative and do not "
-                "constitute tax advice."
-            )
-        }
-    else:
-        annual_income = pay_rate * working_days
-        personal_allowance = 12570
-        basic_rate_threshold = 50270
-        higher_rate_threshold = 125140
-        
-        # Tax calculations
-        taxable_income = annual_income - (annual_income * (pension_contribution_percent / 100))
-        if taxable_income <= personal_allowance:
-            income_tax = 0
-        elif taxable_income <= basic_rate_threshold:
-            income_tax = (taxable_income - personal_allowance) * 0.2
-        elif taxable_income <= higher_rate_threshold:
-            income_tax = (basic_rate_threshold - personal_allowance) * 0.2 + (taxable_income - basic_rate_threshold) * 0.4
-        else:
-            income_tax = (basic_rate_threshold - personal_allowance) * 0.2 + (higher_rate_threshold - basic_rate_threshold) * 0.4 + (taxable_income - higher_rate_threshold) * 0.45
-        
-        # National Insurance
-        ni_threshold = 12570
-        if annual_income <= ni_threshold:
-            ni_contribution = 0
-        elif annual_income <= basic_rate_threshold:
-            ni_contribution = (annual_income - ni_threshold) * 0.08
-        else:
-            ni_contribution = (basic_rate_threshold - ni_threshold) * 0.08 + (annual_income - basic_rate_threshold) * 0.02
-        
-        # Student Loan
-        student_loan_repayment = 0
-        if student_loan_plan == "Plan 1" and annual_income > 22015:
-            student_loan_repayment = (annual_income - 22015) * 0.09
-        elif student_loan_plan in ["Plan 2", "Plan 5"] and annual_income > 27295:
-            student_loan_repayment = (annual_income - 27295) * 0.09
-        elif student_loan_plan == "Plan 4" and annual_income > 31395:
-            student_loan_repayment = (annual_income - 31395) * 0.09
-        elif student_loan_plan == "Postgraduate Loan" and annual_income > 21000:
-            student_loan_repayment = (annual_income - 21000) * 0.06
-        
-        take_home_pay = annual_income - (income_tax + ni_contribution + student_loan_repayment + (annual_income * (pension_contribution_percent / 100)))
-        
-        return {
-            "Gross Income": round(annual_income),
-            "Employee Pension": round(annual_income * (pension_contribution_percent / 100)),
-            "Income Tax": round(income_tax),
-            "Employee NI": round(ni_contribution),
-            "Student Loan Repayment": round(student_loan_repayment),
-            "Net Take-Home Pay": round(take_home_pay),
-            "Working Days": working_days,
-            "Daily Rate": round(pay_rate)
-        }
+def project_tax_years():
+    # The tax year configs the project's dates fall in, in order; results add them up when there are two
+    state = st.session_state
+    labels = [tax_year_for(segment_start, state.tax_region)
+              for _, segment_start, _ in tax_year_segments(state.start_date, state.end_date)]
+    return list(dict.fromkeys(labels)) or [tax_year_for(state.start_date, state.tax_region)]
 
 # ----------
-# PDF GENERATION
+# CALCULATION GRAPH
 # ----------
-def generate_pdf(result, calculation_mode, client_rate=None, base_rate=None, 
-               pay_rate=None, margin=None, employer_deductions=None, status="Inside IR35"):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    
-    # Main title
-    pdf.set_font("Arial", size=16, style='B')
-    pdf.cell(200, 10, "IR35 Tax Calculation Results", ln=True, align='C')
-    pdf.ln(10)
-    
-    # Rate Summary
-    pdf.set_font("Arial", size=12, style='B')
-    pdf.cell(200, 8, "Rate Summary", ln=True)
-    pdf.set_font("Arial", size=11)
-    
-    if status == "Outside IR35":
-        pdf.cell(200, 8, f"Base Rate = Pay Rate: £{round(pay_rate)}", ln=True)
-        pdf.cell(200, 8, f"Working Days: {result['Working Days']}", ln=True)
-        pdf.cell(200, 8, f"Project Total: £{round(result['Project Total'])}", ln=True)
-        pdf.cell(200, 8, f"Assumes UK tax year {TAX_YEAR_CONFIG['tax_year_label']}.", ln=True)
-        if result['VAT Amount'] > 0:
-            pdf.cell(200, 8, f"VAT Charged to Client (20%): £{round(result['VAT Amount'])}", ln=True)
+def scenario_inputs(bank_holidays):
+    state = st.session_state
+    rate_key = {"Client Rate": "client_rate", "Base Rate": "base_rate"}.get(state.calculation_mode, "pay_rate")
+    inputs = {
+        "start_date": state.start_date,
+        "end_date": state.end_date,
+        "days_per_week": state.days_per_week,
+        "bank_holidays": bank_holidays,
+        "calculation_mode": state.calculation_mode,
+        "rate": float(state[rate_key]),
+        "margin_percent": float(state.margin_percent),
+        "status": state.status,
+        "employer_pension_percent": float(state.employer_pension_percent),
+        "tax_region": state.tax_region
+    }
+    # Fields the active status ignores are pinned, so editing them leaves the results untouched
+    if state.status == "Inside IR35":
+        inputs.update(employee_pension=float(state.employee_pension), student_loan=state.student_loan,
+                      vat_registered=False, allowable_expenses=0.0, outside_salary=12570.0,
+                      outside_business_type=None, dividend_strategy=None)
     else:
-        if calculation_mode == "Client Rate":
-            pdf.cell(200, 8, f"Client Rate: £{round(client_rate)}", ln=True)
-            pdf.cell(200, 8, f"Margin: {margin['Margin Percentage']}% (£{margin['Daily Margin']}/day)", ln=True)
-            pdf.cell(200, 8, f"Base Rate: £{round(base_rate)}", ln=True)
-        elif calculation_mode == "Base Rate":
-            pdf.cell(200, 8, f"Base Rate: £{round(base_rate)}", ln=True)
-            pdf.cell(200, 8, f"Margin: {margin['Margin Percentage']}% (£{margin['Daily Margin']}/day)", ln=True)
-            pdf.cell(200, 8, f"Client Rate: £{round(client_rate)}", ln=True)
+        inputs.update(employee_pension=0.0, student_loan=state.outside_student_loan,
+                      vat_registered=state.vat_registered, allowable_expenses=float(state.allowable_expenses),
+                      outside_salary=float(state.outside_salary), outside_business_type=state.outside_business_type,
+                      dividend_strategy=state.dividend_strategy)
+    return inputs
+
+def student_loan_plans():
+    state = st.session_state
+    return {"Inside IR35": state.student_loan, "Outside IR35": state.outside_student_loan}
+
+def default_scenarios():
+    state = st.session_state
+    base = {
+        "calculation_mode": "Client Rate",
+        "rate": float(state.client_rate),
+        "margin_percent": float(state.margin_percent),
+        "employee_pension": float(state.employee_pension),
+        "student_loan": state.student_loan,
+        "days_per_week": state.days_per_week,
+        "vat_registered": False,
+        "allowable_expenses": float(state.allowable_expenses),
+        "outside_salary": float(state.outside_salary),
+        "employer_pension_percent": float(state.employer_pension_percent),
+        "tax_region": state.tax_region,
+        "salary_strategy": "Fixed"
+    }
+    return pd.DataFrame([
+        {**base, "name": "Inside", "status": "Inside IR35"},
+        {**base, "name": "Outside", "status": "Outside IR35"},
+        {**base, "name": "Outside, optimised salary", "status": "Outside IR35", "salary_strategy": "Optimised"},
+        {**base, "name": "Outside, VAT, 4 days", "status": "Outside IR35", "vat_registered": True, "days_per_week": 4}
+    ])
+
+def cached_table(name, version, build):
+    # Tables are rebuilt only when the graph nodes they show have a new version
+    tables = st.session_state.rendered_tables
+    if name not in tables or tables[name][0] != version:
+        tables[name] = (version, build())
+        st.session_state.table_renders[name] = st.session_state.table_renders.get(name, 0) + 1
+    return tables[name][1]
+
+def show_cache_debug_panel():
+    info = tax_results_cache_info()
+    lookups = info.hits + info.misses
+    with st.expander("Debug: calculation cache"):
+        cols = st.columns(4)
+        cols[0].metric("Hits", info.hits)
+        cols[1].metric("Misses", info.misses)
+        cols[2].metric("Hit Rate", f"{(info.hits / lookups * 100) if lookups else 0:.0f}%")
+        cols[3].metric("Entries", f"{info.currsize}/{info.maxsize}")
+        graph = st.session_state.scenario_graph
+        st.dataframe(pd.DataFrame(
+            [[name, count, graph.versions(name)[0]] for name, count in graph.recompute_counts().items()],
+            columns=["Node", "Recomputes", "Version"]
+        ), use_container_width=True)
+        st.dataframe(pd.DataFrame(
+            list(st.session_state.table_renders.items()), columns=["Table", "Renders"]
+        ), use_container_width=True)
+
+def show_profiling_sidebar():
+    with st.sidebar:
+        st.header("Diagnostics")
+        rows = summary_rows()
+        if not rows:
+            st.caption("No stages timed yet.")
         else:
-            pdf.cell(200, 8, f"Pay Rate: £{round(pay_rate)}", ln=True)
-            pdf.cell(200, 8, f"Base Rate: £{round(base_rate)}", ln=True)
-            pdf.cell(200, 8, f"Margin: {margin['Margin Percentage']}% (£{margin['Daily Margin']}/day)", ln=True)
-            pdf.cell(200, 8, f"Client Rate: £{round(client_rate)}", ln=True)
-    
-    # Inside IR35 Deductions
-    if status == "Inside IR35" and employer_deductions:
-        pdf.ln(5)
-        pdf.set_font("Arial", size=12, style='B')
-        pdf.cell(200, 8, "Employer Deductions", ln=True)
-        pdf.set_font("Arial", size=11)
-        pdf.cell(200, 8, f"Daily Employer NI (15%): £{employer_deductions['Daily Employer NI']}", ln=True)
-        pdf.cell(200, 8, f"Daily Employer Pension: £{employer_deductions['Daily Employer Pension']}", ln=True)
-        pdf.cell(200, 8, f"Daily Apprentice Levy (0.5%): £{employer_deductions['Daily Apprentice Levy']}", ln=True)
-        pdf.cell(200, 8, f"Total Employer NI: £{employer_deductions['Total Employer NI']}", ln=True)
-        pdf.cell(200, 8, f"Total Employer Pension: £{employer_deductions['Total Employer Pension']}", ln=True)
-        pdf.cell(200, 8, f"Total Apprentice Levy: £{employer_deductions['Total Apprentice Levy']}", ln=True)
-        pdf.cell(200, 8, f"Total Employer Deductions: £{employer_deductions['Total Employer Deductions']}", ln=True)
-    
-    # Project Breakdown
-    pdf.ln(5)
-    pdf.set_font("Arial", size=12, style='B')
-    pdf.cell(200, 8, "Project Breakdown", ln=True)
-    pdf.set_font("Arial", size=11)
-    
-    if status == "Inside IR35":
-        daily_net = result["Net Take-Home Pay"] / result["Working Days"]
-        pdf.cell(200, 8, f"Daily Gross: £{round(pay_rate)}", ln=True)
-        pdf.cell(200, 8, f"Daily Net: £{round(daily_net)}", ln=True)
-        pdf.cell(200, 8, f"Monthly Gross (20 days): £{round(pay_rate * 20)}", ln=True)
-        pdf.cell(200, 8, f"Monthly Net (20 days): £{round(daily_net * 20)}", ln=True)
-        pdf.cell(200, 8, f"Project Gross Total: £{round(result['Gross Income'])}", ln=True)
-        pdf.cell(200, 8, f"Project Net Total: £{round(result['Net Take-Home Pay'])}", ln=True)
-        
-        # Payslip Breakdown
-        basic_rate, holiday_pay = calculate_holiday_components(pay_rate)
-        pdf.ln(5)
-        pdf.set_font("Arial", size=12, style='B')
-        pdf.cell(200, 8, "Payslip Breakdown (Compliance)", ln=True)
-        pdf.set_font("Arial", size=11)
-        pdf.cell(200, 8, f"Basic Daily Rate (excl. holiday pay): £{basic_rate}", ln=True)
-        pdf.cell(200, 8, f"Holiday Pay (per day): £{holiday_pay}", ln=True)
-    
-    # Detailed Breakdown
-    if status == "Inside IR35":
-        pdf.ln(5)
-        pdf.set_font("Arial", size=12, style='B')
-        pdf.cell(200, 8, "Detailed Breakdown", ln=True)
-        pdf.set_font("Arial", size=11)
-        pdf.cell(200, 8, f"Gross Income: £{result['Gross Income']}", ln=True)
-        pdf.cell(200, 8, f"Income Tax: £{result['Income Tax']}", ln=True)
-        pdf.cell(200, 8, f"Employee NI: £{result['Employee NI']}", ln=True)
-        pdf.cell(200, 8, f"Employee Pension: £{result['Employee Pension']}", ln=True)
-        if result.get('Student Loan Repayment', 0) > 0:
-            pdf.cell(200, 8, f"Student Loan Repayment: £{result['Student Loan Repayment']}", ln=True)
-    elif status == "Outside IR35":
-        company_breakdown = result.get("Company Breakdown", {})
-        personal_breakdown = result.get("Personal Breakdown", {})
-        pdf.ln(5)
-        pdf.set_font("Arial", size=12, style='B')
-        pdf.cell(200, 8, "Company Breakdown", ln=True)
-        pdf.set_font("Arial", size=11)
-        for key, value in company_breakdown.items():
-            if key != "VAT Output":
-                pdf.cell(200, 8, f"{key}: £{round(value)}", ln=True)
-        if company_breakdown.get("VAT Output", 0) > 0:
-            pdf.cell(200, 8, f"VAT Output (20%): £{round(company_breakdown['VAT Output'])}", ln=True)
-        pdf.ln(5)
-        pdf.set_font("Arial", size=12, style='B')
-        pdf.cell(200, 8, "Personal Breakdown", ln=True)
-        pdf.set_font("Arial", size=11)
-        for key, value in personal_breakdown.items():
-            pdf.cell(200, 8, f"{key}: £{value}", ln=True)
-        pdf.cell(200, 8, f"Net Take-Home Pay: £{result.get('Net Take-Home Pay', 0)}", ln=True)
-    
-    # Disclaimer
-    pdf.ln(10)
-    pdf.set_font("Arial", size=8)
-    pdf.set_text_color(128, 128, 128)
-    pdf.cell(200, 8, "**Disclaimer:**", ln=True)
-    if status == "Outside IR35":
-        pdf.multi_cell(190, 5, "Assumes UK tax year 2025/26 (rUK) and this contract is your only income source. As a self-employed consultant, you are responsible for calculating and paying your own taxes and National Insurance via Self Assessment. These figures are illustrative and do not constitute tax advice.")
-    else:
-        pdf.multi_cell(190, 5, "The figures provided are for illustrative purposes only and may vary depending on individual circumstances. This tool is not intended to provide tax, legal, or accounting advice. Consult a qualified professional for advice tailored to your situation.")
-    
-    return pdf.output(dest='S').encode('latin1')
+            st.dataframe(pd.DataFrame(
+                rows, columns=["Stage", "Count", "Total (ms)", "Mean (ms)", "P50 (ms)", "P95 (ms)", "Max (ms)"]
+            ), use_container_width=True, hide_index=True)
+        cols = st.columns(3)
+        for col, (label, suffix) in zip(cols, [("Prometheus", "prom"), ("JSON", "json")]):
+            if col.button(label):
+                os.makedirs(PROFILE_EXPORT_DIR, exist_ok=True)
+                path = export_profile(os.path.join(PROFILE_EXPORT_DIR, f"ir35_profile_{datetime.now():%Y%m%d_%H%M%S}.{suffix}"))
+                st.caption(f"Written to {path}")
+        if cols[2].button("Reset"):
+            reset_profile()
 
 # ----------
 # STREAMLIT UI
 # ----------
-def styled_dataframe(df, title=""):
-    return df.style.set_table_styles([
-        {'selector': 'thead', 'props': [('background-color', GREY), ('color', WHITE)]},
-        {'selector': 'tbody tr:nth-child(even)', 'props': [('background-color', LIGHT_GREY)]},
-        {'selector': 'tbody tr:nth-child(odd)', 'props': [('background-color', WHITE)]},
-        {'selector': 'th.col_heading', 'props': [('text-align', 'left')]},
-        {'selector': 'td', 'props': [('text-align', 'left')]},
-        {'selector': '', 'props': [('border', f'1px solid {GREY}')]}
-    ]).set_caption(title)
-
 def main():
+    start_warmup()
     st.set_page_config(
         page_title="IR35 Tax Calculator", 
         layout="centered",
@@ -554,24 +258,20 @@ def main():
             h1, h2, h3 {{
                 color: {GREY};
             }}
+            {table_css(GREY, LIGHT_GREY, WHITE)}
         </style>
     """, unsafe_allow_html=True)
 
-    # Logo with fixed sizing
-    try:
-        logo = Image.open("B2e Logo.png")
-        st.image(logo, width=200, use_container_width=False)
-    except:
-        st.write("")
+    # Logo slot is filled after the form, so a slow disk never holds up the first paint
+    logo_slot = st.empty()
 
     st.title("IR35 Tax Calculator")
-    st.caption(f"Assumes UK tax year {TAX_YEAR_CONFIG['tax_year_label']}.")
-    bank_holidays = get_uk_bank_holidays()
     initialize_session_state()
+    st.caption(f"Assumes UK tax year {' and '.join(project_tax_years())}.")
 
     # Mode selection
     with st.container():
-        col1, col2 = st.columns([1, 1])
+        col1, col2, col3 = st.columns([1, 1, 1])
         with col1:
             st.session_state.calculation_mode = st.radio(
                 "Start Calculation From:",
@@ -585,6 +285,13 @@ def main():
                 index=0 if st.session_state.status == "Inside IR35" else 1,
                 help="Inside IR35: PAYE employment | Outside IR35: Self-employed"
             )
+        with col3:
+            st.session_state.tax_region = st.radio(
+                "Tax Region",
+                TAX_REGIONS,
+                index=TAX_REGIONS.index(st.session_state.tax_region),
+                help=TOOLTIPS["tax_region"]
+            )
 
     # Main calculator form
     with st.form("calculator_form"):
@@ -735,75 +442,26 @@ def main():
                 st.error("End date must be after start date")
             else:
                 try:
-                    st.session_state.working_days = calculate_working_days(
-                        st.session_state.start_date,
-                        st.session_state.end_date,
-                        st.session_state.days_per_week,
-                        bank_holidays
-                    )
-                    
-                    if st.session_state.calculation_mode == "Client Rate":
-                        st.session_state.base_rate = calculate_base_rate(
-                            float(st.session_state.client_rate),
-                            float(st.session_state.margin_percent)
-                        )
-                        st.session_state.pay_rate = calculate_pay_rate(
-                            float(st.session_state.base_rate),
-                            st.session_state.status
-                        )
-                    elif st.session_state.calculation_mode == "Base Rate":
-                        st.session_state.client_rate = calculate_client_rate(
-                            float(st.session_state.base_rate),
-                            float(st.session_state.margin_percent)
-                        )
-                        st.session_state.pay_rate = calculate_pay_rate(
-                            float(st.session_state.base_rate),
-                            st.session_state.status
-                        )
-                    else:
-                        st.session_state.base_rate = calculate_base_rate_from_pay(
-                            float(st.session_state.pay_rate),
-                            st.session_state.status
-                        )
-                        st.session_state.client_rate = calculate_client_rate(
-                            float(st.session_state.base_rate),
-                            float(st.session_state.margin_percent)
-                        )
-                    
-                    st.session_state.results = ir35_tax_calculator(
-                        float(st.session_state.pay_rate),
-                        st.session_state.working_days,
-                        float(st.session_state.employee_pension) if st.session_state.status == "Inside IR35" else 0.0,
-                        st.session_state.student_loan if st.session_state.status == "Inside IR35" else st.session_state.outside_student_loan,
-                        st.session_state.status,
-                        st.session_state.vat_registered if st.session_state.status == "Outside IR35" else False,
-                        st.session_state.allowable_expenses if st.session_state.status == "Outside IR35" else 0.0,
-                        st.session_state.outside_salary if st.session_state.status == "Outside IR35" else 12570.0,
-                        st.session_state.employer_pension_percent if st.session_state.status == "Outside IR35" else 3.0,
-                        st.session_state.outside_business_type if st.session_state.status == "Outside IR35" else "Limited Company (Director/Shareholder)",
-                        st.session_state.dividend_strategy if st.session_state.status == "Outside IR35" else "Distribute all profit after corporation tax"
-                    )
-                    
-                    st.session_state.margin = calculate_margin(
-                        float(st.session_state.client_rate),
-                        float(st.session_state.base_rate),
-                        st.session_state.working_days
-                    )
-                    
-                    if st.session_state.status == "Inside IR35":
-                        st.session_state.employer_deductions = calculate_employer_deductions(
-                            float(st.session_state.base_rate),
-                            st.session_state.working_days
-                        )
-                    else:
-                        st.session_state.employer_deductions = None
+                    with stage("scenario_graph"):
+                        graph = st.session_state.scenario_graph.evaluate(scenario_inputs(get_uk_bank_holidays()))
+                    st.session_state.working_days = graph.value("working_days")
+                    st.session_state.client_rate, st.session_state.base_rate, st.session_state.pay_rate = graph.value("rates")
+                    st.session_state.results = graph.value("results")
+                    st.session_state.margin = graph.value("margin")
+                    st.session_state.employer_deductions = graph.value("employer_deductions")
                         
                 except Exception as e:
                     st.error(f"Calculation error: {str(e)}")
 
+    with stage("logo"):
+        logo = logo_bytes()
+        if logo:
+            logo_slot.image(logo, width=200, use_container_width=False)
+
     # Results Display
     if st.session_state.get('results'):
         st.subheader("Results")
+        versions = st.session_state.scenario_graph.versions
         
         st.write("### Rate Summary")
         cols = st.columns(3)
@@ -817,7 +475,7 @@ def main():
             ["Daily Margin", f"£{st.session_state.margin['Daily Margin']}"],
             ["Total Margin", f"£{st.session_state.margin['Total Margin']}"]
         ]
-        st.dataframe(styled_dataframe(pd.DataFrame(margin_data, columns=["Metric", "Value"])), use_container_width=True)
+        st.markdown(cached_table("margin", versions("margin"), lambda: render_table(margin_data, ["Metric", "Value"])), unsafe_allow_html=True)
         
         if st.session_state.status == "Outside IR35":
             st.write("### Project Summary")
@@ -828,7 +486,7 @@ def main():
             ]
             if st.session_state.vat_registered:
                 summary_data.append(["VAT Charged to Client (20%)", f"£{round(st.session_state.results.get('VAT Amount', 0))}"])
-            st.dataframe(styled_dataframe(pd.DataFrame(summary_data, columns=["Metric", "Value"])), use_container_width=True)
+            st.markdown(cached_table("project_summary", versions("results", "working_days"), lambda: render_table(summary_data, ["Metric", "Value"])), unsafe_allow_html=True)
             company_breakdown = st.session_state.results.get("Company Breakdown", {})
             personal_breakdown = st.session_state.results.get("Personal Breakdown", {})
             if company_breakdown:
@@ -836,12 +494,20 @@ def main():
                 company_rows = [[key, f"£{round(value)}"] for key, value in company_breakdown.items() if key != "VAT Output"]
                 if company_breakdown.get("VAT Output", 0) > 0:
                     company_rows.append(["VAT Output (20%)", f"£{round(company_breakdown['VAT Output'])}"])
-                st.dataframe(styled_dataframe(pd.DataFrame(company_rows, columns=["Item", "Amount"])), use_container_width=True)
+                st.markdown(cached_table("company_breakdown", versions("results"), lambda: render_table(company_rows, ["Item", "Amount"])), unsafe_allow_html=True)
             if personal_breakdown:
                 st.write("### Personal Breakdown")
                 personal_rows = [[key, f"£{value}"] for key, value in personal_breakdown.items()]
-                st.dataframe(styled_dataframe(pd.DataFrame(personal_rows, columns=["Item", "Amount"])), use_container_width=True)
+                st.markdown(cached_table("personal_breakdown", versions("results"), lambda: render_table(personal_rows, ["Item", "Amount"])), unsafe_allow_html=True)
                 st.metric("Net Take-Home Pay", f"£{st.session_state.results.get('Net Take-Home Pay', 0)}")
+                optimal = st.session_state.scenario_graph.value("salary_optimum")
+                if optimal:
+                    uplift = optimal["Net Take-Home Pay"] - st.session_state.results.get("Net Take-Home Pay", 0)
+                    if uplift > 0:
+                        st.info(
+                            f"A director salary of £{round(optimal['Salary']):,} with £{round(optimal['Dividends']):,} "
+                            f"in dividends would take home £{optimal['Net Take-Home Pay']:,} (£{uplift:,} more)."
+                        )
             st.warning(st.session_state.results.get('Disclaimer', ""))
         else:
             if st.session_state.employer_deductions:
@@ -855,7 +521,7 @@ def main():
                     ["Total Apprentice Levy", f"£{st.session_state.employer_deductions['Total Apprentice Levy']}"],
                     ["Total Employer Deductions", f"£{st.session_state.employer_deductions['Total Employer Deductions']}"]
                 ]
-                st.dataframe(styled_dataframe(pd.DataFrame(deductions_data, columns=["Deduction", "Amount"])), use_container_width=True)
+                st.markdown(cached_table("employer_deductions", versions("employer_deductions"), lambda: render_table(deductions_data, ["Deduction", "Amount"])), unsafe_allow_html=True)
             
             st.write("### Project Breakdown")
             breakdown_data = [
@@ -863,22 +529,34 @@ def main():
                 ["Monthly Rates (20 days)", f"£{round(st.session_state.pay_rate * 20)}", f"£{round((st.session_state.results['Net Take-Home Pay'] / st.session_state.working_days) * 20)}"],
                 [f"Project Total ({st.session_state.working_days} days)", f"£{round(st.session_state.pay_rate * st.session_state.working_days)}", f"£{round(st.session_state.results['Net Take-Home Pay'])}"]
             ]
-            st.dataframe(styled_dataframe(pd.DataFrame(breakdown_data, columns=["Period", "Gross", "Net"])), use_container_width=True)
+            st.markdown(cached_table("project_breakdown", versions("rates", "results", "working_days"), lambda: render_table(breakdown_data, ["Period", "Gross", "Net"])), unsafe_allow_html=True)
             
             basic_rate, holiday_pay = calculate_holiday_components(st.session_state.pay_rate)
             st.write("### Payslip Breakdown (Compliance)")
-            st.dataframe(styled_dataframe(pd.DataFrame([
+            st.markdown(cached_table("payslip", versions("rates"), lambda: render_table([
                 ["Basic Daily Rate (excl. holiday pay)", f"£{basic_rate}"],
                 ["Holiday Pay (per day)", f"£{holiday_pay}"]
-            ], columns=["Component", "Amount"])), use_container_width=True)
+            ], ["Component", "Amount"])), unsafe_allow_html=True)
             
             st.write("### Detailed Breakdown")
             breakdown_items = []
             for key, value in st.session_state.results.items():
                 if key not in ["VAT Amount", "Working Days", "Disclaimer"]:
                     breakdown_items.append([key.replace("_", " ").title(), f"£{value}"])
-            st.dataframe(styled_dataframe(pd.DataFrame(breakdown_items, columns=["Item", "Amount"])), use_container_width=True)
-        
+            st.markdown(cached_table("detailed_breakdown", versions("results"), lambda: render_table(breakdown_items, ["Item", "Amount"])), unsafe_allow_html=True)
+
+        tax_years = st.session_state.scenario_graph.value("tax_years")
+        if tax_years:
+            st.write("### Tax Year Split")
+            tax_year_rows = [
+                [year["Tax Year"], f"{year['Start Date']:%d %b %Y} – {year['End Date']:%d %b %Y}", year["Working Days"],
+                 f"£{year['Results']['Net Take-Home Pay']}"]
+                for year in tax_years["Tax Years"]
+            ]
+            tax_year_rows.append(["Total", "", tax_years["Working Days"], f"£{tax_years['Net Take-Home Pay']}"])
+            st.markdown(cached_table("tax_years", versions("tax_years"), lambda: render_table(tax_year_rows, ["Tax Year", "Period", "Working Days", "Net"])), unsafe_allow_html=True)
+            st.caption("The project spans 6 April, so each tax year's part is taxed with that year's bands and allowances.")
+
         # PDF Generation
         st.markdown("---")
         if st.button("📄 Generate PDF Report"):
@@ -890,7 +568,8 @@ def main():
                 st.session_state.pay_rate,
                 st.session_state.margin,
                 st.session_state.employer_deductions,
-                st.session_state.status
+                st.session_state.status,
+                project_tax_years()
             )
             st.download_button(
                 "💾 Download PDF",
@@ -899,6 +578,229 @@ def main():
                 mime="application/pdf"
             )
 
+        export_format = st.radio("Results export format:", EXPORT_FORMATS, horizontal=True, key="export_format")
+        split = st.session_state.scenario_graph.value("tax_years")
+        export_data = cached_table(f"export_{export_format}", versions("rates", "results", "margin", "employer_deductions", "tax_years"), lambda: export_bytes(
+            tax_year_batches(
+                split,
+                st.session_state.client_rate,
+                st.session_state.base_rate,
+                st.session_state.pay_rate,
+                st.session_state.status,
+                float(st.session_state.employer_pension_percent)
+            ) if split else [scenario_batch(
+                st.session_state.results,
+                st.session_state.client_rate,
+                st.session_state.base_rate,
+                st.session_state.pay_rate,
+                st.session_state.margin,
+                st.session_state.employer_deductions if st.session_state.status == "Inside IR35" else None,
+                project_tax_years()[0],
+                name=st.session_state.status
+            )],
+            export_format
+        ))
+        st.download_button(
+            f"💾 Download Results ({export_format.title()})",
+            data=export_data,
+            file_name=f"IR35_Results_{datetime.now().strftime('%Y%m%d')}.{export_format}",
+            mime=MIME_TYPES[export_format]
+        )
+
+    # Target Net Solver
+    st.subheader("Target Net Take-Home")
+    st.session_state.solver_mode = st.checkbox("Enable Target Net Solver")
+
+    if st.session_state.solver_mode:
+        target_net = st.number_input("Target Net Take-Home for the Project (£)", min_value=0.0, value=50000.0, step=1000.0)
+
+        try:
+            working_days = calculate_working_days(
+                st.session_state.start_date,
+                st.session_state.end_date,
+                st.session_state.days_per_week,
+                get_uk_bank_holidays()
+            )
+            if not working_days:
+                st.warning("Enter a valid project period.")
+            else:
+                outside = st.session_state.status == "Outside IR35"
+                with stage("solver"):
+                    solved = solve_client_rate(
+                        target_net,
+                        working_days,
+                        float(st.session_state.margin_percent),
+                        st.session_state.status,
+                        pension_contribution_percent=float(st.session_state.employee_pension),
+                        student_loan_plan=st.session_state.outside_student_loan if outside else st.session_state.student_loan,
+                        allowable_expenses=float(st.session_state.allowable_expenses),
+                        salary_amount=float(st.session_state.outside_salary),
+                        employer_pension_percent=float(st.session_state.employer_pension_percent),
+                        outside_business_type=st.session_state.outside_business_type,
+                        tax_year=project_tax_years()[0]
+                    )
+                cols = st.columns(3)
+                cols[0].metric("Required Client Rate", f"£{solved['Client Rate']:,.2f}")
+                cols[1].metric("Required Base Rate", f"£{solved['Base Rate']:,.2f}")
+                cols[2].metric("Required Pay Rate", f"£{solved['Pay Rate']:,.2f}")
+                st.caption(
+                    f"{st.session_state.status} at {st.session_state.margin_percent}% margin over {working_days} working days; "
+                    f"solved from {solved['Evaluations']} band-edge evaluations."
+                )
+        except Exception as e:
+            st.error(f"Solver error: {str(e)}")
+
+    # Rate Sweep
+    st.subheader("Rate Sweep")
+    st.session_state.sweep_mode = st.checkbox("Enable Rate Sweep")
+
+    if st.session_state.sweep_mode:
+        col1, col2, col3 = st.columns(3)
+        sweep_min = col1.number_input("From Client Rate (£)", min_value=0.0, value=300.0, step=50.0)
+        sweep_max = col2.number_input("To Client Rate (£)", min_value=0.0, value=1500.0, step=50.0)
+        sweep_step = col3.number_input("Step (£)", min_value=1.0, value=5.0, step=1.0)
+        sweep_margins = st.text_input("Margins (%), comma separated", value="15, 20, 23, 25")
+        sweep_statuses = st.multiselect("IR35 Status", ["Inside IR35", "Outside IR35"], default=["Inside IR35", "Outside IR35"])
+
+        try:
+            margins = [float(margin) for margin in sweep_margins.split(",") if margin.strip()]
+            working_days = calculate_working_days(
+                st.session_state.start_date,
+                st.session_state.end_date,
+                st.session_state.days_per_week,
+                get_uk_bank_holidays()
+            )
+            if sweep_max < sweep_min or not margins or not sweep_statuses or not working_days:
+                st.warning("Enter a rate range, at least one margin and status, and a valid project period.")
+            else:
+                with stage("rate_sweep"):
+                    sweep = rate_sweep(
+                        [sweep_min + (sweep_step * i) for i in range(int((sweep_max - sweep_min) // sweep_step) + 1)],
+                        margins,
+                        working_days,
+                        sweep_statuses,
+                        student_loan_plans=student_loan_plans(),
+                        pension_contribution_percent=float(st.session_state.employee_pension),
+                        allowable_expenses=float(st.session_state.allowable_expenses),
+                        salary_amount=float(st.session_state.outside_salary),
+                        employer_pension_percent=float(st.session_state.employer_pension_percent),
+                        tax_year=project_tax_years()[0]
+                    )
+                    chart = downsample_sweep(sweep, MAX_SWEEP_CHART_POINTS)
+                chart = chart.assign(Scenario=chart["Status"] + " @ " + chart["Margin Percentage"].astype(str) + "%")
+                st.caption(f"{len(sweep):,} grid points over {working_days} working days; {len(chart):,} plotted.")
+                st.line_chart(chart, x="Client Rate", y="Net Take-Home Pay", color="Scenario")
+        except Exception as e:
+            st.error(f"Rate sweep error: {str(e)}")
+
+    # Simulation
+    st.subheader("Simulation")
+    st.session_state.simulation_mode = st.checkbox("Enable Simulation")
+
+    if st.session_state.simulation_mode:
+        col1, col2, col3 = st.columns(3)
+        draws = col1.number_input("Draws", min_value=1000, max_value=2000000, value=100000, step=10000)
+        termination = col2.number_input("Early Termination Chance (%)", min_value=0.0, max_value=100.0, value=15.0, step=5.0)
+        rate_change = col3.number_input("Rate Change Spread (%)", min_value=0.0, max_value=50.0, value=5.0, step=1.0)
+        seed = st.text_input("Seed (leave blank for a fresh run)", value="35")
+
+        try:
+            working_days = calculate_working_days(
+                st.session_state.start_date,
+                st.session_state.end_date,
+                st.session_state.days_per_week,
+                get_uk_bank_holidays()
+            )
+            if not working_days:
+                st.warning("Enter a valid project period.")
+            else:
+                with stage("simulation"):
+                    simulation = simulate(
+                        st.session_state.client_rate,
+                        float(st.session_state.margin_percent),
+                        working_days,
+                        draws=int(draws),
+                        seed=int(seed) if seed.strip() else None,
+                        distributions={
+                            "early_termination_probability": termination / 100,
+                            "rate_change_sigma": rate_change / 100
+                        },
+                        student_loan_plans=student_loan_plans(),
+                        pension_contribution_percent=float(st.session_state.employee_pension),
+                        allowable_expenses=float(st.session_state.allowable_expenses),
+                        salary_amount=float(st.session_state.outside_salary),
+                        employer_pension_percent=float(st.session_state.employer_pension_percent),
+                        tax_year=project_tax_years()[0]
+                    )
+                percentile_rows = [
+                    [label] + [f"£{round(value):,}" for value in percentiles.values()]
+                    for label, percentiles in simulation["Net Take-Home Pay"].items()
+                ]
+                percentile_rows.append(
+                    ["Working Days"] + [f"{value:.0f}" for value in simulation["Working Days"].values()]
+                )
+                columns = ["Scenario"] + list(simulation["Working Days"])
+                st.markdown(render_table(percentile_rows, columns), unsafe_allow_html=True)
+                st.caption(
+                    f"{simulation['Draws']:,} draws at a client rate of £{round(st.session_state.client_rate)} "
+                    f"over up to {working_days} working days (seed {simulation['Seed']})."
+                )
+        except Exception as e:
+            st.error(f"Simulation error: {str(e)}")
+
+    # Scenario Matrix
+    st.subheader("Scenario Matrix")
+    st.session_state.matrix_mode = st.checkbox("Enable Scenario Matrix")
+
+    if st.session_state.matrix_mode:
+        if "scenarios" not in st.session_state:
+            st.session_state.scenarios = default_scenarios()
+        scenarios = st.data_editor(
+            st.session_state.scenarios,
+            num_rows="dynamic",
+            hide_index=True,
+            key="scenario_editor",
+            column_config={
+                "name": st.column_config.TextColumn("Scenario"),
+                "calculation_mode": st.column_config.SelectboxColumn("From", options=["Client Rate", "Base Rate", "Pay Rate"]),
+                "rate": st.column_config.NumberColumn("Rate (£)", min_value=0.0, step=25.0),
+                "margin_percent": st.column_config.NumberColumn("Margin (%)", min_value=0.0, max_value=99.0),
+                "status": st.column_config.SelectboxColumn("IR35 Status", options=["Inside IR35", "Outside IR35"]),
+                "employee_pension": st.column_config.NumberColumn("Pension (%)", min_value=0.0, max_value=100.0),
+                "student_loan": st.column_config.SelectboxColumn(
+                    "Student Loan", options=["None", "Plan 1", "Plan 2", "Plan 4", "Plan 5", "Postgraduate Loan"]
+                ),
+                "days_per_week": st.column_config.NumberColumn("Days/Week", min_value=1, max_value=5, step=1),
+                "vat_registered": st.column_config.CheckboxColumn("VAT"),
+                "allowable_expenses": st.column_config.NumberColumn("Expenses (£)", min_value=0.0),
+                "outside_salary": st.column_config.NumberColumn("Salary (£)", min_value=0.0),
+                "employer_pension_percent": st.column_config.NumberColumn("Employer Pension (%)", min_value=0.0),
+                "tax_region": st.column_config.SelectboxColumn("Tax Region", options=list(TAX_REGIONS)),
+                "salary_strategy": st.column_config.SelectboxColumn("Salary Strategy", options=SALARY_STRATEGIES)
+            }
+        )
+
+        try:
+            scenarios = scenarios.dropna(subset=["rate", "status"]).fillna(default_scenarios().iloc[0].drop("name").to_dict())
+            if scenarios.empty or st.session_state.start_date >= st.session_state.end_date:
+                st.warning("Add at least one scenario with a rate and status, and enter a valid project period.")
+            else:
+                with stage("scenario_matrix"):
+                    matrix = calculate_scenario_matrix(
+                        scenarios, st.session_state.start_date, st.session_state.end_date,
+                        {region: get_uk_bank_holidays(region) for region in TAX_REGIONS}
+                    )
+                st.dataframe(matrix, use_container_width=True, hide_index=True)
+                st.caption(f"{len(matrix)} scenarios over {st.session_state.start_date:%d %b %Y} – {st.session_state.end_date:%d %b %Y}. Click a column header to sort.")
+                st.download_button(
+                    "💾 Download CSV",
+                    data=matrix.to_csv(index=False),
+                    file_name=f"IR35_Scenarios_{datetime.now().strftime('%Y%m%d')}.csv",
+                    mime="text/csv"
+                )
+        except Exception as e:
+            st.error(f"Scenario matrix error: {str(e)}")
+
     # Comparison Mode
     st.subheader("Comparison Mode")
     st.session_state.compare_mode = st.checkbox("Enable Comparison Mode")
@@ -944,65 +846,53 @@ def main():
                     st.session_state.start_date,
                     st.session_state.end_date,
                     st.session_state.days_per_week,
-                    bank_holidays
-                )
-                
-                # Inside scenario
-                inside_base_rate = calculate_base_rate_from_pay(inside_pay_rate, "Inside IR35")
-                inside_client_rate = calculate_client_rate(
-                    inside_base_rate,
-                    st.session_state.margin_percent
-                )
-                inside_result = ir35_tax_calculator(
-                    inside_pay_rate, 
-                    working_days, 
-                    st.session_state.employee_pension,
-                    st.session_state.student_loan,
-                    "Inside IR35"
+                    get_uk_bank_holidays()
                 )
                 
-                # Outside scenario
-                outside_client_rate = calculate_client_rate(
-                    outside_base_rate,
-                    st.session_state.margin_percent
-                )
-                outside_result = ir35_tax_calculator(
-                    outside_base_rate,
-                    working_days,
-                    0.0,
-                    st.session_state.outside_student_loan,
-                    "Outside IR35",
-                    outside_vat,
-                    st.session_state.allowable_expenses,
-                    st.session_state.outside_salary,
-                    st.session_state.employer_pension_percent,
-                    st.session_state.outside_business_type,
-                    st.session_state.dividend_strategy
-                )
+                with stage("comparison"):
+                    comparison = calculate_comparison(
+                        inside_pay_rate,
+                        outside_base_rate,
+                        working_days,
+                        st.session_state.margin_percent,
+                        st.session_state.employee_pension,
+                        st.session_state.student_loan,
+                        st.session_state.outside_student_loan,
+                        outside_vat,
+                        st.session_state.allowable_expenses,
+                        st.session_state.outside_salary,
+                        st.session_state.employer_pension_percent,
+                        st.session_state.outside_business_type,
+                        st.session_state.dividend_strategy,
+                        project_tax_years()[0]
+                    )
                 
                 # Display comparison
                 comparison_data = [
-                    ["Daily Rate", f"£{round(inside_pay_rate)}", f"£{round(outside_base_rate)}"],
-                    ["Monthly Rate (20 days)", f"£{round(inside_pay_rate * 20)}", f"£{round(outside_base_rate * 20)}"],
-                    ["Project Net Total", f"£{round(inside_result['Net Take-Home Pay'])}", f"£{round(outside_result['Net Take-Home Pay'])}"],
-                    ["Effective Daily Rate (Net)", f"£{round(inside_result['Net Take-Home Pay'] / working_days)}", f"£{round(outside_result['Net Take-Home Pay'] / working_days)}"]
+                    [metric] + ["N/A" if value is None else f"£{round(value)}" for value in values]
+                    for metric, *values in comparison["Comparison"]
                 ]
                 
-                if outside_vat:
-                    comparison_data.append(["VAT Charged to Client", "N/A", f"£{round(outside_result['VAT Amount'])}"])
+                st.markdown(render_table(comparison_data, ["Metric", "Inside IR35", "Outside IR35"]), unsafe_allow_html=True)
                 
-                st.dataframe(styled_dataframe(
-                    pd.DataFrame(comparison_data, columns=["Metric", "Inside IR35", "Outside IR35"])
-                ), use_container_width=True)
-                
-                # Manual copy option
-                copy_text = "Metric\tInside IR35\tOutside IR35\n"
-                for row in comparison_data:
-                    copy_text += f"{row[0]}\t{row[1]}\t{row[2]}\n"
-                st.text_area("Copy these results manually:", copy_text, height=150)
+                st.download_button(
+                    "💾 Download Comparison (Parquet)",
+                    data=export_bytes(comparison_batches(
+                        comparison, st.session_state.margin_percent, project_tax_years()[0],
+                        st.session_state.employer_pension_percent
+                    )),
+                    file_name=f"IR35_Comparison_{datetime.now().strftime('%Y%m%d')}.parquet",
+                    mime=MIME_TYPES["parquet"]
+                )
                 
             except Exception as e:
                 st.error(f"Comparison error: {str(e)}")
 
+    if st.query_params.get("debug") == "1":
+        show_cache_debug_panel()
+        if PROFILING_ENABLED:
+            show_profiling_sidebar()
+
 if __name__ == "__main__":
-    main()
+    with stage("page"):
+        main()
@@ -0,0 +1,490 @@
+# ======================
+# IR35 CALCULATION CORE
+# Pure tax maths with no UI dependencies (no Streamlit, PIL, fpdf or requests)
+# ======================
+
+import copy
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+from ir35_profiling import timed
+from ir35_tax_config import DEFAULT_TAX_REGION, TAX_REGIONS, load_tax_years
+
+# ----------
+# CONSTANTS
+# ----------
+# Every configured tax year and region, from data/tax_years
+TAX_YEARS = load_tax_years()
+
+DEFAULT_TAX_YEAR = "2025/26 (rUK)"
+TAX_YEAR_CONFIG = TAX_YEARS[DEFAULT_TAX_YEAR]
+
+# Scenario results are cached at module level so every session in the process shares them
+RESULT_CACHE_SIZE = 1024
+
+# UK tax years run from 6 April; labels start with the calendar year they begin in
+TAX_YEAR_START = (4, 6)
+
+# Weekdays among the first n days of a week starting on a given weekday
+PARTIAL_WEEK_WEEKDAYS = tuple(
+    tuple(sum(1 for day in range(n) if (start + day) % 7 < 5) for n in range(7))
+    for start in range(7)
+)
+
+# ----------
+# COMPILED TAX BANDS
+# ----------
+class BandTable:
+    __slots__ = ("thresholds", "rates", "cumulative")
+
+    def __init__(self, thresholds, rates):
+        cumulative = [0]
+        for band in range(1, len(thresholds)):
+            cumulative.append(cumulative[-1] + ((thresholds[band] - thresholds[band - 1]) * rates[band - 1]))
+        self.thresholds = tuple(thresholds)
+        self.rates = tuple(rates)
+        self.cumulative = tuple(cumulative)
+
+    def tax(self, amount):
+        band = bisect_left(self.thresholds, amount) - 1
+        if band < 0:
+            return 0
+        return self.cumulative[band] + ((amount - self.thresholds[band]) * self.rates[band])
+
+class CompiledTaxYear:
+    __slots__ = (
+        "label", "tax_year", "region", "start_year", "config", "income_tax", "employee_ni",
+        "personal_allowance", "basic_band", "higher_band",
+        "dividend_allowance", "dividend_basic_rate", "dividend_higher_rate", "dividend_additional_rate",
+        "employer_ni_threshold", "employer_ni_rate",
+        "small_profits_rate", "main_rate", "lower_limit", "upper_limit", "marginal_relief_fraction"
+    )
+
+    def __init__(self, config):
+        tax_config = config["income_tax"]
+        dividend_config = config["dividend_tax"]
+        ni_config = config["national_insurance"]
+        corp_tax_config = config["corporation_tax"]
+        self.label = config["tax_year_label"]
+        self.tax_year = config["tax_year"]
+        self.region = config["region"]
+        self.start_year = int(self.tax_year[:4])
+        self.config = config
+
+        if "bands" in tax_config:
+            bands = tax_config["bands"]
+            self.income_tax = BandTable([band["threshold"] for band in bands], [band["rate"] for band in bands])
+        else:
+            self.income_tax = BandTable(
+                [tax_config["personal_allowance"], tax_config["basic_rate_limit"], tax_config["higher_rate_limit"]],
+                [tax_config["basic_rate"], tax_config["higher_rate"], tax_config["additional_rate"]]
+            )
+        self.employee_ni = BandTable(
+            [ni_config["employee_primary_threshold"], ni_config["employee_upper_earnings_limit"]],
+            [ni_config["employee_main_rate"], ni_config["employee_additional_rate"]]
+        )
+
+        self.personal_allowance = tax_config["personal_allowance"]
+        self.basic_band = tax_config["basic_rate_limit"] - self.personal_allowance
+        self.higher_band = tax_config["higher_rate_limit"] - self.personal_allowance
+        self.dividend_allowance = dividend_config["allowance"]
+        self.dividend_basic_rate = dividend_config["basic_rate"]
+        self.dividend_higher_rate = dividend_config["higher_rate"]
+        self.dividend_additional_rate = dividend_config["additional_rate"]
+
+        self.employer_ni_threshold = ni_config["employer_secondary_threshold"]
+        self.employer_ni_rate = ni_config["employer_rate"]
+
+        self.small_profits_rate = corp_tax_config["small_profits_rate"]
+        self.main_rate = corp_tax_config["main_rate"]
+        self.lower_limit = corp_tax_config["lower_limit"]
+        self.upper_limit = corp_tax_config["upper_limit"]
+        self.marginal_relief_fraction = corp_tax_config["marginal_relief_fraction"]
+
+    def __reduce__(self):
+        # Worker processes resolve the handle from their own registry instead of unpickling a copy
+        return compile_tax_year, (self.label,)
+
+# Compiled once at import; every calculation then gets a shared, ready-made handle
+COMPILED_TAX_YEARS = {label: CompiledTaxYear(config) for label, config in TAX_YEARS.items()}
+
+# Region -> (start year, label) in year order
+_tax_year_starts = {
+    region: sorted((bands.start_year, label) for label, bands in COMPILED_TAX_YEARS.items() if bands.region == region)
+    for region in TAX_REGIONS
+}
+
+def compile_tax_year(label):
+    try:
+        return COMPILED_TAX_YEARS[label]
+    except KeyError:
+        raise ValueError(f"Unknown tax year: {label}") from None
+
+# None, labels and compiled handles all resolve with a single dict lookup per call
+_resolved_tax_years = {}
+
+def get_tax_year(tax_year=None):
+    try:
+        return _resolved_tax_years[tax_year]
+    except KeyError:
+        pass
+    if isinstance(tax_year, CompiledTaxYear):
+        bands = tax_year
+    else:
+        bands = compile_tax_year(tax_year or DEFAULT_TAX_YEAR)
+    _resolved_tax_years[tax_year] = bands
+    return bands
+
+def tax_year_start(day):
+    return day.year if (day.month, day.day) >= TAX_YEAR_START else day.year - 1
+
+def _region_starts(region):
+    if region not in _tax_year_starts:
+        raise ValueError(f"Unknown tax region: {region}")
+    return _tax_year_starts[region]
+
+def regional_tax_year(region=DEFAULT_TAX_REGION, tax_year=None):
+    # The same tax year's config for another region, e.g. a Scottish taxpayer in the default year
+    bands = get_tax_year(tax_year)
+    if bands.region == region:
+        return bands
+    for start, label in _region_starts(region):
+        if start == bands.start_year:
+            return COMPILED_TAX_YEARS[label]
+    raise ValueError(f"No {region} config for tax year {bands.tax_year}")
+
+def tax_year_for(day, region=DEFAULT_TAX_REGION):
+    # Years without their own config fall back to the nearest configured year
+    starts = _region_starts(region)
+    year = tax_year_start(day)
+    label = starts[0][1]
+    for start, candidate in starts:
+        if start <= year:
+            label = candidate
+    return label
+
+# ----------
+# CALCULATION FUNCTIONS
+# ----------
+@lru_cache(maxsize=8)
+def _weekday_holiday_index(bank_holidays):
+    return tuple(sorted(day for day in bank_holidays if day.weekday() < 5))
+
+def weekday_holiday_index(bank_holidays):
+    if isinstance(bank_holidays, frozenset):
+        return _weekday_holiday_index(bank_holidays)
+    return tuple(sorted({day for day in bank_holidays if day.weekday() < 5}))
+
+@timed("calculate_working_days")
+def calculate_working_days(start_date, end_date, days_per_week, bank_holidays):
+    if start_date >= end_date:
+        return 0
+    full_weeks, remaining_days = divmod((end_date - start_date).days + 1, 7)
+    weekdays = (full_weeks * 5) + PARTIAL_WEEK_WEEKDAYS[start_date.weekday()][remaining_days]
+    holidays = weekday_holiday_index(bank_holidays)
+    working_days = weekdays - (bisect_right(holidays, end_date) - bisect_left(holidays, start_date))
+    full_weeks = working_days // 5
+    remaining_days = working_days % 5
+    return (full_weeks * days_per_week) + min(remaining_days, days_per_week)
+
+def calculate_holiday_components(pay_rate):
+    basic_daily_rate = pay_rate / (1 + 0.1454)
+    holiday_pay = pay_rate - basic_daily_rate
+    return round(basic_daily_rate), round(holiday_pay)
+
+def calculate_base_rate(client_rate, margin_percent):
+    return client_rate * (1 - margin_percent/100)
+
+def calculate_client_rate(base_rate, margin_percent):
+    return base_rate / (1 - margin_percent/100)
+
+def calculate_pay_rate(base_rate, status="Inside IR35"):
+    return base_rate / 1.185 if status == "Inside IR35" else base_rate
+
+def calculate_base_rate_from_pay(pay_rate, status="Inside IR35"):
+    return pay_rate * 1.185 if status == "Inside IR35" else pay_rate
+
+def calculate_employer_deductions(base_rate, working_days, employer_pension_percent=3.0):
+    daily_ni = base_rate * 0.15
+    daily_pension = base_rate * (employer_pension_percent / 100)
+    daily_levy = base_rate * 0.005
+    return {
+        "Daily Employer NI": round(daily_ni),
+        "Daily Employer Pension": round(daily_pension),
+        "Daily Apprentice Levy": round(daily_levy),
+        "Total Employer NI": round(daily_ni * working_days),
+        "Total Employer Pension": round(daily_pension * working_days),
+        "Total Apprentice Levy": round(daily_levy * working_days),
+        "Total Employer Deductions": round((daily_ni + daily_pension + daily_levy) * working_days)
+    }
+
+def calculate_margin(client_rate, base_rate, working_days):
+    daily_margin = client_rate - base_rate
+    margin_percent = ((client_rate - base_rate) / client_rate) * 100
+    return {
+        "Daily Margin": round(daily_margin),
+        "Total Margin": round(daily_margin * working_days),
+        "Margin Percentage": round(margin_percent, 1)
+    }
+
+def calculate_corporation_tax(profit, tax_year=None):
+    bands = get_tax_year(tax_year)
+    if profit <= 0:
+        return 0
+    if profit <= bands.lower_limit:
+        return profit * bands.small_profits_rate
+    if profit >= bands.upper_limit:
+        return profit * bands.main_rate
+    # Marginal relief formula (UK): CT = profit * main_rate - (upper_limit - profit) * marginal_relief_fraction
+    return (profit * bands.main_rate) - ((bands.upper_limit - profit) * bands.marginal_relief_fraction)
+
+def calculate_ltd_company_finances(pay_rate, working_days, allowable_expenses, salary, employer_pension_percent, vat_registered,
+                                   tax_year=None):
+    bands = get_tax_year(tax_year)
+    turnover = pay_rate * working_days
+    employer_ni = max(0, salary - bands.employer_ni_threshold) * bands.employer_ni_rate
+    employer_pension = salary * (employer_pension_percent / 100)
+    profit_before_tax = turnover - allowable_expenses - salary - employer_ni - employer_pension
+    corporation_tax = calculate_corporation_tax(profit_before_tax, bands)
+    profit_after_tax = profit_before_tax - corporation_tax
+    dividends_available = max(0, profit_after_tax)
+    vat_output = turnover * 0.2 if vat_registered else 0
+    return {
+        "Turnover": turnover,
+        "Allowable Expenses": allowable_expenses,
+        "Director Salary": salary,
+        "Employer NI": employer_ni,
+        "Employer Pension": employer_pension,
+        "Profit Before Tax": profit_before_tax,
+        "Corporation Tax": corporation_tax,
+        "Profit After Tax": profit_after_tax,
+        "Dividends Available": dividends_available,
+        "VAT Output": vat_output
+    }
+
+def calculate_employee_income_tax(income, tax_year=None):
+    return get_tax_year(tax_year).income_tax.tax(income)
+
+def calculate_employee_ni(income, tax_year=None):
+    return get_tax_year(tax_year).employee_ni.tax(income)
+
+def calculate_dividend_tax(salary, dividends, tax_year=None):
+    bands = get_tax_year(tax_year)
+    personal_allowance = bands.personal_allowance
+
+    remaining_allowance = max(0, personal_allowance - salary)
+    taxable_dividends = max(0, dividends - remaining_allowance - bands.dividend_allowance)
+    taxable_salary = max(0, salary - personal_allowance)
+
+    remaining_basic = max(0, bands.basic_band - taxable_salary)
+    basic_dividends = min(remaining_basic, taxable_dividends)
+    remaining_dividends = taxable_dividends - basic_dividends
+
+    remaining_higher = max(0, bands.higher_band - taxable_salary - basic_dividends)
+    higher_dividends = min(remaining_higher, remaining_dividends)
+    additional_dividends = max(0, remaining_dividends - higher_dividends)
+
+    dividend_tax = (
+        (basic_dividends * bands.dividend_basic_rate)
+        + (higher_dividends * bands.dividend_higher_rate)
+        + (additional_dividends * bands.dividend_additional_rate)
+    )
+    return dividend_tax
+
+def calculate_student_loan_repayment(total_income, student_loan_plan):
+    if student_loan_plan == "Plan 1" and total_income > 22015:
+        return (total_income - 22015) * 0.09
+    if student_loan_plan in ["Plan 2", "Plan 5"] and total_income > 27295:
+        return (total_income - 27295) * 0.09
+    if student_loan_plan == "Plan 4" and total_income > 31395:
+        return (total_income - 31395) * 0.09
+    if student_loan_plan == "Postgraduate Loan" and total_income > 21000:
+        return (total_income - 21000) * 0.06
+    return 0
+
+def calculate_personal_taxes(salary, dividends, student_loan_plan, tax_year=None):
+    bands = get_tax_year(tax_year)
+    income_tax = calculate_employee_income_tax(salary, bands)
+    employee_ni = calculate_employee_ni(salary, bands)
+    dividend_tax = calculate_dividend_tax(salary, dividends, bands)
+    total_income = salary + dividends
+    student_loan_repayment = calculate_student_loan_repayment(total_income, student_loan_plan)
+    total_tax = income_tax + employee_ni + dividend_tax + student_loan_repayment
+    net_income = total_income - total_tax
+    return {
+        "Salary Income Tax": round(income_tax),
+        "Employee NI": round(employee_ni),
+        "Dividend Tax": round(dividend_tax),
+        "Student Loan Repayment": round(student_loan_repayment),
+        "Total Personal Tax": round(total_tax),
+        "Net Personal Income": round(net_income)
+    }
+
+def outside_disclaimer(tax_year_label):
+    return (
+        f"Assumes UK tax year {tax_year_label} and that this contract is your only "
+        "income source. As a self-employed consultant, you are responsible for calculating and paying your "
+        "own taxes and National Insurance via Self Assessment. These figures are illustrative and do not "
+        "constitute tax advice."
+    )
+
+@timed("ir35_tax_calculator")
+def ir35_tax_calculator(pay_rate, working_days, pension_contribution_percent=5,
+                       student_loan_plan="None", status="Inside IR35", vat_registered=False,
+                       allowable_expenses=0.0, salary_amount=12570.0,
+                       employer_pension_percent=3.0, outside_business_type="Limited Company (Director/Shareholder)",
+                       dividend_strategy="Distribute all profit after corporation tax", tax_year=None):
+    bands = get_tax_year(tax_year)
+    if status == "Outside IR35":
+        annual_income = pay_rate * working_days
+        vat_amount = annual_income * 0.2 if vat_registered else 0
+        if outside_business_type == "Limited Company (Director/Shareholder)":
+            company_breakdown = calculate_ltd_company_finances(
+                pay_rate,
+                working_days,
+                allowable_expenses,
+                salary_amount,
+                employer_pension_percent,
+                vat_registered,
+                bands
+            )
+            dividends = company_breakdown["Dividends Available"]
+            personal_breakdown = calculate_personal_taxes(
+                salary_amount,
+                dividends,
+                student_loan_plan,
+                bands
+            )
+            net_take_home = personal_breakdown["Net Personal Income"]
+        else:
+            company_breakdown = {}
+            personal_breakdown = {}
+            net_take_home = 0
+        return {
+            "Base Rate": pay_rate,
+            "Pay Rate": pay_rate,
+            "VAT Amount": round(vat_amount),
+            "Working Days": working_days,
+            "Project Total": round(annual_income),
+            "Daily Rate": round(pay_rate),
+            "Company Breakdown": company_breakdown,
+            "Personal Breakdown": personal_breakdown,
+            "Net Take-Home Pay": round(net_take_home),
+            "Dividend Strategy": dividend_strategy,
+            "Disclaimer": outside_disclaimer(bands.label)
+        }
+    else:
+        annual_income = pay_rate * working_days
+        
+        # Tax calculations
+        taxable_income = annual_income - (annual_income * (pension_contribution_percent / 100))
+        income_tax = calculate_employee_income_tax(taxable_income, bands)
+        
+        # National Insurance
+        ni_contribution = calculate_employee_ni(annual_income, bands)
+        
+        # Student Loan
+        student_loan_repayment = calculate_student_loan_repayment(annual_income, student_loan_plan)
+        
+        take_home_pay = annual_income - (income_tax + ni_contribution + student_loan_repayment + (annual_income * (pension_contribution_percent / 100)))
+        
+        return {
+            "Gross Income": round(annual_income),
+            "Employee Pension": round(annual_income * (pension_contribution_percent / 100)),
+            "Income Tax": round(income_tax),
+            "Employee NI": round(ni_contribution),
+            "Student Loan Repayment": round(student_loan_repayment),
+            "Net Take-Home Pay": round(take_home_pay),
+            "Working Days": working_days,
+            "Daily Rate": round(pay_rate)
+        }
+
+def calculate_rates(calculation_mode, rate, margin_percent, status="Inside IR35"):
+    if calculation_mode == "Client Rate":
+        client_rate = rate
+        base_rate = calculate_base_rate(client_rate, margin_percent)
+        pay_rate = calculate_pay_rate(base_rate, status)
+    elif calculation_mode == "Base Rate":
+        base_rate = rate
+        client_rate = calculate_client_rate(base_rate, margin_percent)
+        pay_rate = calculate_pay_rate(base_rate, status)
+    else:
+        pay_rate = rate
+        base_rate = calculate_base_rate_from_pay(pay_rate, status)
+        client_rate = calculate_client_rate(base_rate, margin_percent)
+    return client_rate, base_rate, pay_rate
+
+def calculate_scenario(calculation_mode, rate, margin_percent, working_days, status="Inside IR35",
+                       pension_contribution_percent=5, student_loan_plan="None", vat_registered=False,
+                       allowable_expenses=0.0, salary_amount=12570.0, employer_pension_percent=3.0,
+                       outside_business_type="Limited Company (Director/Shareholder)",
+                       dividend_strategy="Distribute all profit after corporation tax", tax_year=None):
+    client_rate, base_rate, pay_rate = calculate_rates(calculation_mode, rate, margin_percent, status)
+    results = ir35_tax_calculator(
+        pay_rate, working_days, pension_contribution_percent, student_loan_plan, status, vat_registered,
+        allowable_expenses, salary_amount, employer_pension_percent, outside_business_type, dividend_strategy,
+        tax_year
+    )
+    return {
+        "Client Rate": client_rate,
+        "Base Rate": base_rate,
+        "Pay Rate": pay_rate,
+        "Working Days": working_days,
+        "Results": results,
+        "Margin": calculate_margin(client_rate, base_rate, working_days),
+        "Employer Deductions": (
+            calculate_employer_deductions(base_rate, working_days, employer_pension_percent)
+            if status == "Inside IR35" else None
+        )
+    }
+
+def calculate_comparison(inside_pay_rate, outside_base_rate, working_days, margin_percent, pension_contribution_percent=5,
+                         student_loan_plan="None", outside_student_loan_plan="None", outside_vat_registered=False,
+                         allowable_expenses=0.0, salary_amount=12570.0, employer_pension_percent=3.0,
+                         outside_business_type="Limited Company (Director/Shareholder)",
+                         dividend_strategy="Distribute all profit after corporation tax", tax_year=None):
+    inside_base_rate = calculate_base_rate_from_pay(inside_pay_rate, "Inside IR35")
+    inside_result = ir35_tax_calculator(
+        inside_pay_rate, working_days, pension_contribution_percent, student_loan_plan, "Inside IR35",
+        tax_year=tax_year
+    )
+    outside_result = ir35_tax_calculator(
+        outside_base_rate, working_days, 0.0, outside_student_loan_plan, "Outside IR35", outside_vat_registered,
+        allowable_expenses, salary_amount, employer_pension_percent, outside_business_type, dividend_strategy,
+        tax_year
+    )
+    rows = [
+        ["Daily Rate", inside_pay_rate, outside_base_rate],
+        ["Monthly Rate (20 days)", inside_pay_rate * 20, outside_base_rate * 20],
+        ["Project Net Total", inside_result["Net Take-Home Pay"], outside_result["Net Take-Home Pay"]],
+        ["Effective Daily Rate (Net)", inside_result["Net Take-Home Pay"] / working_days,
+         outside_result["Net Take-Home Pay"] / working_days]
+    ]
+    if outside_vat_registered:
+        rows.append(["VAT Charged to Client", None, outside_result["VAT Amount"]])
+    return {
+        "Inside IR35": {
+            "Client Rate": calculate_client_rate(inside_base_rate, margin_percent),
+            "Base Rate": inside_base_rate,
+            "Pay Rate": inside_pay_rate,
+            "Results": inside_result
+        },
+        "Outside IR35": {
+            "Client Rate": calculate_client_rate(outside_base_rate, margin_percent),
+            "Base Rate": outside_base_rate,
+            "Pay Rate": outside_base_rate,
+            "Results": outside_result
+        },
+        "Working Days": working_days,
+        "Comparison": rows
+    }
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _cached_tax_results(inputs):
+    return ir35_tax_calculator(*inputs)
+
+def cached_tax_results(inputs):
+    return copy.deepcopy(_cached_tax_results(inputs))
+
+def tax_results_cache_info():
+    return _cached_tax_results.cache_info()
@@ -0,0 +1,198 @@
+# ======================
+# IR35 EXPORT
+# Typed Arrow record batches of calculation results, streamed to Parquet or Feather
+#
+#   python ir35_export.py placements.csv results.parquet
+# ======================
+
+import argparse
+import sys
+
+import numpy as np
+
+from bank_holidays import REGIONS, get_bank_holidays, get_tax_region_holidays
+from ir35_batch import calculate_employer_deductions_batch, calculate_margin_batch, placement_inputs
+from ir35_core import calculate_client_rate, calculate_employer_deductions, calculate_margin
+from ir35_results import FIELD_INDEX, RESULT_FIELDS, WHOLE_FIELDS, ir35_result_table, pack_results
+
+# ----------
+# SCHEMA
+# ----------
+FORMATS = ("parquet", "feather")
+MIME_TYPES = {"parquet": "application/vnd.apache.parquet", "feather": "application/vnd.apache.arrow.file"}
+
+MARGIN_FIELDS = ["Margin Percentage", "Daily Margin", "Total Margin"]
+DEDUCTION_FIELDS = [
+    "Daily Employer NI",
+    "Daily Employer Pension",
+    "Daily Apprentice Levy",
+    "Total Employer NI",
+    "Total Employer Pension",
+    "Total Apprentice Levy",
+    "Total Employer Deductions"
+]
+# Employer deductions and margins are rounded to whole pounds, apart from the margin percentage
+WHOLE_EXPORT_FIELDS = WHOLE_FIELDS | set(DEDUCTION_FIELDS) | {"Daily Margin", "Total Margin"}
+
+def export_schema():
+    import pyarrow as pa
+
+    def field(name):
+        return pa.field(name, pa.int64() if name in WHOLE_EXPORT_FIELDS else pa.float64())
+
+    # Result fields cover both branches; a field a row's branch does not have is null
+    return pa.schema(
+        [pa.field("Name", pa.string()), pa.field("Status", pa.string()), pa.field("Tax Year", pa.string()),
+         field("Client Rate"), field("Base Rate")]
+        + [field(name) for name in RESULT_FIELDS + MARGIN_FIELDS + DEDUCTION_FIELDS]
+    )
+
+def export_format(path):
+    return "feather" if str(path).lower().endswith((".feather", ".arrow", ".ipc")) else "parquet"
+
+# ----------
+# RECORD BATCHES
+# ----------
+def _array(values, arrow_type):
+    import pyarrow as pa
+
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    if pa.types.is_integer(arrow_type):
+        values = np.where(missing, 0, np.round(values)).astype(np.int64)
+    return pa.array(values, type=arrow_type, mask=missing if missing.any() else None)
+
+def results_batch(table, names, client_rate, base_rate, margin, deductions):
+    import pyarrow as pa
+
+    schema = export_schema()
+    length = len(table)
+    columns = {
+        "Name": pa.array([str(name) for name in names], type=pa.string()),
+        "Status": pa.array(np.where(table.outside, "Outside IR35", "Inside IR35").tolist(), type=pa.string()),
+        "Tax Year": pa.array(np.broadcast_to(np.asarray(table.tax_year_label, dtype=object), length).tolist(),
+                             type=pa.string())
+    }
+    numeric = {"Client Rate": client_rate, "Base Rate": base_rate, **margin}
+    numeric.update({name: table.column(name) for name in RESULT_FIELDS})
+    for name in DEDUCTION_FIELDS:
+        numeric[name] = deductions.get(name, np.nan) if deductions else np.nan
+    for name, values in numeric.items():
+        columns[name] = _array(np.broadcast_to(np.asarray(values, dtype=float), length), schema.field(name).type)
+    return pa.RecordBatch.from_arrays([columns[name] for name in schema.names], schema=schema)
+
+def scenario_batch(results, client_rate, base_rate, pay_rate, margin, employer_deductions, tax_year, name="Scenario"):
+    # One scalar scenario as the UI holds it: a result dict plus its rates, margin and deductions. The tax year
+    # has no default, since a result dict does not say which config produced it
+    table = pack_results([results], tax_year)
+    table.values[FIELD_INDEX["Pay Rate"]] = pay_rate
+    return results_batch(table, [name], client_rate, base_rate, margin or {}, employer_deductions)
+
+def tax_year_batches(split, client_rate, base_rate, pay_rate, status, employer_pension_percent=3.0):
+    # A project over 6 April as one row per tax year, each with that year's config, days, margin and deductions
+    batches = []
+    for year in split["Tax Years"]:
+        working_days = year["Working Days"]
+        deductions = None
+        if status == "Inside IR35":
+            deductions = calculate_employer_deductions(base_rate, working_days, employer_pension_percent)
+        batches.append(scenario_batch(
+            year["Results"], client_rate, base_rate, pay_rate, calculate_margin(client_rate, base_rate, working_days),
+            deductions, year["Tax Year Config"], name=f"{status} {year['Tax Year']}"
+        ))
+    return batches
+
+def comparison_batches(comparison, margin_percent, tax_year, employer_pension_percent=3.0):
+    working_days = comparison["Working Days"]
+    batches = []
+    for status in ("Inside IR35", "Outside IR35"):
+        side = comparison[status]
+        client_rate = calculate_client_rate(side["Base Rate"], margin_percent)
+        deductions = None
+        if status == "Inside IR35":
+            deductions = calculate_employer_deductions(side["Base Rate"], working_days, employer_pension_percent)
+        batches.append(scenario_batch(
+            side["Results"], client_rate, side["Base Rate"], side["Pay Rate"],
+            calculate_margin(client_rate, side["Base Rate"], working_days), deductions, tax_year, name=status
+        ))
+    return batches
+
+def placement_batches(chunks, bank_holidays):
+    # One record batch per chunk of a placements file, so a large run never holds every result at once
+    for chunk in chunks:
+        columns, client_rate, working_days, base_rate, pay_rate, tax_inputs = placement_inputs(chunk, bank_holidays)
+        table = ir35_result_table(pay_rate, working_days, *tax_inputs)
+        deductions = calculate_employer_deductions_batch(base_rate, working_days, columns["employer_pension_percent"])
+        deductions = {key: np.where(table.outside, np.nan, value) for key, value in deductions.items()}
+        names = chunk["placement_id"].to_numpy() if "placement_id" in chunk else chunk.index.to_numpy()
+        yield results_batch(
+            table, names, client_rate, base_rate, calculate_margin_batch(client_rate, base_rate, working_days), deductions
+        )
+
+# ----------
+# WRITERS
+# ----------
+class ResultWriter:
+    def __init__(self, sink, format="parquet"):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format {format!r}; expected one of {', '.join(FORMATS)}")
+        self.format = format
+        self.schema = export_schema()
+        self.rows = 0
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            self.writer = pq.ParquetWriter(sink, self.schema, compression="zstd")
+        else:
+            import pyarrow as pa
+
+            # Feather V2 is the Arrow IPC file format
+            self.writer = pa.ipc.new_file(sink, self.schema, options=pa.ipc.IpcWriteOptions(compression="lz4"))
+
+    def write_batch(self, batch):
+        self.writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self):
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_results(batches, sink, format=None):
+    with ResultWriter(sink, format or export_format(sink)) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    return writer.rows
+
+def export_bytes(batches, format="parquet"):
+    import pyarrow as pa
+
+    sink = pa.BufferOutputStream()
+    write_results(batches, sink, format)
+    return sink.getvalue().to_pybytes()
+
+# ----------
+# COMMAND LINE
+# ----------
+def main(argv=None):
+    from ir35_bulk import DEFAULT_CHUNK_SIZE, read_chunks
+
+    parser = argparse.ArgumentParser(description="Export IR35 results for a placements file as Parquet or Feather.")
+    parser.add_argument("input", help="Placements file (.csv or .parquet)")
+    parser.add_argument("output", help="Export file (.parquet, or .feather/.arrow)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per record batch")
+    parser.add_argument("--region", choices=REGIONS, default=None,
+                        help="Bank holiday region for every row (default: the one for each row's tax_region)")
+    args = parser.parse_args(argv)
+
+    bank_holidays = get_bank_holidays(args.region) if args.region else get_tax_region_holidays()
+    batches = placement_batches(read_chunks(args.input, args.chunk_size), bank_holidays)
+    rows = write_results(batches, args.output)
+    print(f"Rows: {rows}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
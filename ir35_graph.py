@@ -0,0 +1,123 @@
+# ======================
+# IR35 CALCULATION GRAPH
+# Derived quantities recomputed only when the inputs they depend on change
+# ======================
+
+from ir35_core import (
+    cached_tax_results,
+    calculate_employer_deductions,
+    calculate_margin,
+    calculate_rates,
+    calculate_working_days,
+    tax_year_for
+)
+from ir35_optimizer import optimise_salary
+from ir35_tax_years import calculate_by_tax_year, combine_tax_years, tax_year_segments
+
+TAX_INPUTS = (
+    "employee_pension", "student_loan", "status", "vat_registered", "allowable_expenses",
+    "outside_salary", "employer_pension_percent", "outside_business_type", "dividend_strategy", "tax_region"
+)
+
+# ----------
+# GRAPH
+# ----------
+class Node:
+    __slots__ = ("name", "function", "inputs", "dependencies", "key", "value", "version", "recomputes")
+
+    def __init__(self, name, function, inputs=(), dependencies=()):
+        self.name = name
+        self.function = function
+        self.inputs = inputs
+        self.dependencies = dependencies
+        self.key = None
+        self.value = None
+        self.version = 0
+        self.recomputes = 0
+
+class CalculationGraph:
+    def __init__(self, nodes):
+        # Nodes are listed in dependency order, so one pass settles the whole graph
+        self.nodes = {node.name: node for node in nodes}
+
+    def evaluate(self, inputs):
+        for node in self.nodes.values():
+            dependencies = [self.nodes[name] for name in node.dependencies]
+            key = tuple(inputs[name] for name in node.inputs) + tuple(dependency.version for dependency in dependencies)
+            if key == node.key:
+                continue
+            value = node.function(*[inputs[name] for name in node.inputs], *[dependency.value for dependency in dependencies])
+            node.recomputes += 1
+            node.key = key
+            # An unchanged result keeps its version, so nothing downstream of it is recomputed
+            if node.version == 0 or value != node.value:
+                node.value = value
+                node.version += 1
+        return self
+
+    def value(self, name):
+        return self.nodes[name].value
+
+    def versions(self, *names):
+        return tuple(self.nodes[name].version for name in names)
+
+    def recompute_counts(self):
+        return {name: node.recomputes for name, node in self.nodes.items()}
+
+# ----------
+# SCENARIO GRAPH
+# ----------
+def _tax_results(start_date, pension, student_loan, status, vat_registered, allowable_expenses, salary,
+                 employer_pension_percent, business_type, dividend_strategy, tax_region, rates, working_days, tax_years):
+    # A project over 6 April adds up its tax years, so the headline and the split agree; otherwise its one year
+    if tax_years:
+        return combine_tax_years(tax_years)
+    return cached_tax_results((
+        rates[2], working_days, pension, student_loan, status, vat_registered, allowable_expenses, salary,
+        employer_pension_percent, business_type, dividend_strategy, tax_year_for(start_date, tax_region)
+    ))
+
+def _margin(rates, working_days):
+    return calculate_margin(rates[0], rates[1], working_days)
+
+def _employer_deductions(status, employer_pension_percent, rates, working_days):
+    if status != "Inside IR35":
+        return None
+    return calculate_employer_deductions(rates[1], working_days, employer_pension_percent)
+
+def _salary_optimum(start_date, status, allowable_expenses, employer_pension_percent, student_loan, tax_region, rates,
+                    working_days, tax_years):
+    # The optimiser works on one tax year's bands, so a project split over 6 April has no single optimum
+    if status != "Outside IR35" or tax_years:
+        return None
+    return optimise_salary(
+        rates[2], working_days, allowable_expenses, employer_pension_percent, student_loan,
+        tax_year_for(start_date, tax_region)
+    )
+
+def _tax_years(start_date, end_date, days_per_week, bank_holidays, pension, student_loan, status, vat_registered,
+               allowable_expenses, salary, employer_pension_percent, business_type, dividend_strategy, tax_region, rates):
+    if len(tax_year_segments(start_date, end_date)) < 2:
+        return None
+    return calculate_by_tax_year(
+        rates[2], start_date, end_date, days_per_week, bank_holidays, tax_region,
+        pension_contribution_percent=pension, student_loan_plan=student_loan, status=status,
+        vat_registered=vat_registered, allowable_expenses=allowable_expenses, salary_amount=salary,
+        employer_pension_percent=employer_pension_percent, outside_business_type=business_type,
+        dividend_strategy=dividend_strategy
+    )
+
+def build_scenario_graph():
+    return CalculationGraph([
+        Node("working_days", calculate_working_days, ("start_date", "end_date", "days_per_week", "bank_holidays")),
+        Node("rates", calculate_rates, ("calculation_mode", "rate", "margin_percent", "status")),
+        Node("tax_years", _tax_years, ("start_date", "end_date", "days_per_week", "bank_holidays") + TAX_INPUTS, ("rates",)),
+        Node("results", _tax_results, ("start_date",) + TAX_INPUTS, ("rates", "working_days", "tax_years")),
+        Node("margin", _margin, (), ("rates", "working_days")),
+        Node("employer_deductions", _employer_deductions, ("status", "employer_pension_percent"), ("rates", "working_days")),
+        Node(
+            "salary_optimum", _salary_optimum,
+            ("start_date", "status", "allowable_expenses", "employer_pension_percent", "student_loan", "tax_region"),
+            ("rates", "working_days", "tax_years")
+        )
+    ])
@@ -0,0 +1,109 @@
+# ======================
+# IR35 MONTE CARLO
+# Net take-home percentiles under uncertain working days and rate changes
+# ======================
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ir35_batch import (
+    calculate_base_rate_batch,
+    calculate_pay_rate_batch,
+    ir35_tax_calculator_batch
+)
+
+# ----------
+# CONSTANTS
+# ----------
+DEFAULT_DRAWS = 100000
+DEFAULT_CHUNK_SIZE = 25000
+PERCENTILES = (5, 25, 50, 75, 95)
+STATUSES = ("Inside IR35", "Outside IR35")
+
+DEFAULT_DISTRIBUTIONS = {
+    # Share of planned days actually worked (sickness, gaps): Beta(alpha, beta)
+    "utilisation_alpha": 18.0,
+    "utilisation_beta": 2.0,
+    # Chance the contract ends early; the end point is uniform over the contract
+    "early_termination_probability": 0.15,
+    # Client rate multiplier after renegotiation: lognormal with median 1
+    "rate_change_sigma": 0.05
+}
+
+# ----------
+# SAMPLING
+# ----------
+def sample_chunk(seed_sequence, draws, client_rate, planned_days, distributions):
+    rng = np.random.default_rng(seed_sequence)
+    utilisation = rng.beta(distributions["utilisation_alpha"], distributions["utilisation_beta"], draws)
+    terminated = rng.random(draws) < distributions["early_termination_probability"]
+    completion = np.where(terminated, rng.random(draws), 1.0)
+    working_days = np.floor(planned_days * utilisation * completion)
+    client_rates = client_rate * rng.lognormal(0.0, distributions["rate_change_sigma"], draws)
+    return working_days, client_rates
+
+def simulate_chunk(seed_sequence, draws, client_rate, margin_percent, planned_days, distributions, calculator_args,
+                   student_loan_plans=None):
+    working_days, client_rates = sample_chunk(seed_sequence, draws, client_rate, planned_days, distributions)
+    base_rate = calculate_base_rate_batch(client_rates, margin_percent)
+    net = {}
+    for status in STATUSES:
+        pay_rate = calculate_pay_rate_batch(base_rate, status)
+        status_args = calculator_args
+        if student_loan_plans:
+            status_args = {**calculator_args, "student_loan_plan": student_loan_plans[status]}
+        net[status] = ir35_tax_calculator_batch(pay_rate, working_days, status=status, **status_args)["Net Take-Home Pay"]
+    return working_days, net
+
+def _chunk_sizes(draws, chunk_size):
+    full_chunks, remainder = divmod(draws, chunk_size)
+    return [chunk_size] * full_chunks + ([remainder] if remainder else [])
+
+def _percentiles(values):
+    summary = dict(zip((f"P{p}" for p in PERCENTILES), np.percentile(values, PERCENTILES).tolist()))
+    summary["Mean"] = float(values.mean())
+    return summary
+
+# ----------
+# SIMULATION
+# ----------
+def simulate(client_rate, margin_percent, planned_days, draws=DEFAULT_DRAWS, seed=None, distributions=None,
+             chunk_size=DEFAULT_CHUNK_SIZE, workers=0, student_loan_plans=None, **calculator_args):
+    distributions = {**DEFAULT_DISTRIBUTIONS, **(distributions or {})}
+    # One child seed per chunk keeps results identical whatever the chunk order or worker count
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = _chunk_sizes(draws, chunk_size)
+    jobs = [
+        (child, size, client_rate, margin_percent, planned_days, distributions, calculator_args, student_loan_plans)
+        for child, size in zip(seed_sequence.spawn(len(sizes)), sizes)
+    ]
+
+    # Only nets and day counts are kept; per-draw intermediates live for one chunk
+    working_days = np.empty(draws)
+    net = {status: np.empty(draws) for status in STATUSES}
+    if workers == 0 or len(jobs) < 2:
+        chunks = (simulate_chunk(*job) for job in jobs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(workers or os.cpu_count() or 1)
+        chunks = pool.map(simulate_chunk, *zip(*jobs))
+    try:
+        offset = 0
+        for chunk_days, chunk_net in chunks:
+            end = offset + len(chunk_days)
+            working_days[offset:end] = chunk_days
+            for status in STATUSES:
+                net[status][offset:end] = chunk_net[status]
+            offset = end
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {
+        "Draws": draws,
+        "Seed": seed_sequence.entropy,
+        "Working Days": _percentiles(working_days),
+        "Net Take-Home Pay": {status: _percentiles(net[status]) for status in STATUSES}
+    }
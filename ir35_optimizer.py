@@ -0,0 +1,121 @@
+# ======================
+# IR35 SALARY OPTIMISER
+# Director salary / dividend split that maximises Outside IR35 net take-home
+# ======================
+
+import numpy as np
+
+from ir35_batch import STUDENT_LOAN_PLANS
+from ir35_core import calculate_ltd_company_finances, get_tax_year
+from ir35_solver import outside_net_income
+
+# ----------
+# BREAKPOINTS
+# ----------
+def _salary_for_profit(profit, turnover, allowable_expenses, employer_pension_percent, bands):
+    # Profit falls linearly with salary, more steeply once employer NI starts
+    available = turnover - allowable_expenses - profit
+    pension_rate = employer_pension_percent / 100
+    salary = available / (1 + pension_rate)
+    if salary > bands.employer_ni_threshold:
+        salary = (available + (bands.employer_ni_threshold * bands.employer_ni_rate)) / (1 + pension_rate + bands.employer_ni_rate)
+    return salary
+
+def _static_salaries(turnover, allowable_expenses, employer_pension_percent, bands):
+    salaries = {
+        bands.employer_ni_threshold,
+        bands.personal_allowance,
+        bands.personal_allowance + bands.basic_band,
+        bands.personal_allowance + bands.higher_band,
+        *bands.income_tax.thresholds,
+        *bands.employee_ni.thresholds
+    }
+    salaries.update(
+        _salary_for_profit(profit, turnover, allowable_expenses, employer_pension_percent, bands)
+        for profit in (bands.lower_limit, bands.upper_limit)
+    )
+    return salaries
+
+def _dividend_edges(salary, dividends, student_loan_plan, bands):
+    # Signed distance from each dividend-side kink; zero where net pay changes slope
+    taxable_salary = max(0, salary - bands.personal_allowance)
+    remaining_basic = max(0, bands.basic_band - taxable_salary)
+    above_allowance = dividends - max(0, bands.personal_allowance - salary) - bands.dividend_allowance
+    edges = [
+        above_allowance,
+        above_allowance - remaining_basic,
+        above_allowance - remaining_basic - max(0, bands.higher_band - taxable_salary - remaining_basic)
+    ]
+    if student_loan_plan in STUDENT_LOAN_PLANS:
+        edges.append(salary + dividends - STUDENT_LOAN_PLANS[student_loan_plan][0])
+    return edges
+
+# ----------
+# OPTIMISER
+# ----------
+def optimise_salary(pay_rate, working_days, allowable_expenses=0.0, employer_pension_percent=3.0,
+                    student_loan_plan="None", tax_year=None):
+    bands = get_tax_year(tax_year)
+    turnover = pay_rate * working_days
+    max_salary = max(0, _salary_for_profit(0, turnover, allowable_expenses, employer_pension_percent, bands))
+
+    def dividends(salary):
+        return calculate_ltd_company_finances(
+            turnover, 1, allowable_expenses, salary, employer_pension_percent, False, bands
+        )["Dividends Available"]
+
+    # Between static breakpoints dividends move linearly with salary, so each dividend-side kink
+    # is found by interpolating its edge function across the interval
+    static = sorted(salary for salary in _static_salaries(turnover, allowable_expenses, employer_pension_percent, bands)
+                    if 0 < salary < max_salary)
+    points = [0.0] + static + [max_salary]
+    candidates = set(points)
+    edges = [_dividend_edges(salary, dividends(salary), student_loan_plan, bands) for salary in points]
+    for (low, low_edges), (high, high_edges) in zip(zip(points, edges), zip(points[1:], edges[1:])):
+        for low_edge, high_edge in zip(low_edges, high_edges):
+            if (low_edge < 0 < high_edge) or (high_edge < 0 < low_edge):
+                candidates.add(low + ((high - low) * low_edge / (low_edge - high_edge)))
+
+    best_salary, best_net = None, None
+    for salary in sorted(candidates):
+        net = outside_net_income(turnover, salary, allowable_expenses, employer_pension_percent, student_loan_plan, bands)
+        if best_net is None or net > best_net + 1e-9:
+            best_salary, best_net = salary, net
+    return {
+        "Salary": best_salary,
+        "Dividends": dividends(best_salary),
+        "Net Take-Home Pay": round(best_net),
+        "Evaluations": len(candidates)
+    }
+
+def optimise_salary_batch(pay_rate, working_days, allowable_expenses=0.0, employer_pension_percent=3.0,
+                          student_loan_plan="None", tax_year=None):
+    pay_rate, working_days, expenses, employer_pension, student_loan_plan = np.broadcast_arrays(
+        np.asarray(pay_rate, dtype=float),
+        np.asarray(working_days, dtype=float),
+        np.asarray(allowable_expenses, dtype=float),
+        np.asarray(employer_pension_percent, dtype=float),
+        np.asarray(student_loan_plan, dtype=object)
+    )
+    # A single tax year or one per row (e.g. a mix of Scottish and rUK contractors)
+    tax_year = np.broadcast_to(np.asarray(tax_year, dtype=object), pay_rate.shape)
+    salary = np.empty(pay_rate.shape)
+    dividends = np.empty(pay_rate.shape)
+    net = np.empty(pay_rate.shape)
+    evaluations = 0
+    # Portfolios repeat rate cards, so identical rows are optimised once
+    solved = {}
+    for index in np.ndindex(pay_rate.shape):
+        key = (pay_rate[index] * working_days[index], expenses[index], employer_pension[index], student_loan_plan[index],
+               tax_year[index])
+        if key not in solved:
+            solved[key] = optimise_salary(key[0], 1, key[1], key[2], key[3], key[4])
+            evaluations += solved[key]["Evaluations"]
+        result = solved[key]
+        salary[index], dividends[index], net[index] = result["Salary"], result["Dividends"], result["Net Take-Home Pay"]
+    return {
+        "Salary": salary,
+        "Dividends": dividends,
+        "Net Take-Home Pay": net,
+        "Evaluations": evaluations
+    }
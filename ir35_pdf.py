@@ -0,0 +1,348 @@
+# ======================
+# IR35 PDF REPORTS
+# ======================
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from zipfile import ZIP_STORED, ZipFile
+
+from ir35_core import calculate_holiday_components, get_tax_year
+from ir35_profiling import timed
+
+# ----------
+# REPORT TEMPLATE
+# ----------
+# A report is a list of (kind, value) lines; the page layout and fonts for each kind are fixed
+TITLE = "title"
+HEADING = "heading"
+LINE = "line"
+GAP = "gap"
+DISCLAIMER = "disclaimer"
+
+REPORT_FIELDS = (
+    "result", "calculation_mode", "client_rate", "base_rate",
+    "pay_rate", "margin", "employer_deductions", "status", "tax_year"
+)
+
+# Filled in with the label of the tax year the report was calculated with
+OUTSIDE_DISCLAIMER = (
+    "Assumes UK tax year {tax_year_label} and this contract is your only income source. As a self-employed "
+    "consultant, you are responsible for calculating and paying your own taxes and National Insurance via Self "
+    "Assessment. These figures are illustrative and do not constitute tax advice."
+)
+INSIDE_DISCLAIMER = (
+    "The figures provided are for illustrative purposes only and may vary depending on individual circumstances. "
+    "This tool is not intended to provide tax, legal, or accounting advice. Consult a qualified professional for "
+    "advice tailored to your situation."
+)
+
+# ----------
+# PDF GENERATION
+# ----------
+def report_lines(result, calculation_mode, client_rate=None, base_rate=None,
+                 pay_rate=None, margin=None, employer_deductions=None, status="Inside IR35", tax_year=None):
+    # A project over 6 April gives the list of its tax years
+    tax_years = tax_year if isinstance(tax_year, (list, tuple)) else [tax_year]
+    tax_year_label = " and ".join(dict.fromkeys(get_tax_year(year).label for year in tax_years))
+    lines = [(TITLE, "IR35 Tax Calculation Results"), (GAP, 10)]
+    
+    # Rate Summary
+    lines.append((HEADING, "Rate Summary"))
+    
+    if status == "Outside IR35":
+        lines.append((LINE, f"Base Rate = Pay Rate: £{round(pay_rate)}"))
+        lines.append((LINE, f"Working Days: {result['Working Days']}"))
+        lines.append((LINE, f"Project Total: £{round(result['Project Total'])}"))
+        lines.append((LINE, f"Assumes UK tax year {tax_year_label}."))
+        if result['VAT Amount'] > 0:
+            lines.append((LINE, f"VAT Charged to Client (20%): £{round(result['VAT Amount'])}"))
+    else:
+        if calculation_mode == "Client Rate":
+            lines.append((LINE, f"Client Rate: £{round(client_rate)}"))
+            lines.append((LINE, f"Margin: {margin['Margin Percentage']}% (£{margin['Daily Margin']}/day)"))
+            lines.append((LINE, f"Base Rate: £{round(base_rate)}"))
+        elif calculation_mode == "Base Rate":
+            lines.append((LINE, f"Base Rate: £{round(base_rate)}"))
+            lines.append((LINE, f"Margin: {margin['Margin Percentage']}% (£{margin['Daily Margin']}/day)"))
+            lines.append((LINE, f"Client Rate: £{round(client_rate)}"))
+        else:
+            lines.append((LINE, f"Pay Rate: £{round(pay_rate)}"))
+            lines.append((LINE, f"Base Rate: £{round(base_rate)}"))
+            lines.append((LINE, f"Margin: {margin['Margin Percentage']}% (£{margin['Daily Margin']}/day)"))
+            lines.append((LINE, f"Client Rate: £{round(client_rate)}"))
+    
+    # Inside IR35 Deductions
+    if status == "Inside IR35" and employer_deductions:
+        lines.append((GAP, 5))
+        lines.append((HEADING, "Employer Deductions"))
+        lines.append((LINE, f"Daily Employer NI (15%): £{employer_deductions['Daily Employer NI']}"))
+        lines.append((LINE, f"Daily Employer Pension: £{employer_deductions['Daily Employer Pension']}"))
+        lines.append((LINE, f"Daily Apprentice Levy (0.5%): £{employer_deductions['Daily Apprentice Levy']}"))
+        lines.append((LINE, f"Total Employer NI: £{employer_deductions['Total Employer NI']}"))
+        lines.append((LINE, f"Total Employer Pension: £{employer_deductions['Total Employer Pension']}"))
+        lines.append((LINE, f"Total Apprentice Levy: £{employer_deductions['Total Apprentice Levy']}"))
+        lines.append((LINE, f"Total Employer Deductions: £{employer_deductions['Total Employer Deductions']}"))
+    
+    # Project Breakdown
+    lines.append((GAP, 5))
+    lines.append((HEADING, "Project Breakdown"))
+    
+    if status == "Inside IR35":
+        daily_net = result["Net Take-Home Pay"] / result["Working Days"]
+        lines.append((LINE, f"Daily Gross: £{round(pay_rate)}"))
+        lines.append((LINE, f"Daily Net: £{round(daily_net)}"))
+        lines.append((LINE, f"Monthly Gross (20 days): £{round(pay_rate * 20)}"))
+        lines.append((LINE, f"Monthly Net (20 days): £{round(daily_net * 20)}"))
+        lines.append((LINE, f"Project Gross Total: £{round(result['Gross Income'])}"))
+        lines.append((LINE, f"Project Net Total: £{round(result['Net Take-Home Pay'])}"))
+        
+        # Payslip Breakdown
+        basic_rate, holiday_pay = calculate_holiday_components(pay_rate)
+        lines.append((GAP, 5))
+        lines.append((HEADING, "Payslip Breakdown (Compliance)"))
+        lines.append((LINE, f"Basic Daily Rate (excl. holiday pay): £{basic_rate}"))
+        lines.append((LINE, f"Holiday Pay (per day): £{holiday_pay}"))
+    
+    # Detailed Breakdown
+    if status == "Inside IR35":
+        lines.append((GAP, 5))
+        lines.append((HEADING, "Detailed Breakdown"))
+        lines.append((LINE, f"Gross Income: £{result['Gross Income']}"))
+        lines.append((LINE, f"Income Tax: £{result['Income Tax']}"))
+        lines.append((LINE, f"Employee NI: £{result['Employee NI']}"))
+        lines.append((LINE, f"Employee Pension: £{result['Employee Pension']}"))
+        if result.get('Student Loan Repayment', 0) > 0:
+            lines.append((LINE, f"Student Loan Repayment: £{result['Student Loan Repayment']}"))
+    elif status == "Outside IR35":
+        company_breakdown = result.get("Company Breakdown", {})
+        personal_breakdown = result.get("Personal Breakdown", {})
+        lines.append((GAP, 5))
+        lines.append((HEADING, "Company Breakdown"))
+        for key, value in company_breakdown.items():
+            if key != "VAT Output":
+                lines.append((LINE, f"{key}: £{round(value)}"))
+        if company_breakdown.get("VAT Output", 0) > 0:
+            lines.append((LINE, f"VAT Output (20%): £{round(company_breakdown['VAT Output'])}"))
+        lines.append((GAP, 5))
+        lines.append((HEADING, "Personal Breakdown"))
+        for key, value in personal_breakdown.items():
+            lines.append((LINE, f"{key}: £{value}"))
+        lines.append((LINE, f"Net Take-Home Pay: £{result.get('Net Take-Home Pay', 0)}"))
+    
+    # Disclaimer
+    lines.append((GAP, 10))
+    if status == "Outside IR35":
+        lines.append((DISCLAIMER, OUTSIDE_DISCLAIMER.format(tax_year_label=tax_year_label)))
+    else:
+        lines.append((DISCLAIMER, INSIDE_DISCLAIMER))
+    return lines
+
+def draw_report(pdf, lines):
+    if pdf.page:
+        # Previous report ended on the grey disclaimer
+        pdf.set_text_color(0, 0, 0)
+    pdf.add_page()
+    for kind, value in lines:
+        if kind == LINE:
+            pdf.cell(200, 8, value, ln=True)
+        elif kind == GAP:
+            pdf.ln(value)
+        elif kind == HEADING:
+            pdf.set_font("Arial", size=12, style='B')
+            pdf.cell(200, 8, value, ln=True)
+            pdf.set_font("Arial", size=11)
+        elif kind == TITLE:
+            pdf.set_font("Arial", size=16, style='B')
+            pdf.cell(200, 10, value, ln=True, align='C')
+        elif kind == DISCLAIMER:
+            pdf.set_font("Arial", size=8)
+            pdf.set_text_color(128, 128, 128)
+            pdf.cell(200, 8, "**Disclaimer:**", ln=True)
+            pdf.multi_cell(190, 5, value)
+
+def new_document():
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    # Bold is registered up front, so every document has the same font table and their pages can be merged
+    pdf.set_font("Arial", size=12)
+    pdf.set_font("Arial", size=12, style='B')
+    pdf.set_font("Arial", size=12)
+    return pdf
+
+@timed("generate_pdf")
+def generate_pdf(result, calculation_mode, client_rate=None, base_rate=None, 
+               pay_rate=None, margin=None, employer_deductions=None, status="Inside IR35", tax_year=None):
+    pdf = new_document()
+    draw_report(pdf, report_lines(
+        result, calculation_mode, client_rate, base_rate, pay_rate, margin, employer_deductions, status, tax_year
+    ))
+    return pdf.output(dest='S').encode('latin1')
+
+# ----------
+# PAGE MERGING
+# ----------
+# A batch draws each chunk of reports into one document, written out with FPDF.output(); the pages are then
+# read back from that output and written into one file per report (zip) or one file for the batch (merged)
+_TRAILER_REFERENCE = re.compile(rb"/(Root|Info) (\d+) 0 R")
+_STREAM = re.compile(rb"<<[^>]*/Length (\d+)[^>]*>>\nstream\n")
+_END_STREAM = b"\nendstream"
+
+def _reference(body, key):
+    return int(re.search(rb"/" + key + rb" (\d+) 0 R", body).group(1))
+
+def _document_pages(data):
+    # Page content streams, fonts, page size and info of a PDF with a plain cross-reference table
+    xref = int(data[data.rindex(b"startxref") + len(b"startxref"):].split()[0])
+    lines = data[xref:].split(b"\n")
+    count = int(lines[1].split()[1])
+    offsets = [int(line[:10]) for line in lines[2:2 + count]]
+
+    def body(number):
+        start = data.index(b"\n", offsets[number]) + 1
+        stream = _STREAM.match(data, start)
+        if stream:
+            return data[start:stream.end() + int(stream.group(1)) + len(_END_STREAM)]
+        return data[start:data.index(b"\nendobj", start)]
+
+    trailer = dict(_TRAILER_REFERENCE.findall(data[data.rindex(b"trailer"):]))
+    tree = body(_reference(body(int(trailer[b"Root"])), b"Pages"))
+    kids = [body(int(number)) for number in re.findall(rb"(\d+) 0 R", re.search(rb"/Kids \[([^\]]*)\]", tree).group(1))]
+    resources = body(_reference(kids[0], b"Resources"))
+    return {
+        "contents": [body(_reference(kid, b"Contents")) for kid in kids],
+        "fonts": [(name, body(int(number))) for name, number in re.findall(rb"/(F\d+) (\d+) 0 R", resources)],
+        "media_box": re.search(rb"/MediaBox \[[^\]]*\]", tree).group(0),
+        "info": body(int(trailer[b"Info"]))
+    }
+
+class _PageWriter:
+    # Streams pages to the sink as they arrive; the page tree and fonts they share are written at the end
+    def __init__(self, sink):
+        self.sink = sink
+        self.offsets = {}
+        self.kids = []
+        self.document = None
+        # Objects 1 and 2 are kept for the page tree and the shared resources
+        self.number = 2
+        sink.write(b"%PDF-1.3\n")
+
+    def _write(self, number, body):
+        self.offsets[number] = self.sink.tell()
+        self.sink.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+    def _add(self, body):
+        self.number += 1
+        self._write(self.number, body)
+        return self.number
+
+    def add_pages(self, document, contents):
+        if self.document is None:
+            self.document = document
+        elif document["fonts"] != self.document["fonts"] or document["media_box"] != self.document["media_box"]:
+            raise ValueError("Reports in a batch must share fonts and page size")
+        for content in contents:
+            number = self._add(content)
+            self.kids.append(self._add(b"<</Type /Page\n/Parent 1 0 R\n/Resources 2 0 R\n/Contents %d 0 R>>" % number))
+
+    def close(self):
+        fonts = b"".join(b"/%s %d 0 R\n" % (name, self._add(body)) for name, body in self.document["fonts"])
+        self._write(2, b"<<\n/ProcSet [/PDF /Text /ImageB /ImageC /ImageI]\n/Font <<\n%s>>\n/XObject <<\n>>\n>>" % fonts)
+        kids = b"".join(b"%d 0 R " % number for number in self.kids)
+        self._write(1, b"<</Type /Pages\n/Kids [%s]\n/Count %d\n%s\n>>" % (kids, len(self.kids), self.document["media_box"]))
+        info = self._add(self.document["info"])
+        catalog = self._add(
+            b"<<\n/Type /Catalog\n/Pages 1 0 R\n/OpenAction [%d 0 R /FitH null]\n/PageLayout /OneColumn\n>>" % self.kids[0]
+        )
+        xref = self.sink.tell()
+        size = self.number + 1
+        self.sink.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        self.sink.write(b"".join(b"%010d 00000 n \n" % self.offsets[number] for number in range(1, size)))
+        self.sink.write(b"trailer\n<<\n/Size %d\n/Root %d 0 R\n/Info %d 0 R\n>>\nstartxref\n%d\n%%%%EOF\n" % (
+            size, catalog, info, xref
+        ))
+
+# ----------
+# BATCH REPORTS
+# ----------
+def _report_args(report):
+    args = {field: report.get(field) for field in REPORT_FIELDS}
+    args["status"] = report.get("status") or "Inside IR35"
+    return args
+
+def _report_file_name(report, index):
+    return report.get("file_name") or f"IR35_Report_{index + 1:05d}.pdf"
+
+def _init_worker():
+    # Once per worker process: import fpdf and load the font metrics every chunk document uses
+    new_document()
+
+def _render_chunk(chunk, split):
+    # The whole chunk is one document, set up and written once; each report's pages are noted as it is drawn
+    pdf = new_document()
+    page_counts = []
+    for file_name, report in chunk:
+        draw_report(pdf, report_lines(**_report_args(report)))
+        page_counts.append(pdf.page_no())
+    document = _document_pages(pdf.output(dest='S').encode('latin1'))
+    if not split:
+        return len(chunk), document
+    files, first = [], 0
+    for (file_name, report), last in zip(chunk, page_counts):
+        sink = BytesIO()
+        writer = _PageWriter(sink)
+        writer.add_pages(document, document["contents"][first:last])
+        writer.close()
+        files.append((file_name, sink.getvalue()))
+        first = last
+    return files
+
+def _chunks(reports, chunk_size):
+    chunk = []
+    for index, report in enumerate(reports):
+        chunk.append((_report_file_name(report, index), report))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _rendered_chunks(reports, workers, chunk_size, split):
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in _chunks(reports, chunk_size):
+            pending.append(pool.submit(_render_chunk, chunk, split))
+            # Bound rendered-but-unwritten reports so memory stays flat
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def generate_pdf_batch(reports, output_path, mode="zip", workers=None, chunk_size=25):
+    count = 0
+    if mode == "merged":
+        # One document: each chunk's pages are appended to the file as the chunk completes
+        with open(output_path, "wb") as sink:
+            writer = _PageWriter(sink)
+            for drawn, document in _rendered_chunks(reports, workers, chunk_size, split=False):
+                writer.add_pages(document, document["contents"])
+                count += drawn
+            if count:
+                writer.close()
+        if not count:
+            # No reports: the blank page FPDF writes for an empty document
+            new_document().output(output_path, 'F')
+        return count
+    if mode != "zip":
+        raise ValueError(f"Unknown batch report mode: {mode}")
+
+    with ZipFile(output_path, "w", compression=ZIP_STORED) as archive:
+        for files in _rendered_chunks(reports, workers, chunk_size, split=True):
+            for file_name, data in files:
+                archive.writestr(file_name, data)
+                count += 1
+    return count
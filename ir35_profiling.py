@@ -0,0 +1,162 @@
+# ======================
+# IR35 PROFILING
+# Opt-in stage timers (IR35_PROFILE=1) aggregated into per-stage histograms in process
+#
+#   IR35_PROFILE=1 streamlit run ir35_calculator.py           then open ?debug=1 for the sidebar
+#   IR35_PROFILE=1 IR35_PROFILE_EXPORT=profile.prom python ir35_bulk.py ...
+# ======================
+
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+
+# ----------
+# CONSTANTS
+# ----------
+# Read once at import: when disabled, timed() hands back the undecorated function and stage() a shared no-op
+ENABLED = os.environ.get("IR35_PROFILE", "") not in ("", "0")
+EXPORT_PATH = os.environ.get("IR35_PROFILE_EXPORT", "")
+METRIC_NAME = "ir35_stage_seconds"
+
+# Upper bounds in seconds, 10µs to 10s
+BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_NO_OP = nullcontext()
+
+# ----------
+# HISTOGRAMS
+# ----------
+class StageHistogram:
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation, capped at the slowest one seen
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+_lock = threading.Lock()
+_histograms = {}
+
+def record(name, seconds):
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = StageHistogram()
+        histogram.observe(seconds)
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+# ----------
+# TIMERS
+# ----------
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+def stage(name):
+    return _Stage(name) if ENABLED else _NO_OP
+
+def timed(name):
+    def decorator(function):
+        if not ENABLED:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+# ----------
+# REPORTING
+# ----------
+def snapshot():
+    with _lock:
+        return {
+            name: {
+                "Count": histogram.count,
+                "Total": histogram.total,
+                "Max": histogram.max,
+                "P50": histogram.quantile(0.5),
+                "P95": histogram.quantile(0.95),
+                "Buckets": dict(zip([*map(str, BUCKETS), "+Inf"], histogram.buckets))
+            }
+            for name, histogram in sorted(_histograms.items())
+        }
+
+def summary_rows():
+    return [
+        [name, stats["Count"], round(stats["Total"] * 1000, 2), round(stats["Total"] / stats["Count"] * 1000, 3),
+         round(stats["P50"] * 1000, 3), round(stats["P95"] * 1000, 3), round(stats["Max"] * 1000, 3)]
+        for name, stats in snapshot().items()
+    ]
+
+def to_json():
+    return json.dumps({"Enabled": ENABLED, "Stages": snapshot()}, indent=1)
+
+def to_prometheus():
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent in each IR35 calculator stage.",
+        f"# TYPE {METRIC_NAME} histogram"
+    ]
+    for name, stats in snapshot().items():
+        cumulative = 0
+        for bound, count in stats["Buckets"].items():
+            cumulative += count
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{name}"}} {stats["Total"]!r}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{name}"}} {stats["Count"]}')
+    return "\n".join(lines) + "\n"
+
+def export(path):
+    content = to_prometheus() if str(path).endswith((".prom", ".txt")) else to_json()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
+
+if ENABLED and EXPORT_PATH:
+    atexit.register(export, EXPORT_PATH)
@@ -0,0 +1,225 @@
+# ======================
+# IR35 RESULTS
+# Columnar result store: one float64 block with a fixed schema for both IR35 branches,
+# and read-only row views that look like the dicts ir35_tax_calculator returns
+# ======================
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from ir35_batch import LTD_COMPANY, RESULT_COLUMNS, ir35_tax_calculator_batch
+from ir35_core import get_tax_year, outside_disclaimer
+
+# ----------
+# SCHEMA
+# ----------
+# The batch columns come first, so the batch-shaped frame is a leading slice of the block
+RESULT_FIELDS = RESULT_COLUMNS + ["Pay Rate", "Allowable Expenses", "Director Salary", "VAT Output"]
+FIELD_INDEX = {name: index for index, name in enumerate(RESULT_FIELDS)}
+
+# Fields the scalar calculator rounds to whole pounds (or passes through as whole days)
+WHOLE_FIELDS = frozenset([
+    "Gross Income", "Employee Pension", "Income Tax", "Employee NI", "Student Loan Repayment", "Net Take-Home Pay",
+    "Working Days", "Daily Rate", "VAT Amount", "Project Total", "Dividend Tax", "Total Personal Tax"
+])
+
+DIVIDEND_STRATEGY = "Dividend Strategy"
+DISCLAIMER = "Disclaimer"
+
+# Dict key -> schema field (or nested layout), per branch, in the scalar calculator's key order
+INSIDE_LAYOUT = {
+    "Gross Income": "Gross Income",
+    "Employee Pension": "Employee Pension",
+    "Income Tax": "Income Tax",
+    "Employee NI": "Employee NI",
+    "Student Loan Repayment": "Student Loan Repayment",
+    "Net Take-Home Pay": "Net Take-Home Pay",
+    "Working Days": "Working Days",
+    "Daily Rate": "Daily Rate"
+}
+
+COMPANY_LAYOUT = {
+    "Turnover": "Turnover",
+    "Allowable Expenses": "Allowable Expenses",
+    "Director Salary": "Director Salary",
+    "Employer NI": "Employer NI",
+    "Employer Pension": "Employer Pension",
+    "Profit Before Tax": "Profit Before Tax",
+    "Corporation Tax": "Corporation Tax",
+    "Profit After Tax": "Profit After Tax",
+    "Dividends Available": "Dividends Available",
+    "VAT Output": "VAT Output"
+}
+
+PERSONAL_LAYOUT = {
+    "Salary Income Tax": "Income Tax",
+    "Employee NI": "Employee NI",
+    "Dividend Tax": "Dividend Tax",
+    "Student Loan Repayment": "Student Loan Repayment",
+    "Total Personal Tax": "Total Personal Tax",
+    "Net Personal Income": "Net Take-Home Pay"
+}
+
+OUTSIDE_LAYOUT = {
+    "Base Rate": "Pay Rate",
+    "Pay Rate": "Pay Rate",
+    "VAT Amount": "VAT Amount",
+    "Working Days": "Working Days",
+    "Project Total": "Project Total",
+    "Daily Rate": "Daily Rate",
+    "Company Breakdown": COMPANY_LAYOUT,
+    "Personal Breakdown": PERSONAL_LAYOUT,
+    "Net Take-Home Pay": "Net Take-Home Pay",
+    "Dividend Strategy": DIVIDEND_STRATEGY,
+    "Disclaimer": DISCLAIMER
+}
+
+# ----------
+# ROW VIEWS
+# ----------
+class ResultView(Mapping):
+    __slots__ = ("table", "row", "layout")
+
+    def __init__(self, table, row, layout):
+        self.table = table
+        self.row = row
+        self.layout = layout
+
+    def __getitem__(self, key):
+        source = self.layout[key]
+        if isinstance(source, dict):
+            # Non-limited-company rows have no breakdowns, as in the scalar calculator
+            return ResultView(self.table, self.row, source if self.table.has_company(self.row) else {})
+        if source == DIVIDEND_STRATEGY:
+            return self.table.dividend_strategy
+        if source == DISCLAIMER:
+            return outside_disclaimer(self.table.label(self.row))
+        return self.table.value(source, self.row)
+
+    def __iter__(self):
+        return iter(self.layout)
+
+    def __len__(self):
+        return len(self.layout)
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def to_dict(self):
+        return {key: value.to_dict() if isinstance(value, ResultView) else value for key, value in self.items()}
+
+# ----------
+# TABLE
+# ----------
+class ResultTable:
+    __slots__ = ("values", "outside", "tax_year_label", "dividend_strategy")
+
+    def __init__(self, values, outside, tax_year_label, dividend_strategy):
+        self.values = values
+        self.outside = outside
+        self.tax_year_label = tax_year_label
+        self.dividend_strategy = dividend_strategy
+
+    @classmethod
+    def from_columns(cls, columns, outside, tax_year_label, dividend_strategy):
+        length = len(outside)
+        values = np.empty((len(RESULT_FIELDS), length))
+        for name, index in FIELD_INDEX.items():
+            values[index] = np.broadcast_to(columns.get(name, np.nan), length)
+        return cls(values, np.asarray(outside, dtype=bool), tax_year_label, dividend_strategy)
+
+    def __len__(self):
+        return self.values.shape[1]
+
+    def __getitem__(self, row):
+        return ResultView(self, row, OUTSIDE_LAYOUT if self.outside[row] else INSIDE_LAYOUT)
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def column(self, name):
+        return self.values[FIELD_INDEX[name]]
+
+    def value(self, name, row):
+        value = float(self.values[FIELD_INDEX[name], row])
+        return int(value) if name in WHOLE_FIELDS and value.is_integer() else value
+
+    def label(self, row):
+        # A mixed-config table carries one tax year label per row
+        return self.tax_year_label if isinstance(self.tax_year_label, str) else self.tax_year_label[row]
+
+    def has_company(self, row):
+        return not np.isnan(self.values[FIELD_INDEX["Turnover"], row])
+
+    def to_pandas(self, index=None, fields=None):
+        import pandas as pd
+
+        # The block is field-major, so its transpose is exactly pandas' own single float64 block: a leading run
+        # of fields (the whole schema, or the batch columns) is passed through without a copy
+        fields = fields or RESULT_FIELDS
+        positions = [FIELD_INDEX[name] for name in fields]
+        block = self.values[:len(fields)] if positions == list(range(len(fields))) else self.values[positions]
+        return pd.DataFrame(block.T, index=index, columns=fields, copy=False)
+
+    def to_arrow(self, fields=None):
+        import pyarrow as pa
+
+        fields = fields or RESULT_FIELDS
+        return pa.Table.from_arrays([pa.array(self.values[FIELD_INDEX[name]]) for name in fields], names=fields)
+
+# ----------
+# BUILDERS
+# ----------
+def ir35_result_table(pay_rate, working_days, pension_contribution_percent=5,
+                      student_loan_plan="None", status="Inside IR35", vat_registered=False,
+                      allowable_expenses=0.0, salary_amount=12570.0,
+                      employer_pension_percent=3.0, outside_business_type=LTD_COMPANY,
+                      dividend_strategy="Distribute all profit after corporation tax", tax_year=None):
+    columns = ir35_tax_calculator_batch(
+        pay_rate, working_days, pension_contribution_percent, student_loan_plan, status, vat_registered,
+        allowable_expenses, salary_amount, employer_pension_percent, outside_business_type, tax_year
+    )
+    shape = columns["Net Take-Home Pay"].shape
+    outside = np.broadcast_to(np.asarray(status, dtype=object) == "Outside IR35", shape).ravel()
+    ltd = ~np.isnan(columns["Turnover"].ravel())
+    columns = {name: np.ravel(values) for name, values in columns.items()}
+
+    def flat(values, dtype=float):
+        return np.broadcast_to(np.asarray(values, dtype=dtype), shape).ravel()
+
+    columns["Pay Rate"] = flat(pay_rate)
+    columns["Allowable Expenses"] = np.where(ltd, flat(allowable_expenses), np.nan)
+    columns["Director Salary"] = np.where(ltd, flat(salary_amount), np.nan)
+    columns["VAT Output"] = np.where(ltd, np.where(flat(vat_registered, bool), columns["Turnover"] * 0.2, 0.0), np.nan)
+    return ResultTable.from_columns(columns, outside, tax_year_labels(tax_year, shape), dividend_strategy)
+
+def tax_year_labels(tax_year, shape):
+    import pandas as pd
+
+    if not np.ndim(tax_year):
+        return get_tax_year(tax_year).label
+    codes, configs = pd.factorize(np.broadcast_to(np.asarray(tax_year, dtype=object), shape).ravel(), use_na_sentinel=False)
+    return np.array([get_tax_year(config).label for config in configs], dtype=object)[codes]
+
+def _flatten(results):
+    # Fills what the batch builder fills for each branch; Inside results carry no unrounded Pay Rate
+    if "Company Breakdown" not in results:
+        flat = {field: results[key] for key, field in INSIDE_LAYOUT.items()}
+        flat.update({"Project Total": flat["Gross Income"], "VAT Amount": 0})
+        return False, flat
+    flat = {field: results[key] for key, field in OUTSIDE_LAYOUT.items() if isinstance(field, str) and field in FIELD_INDEX}
+    for breakdown, layout in (("Company Breakdown", COMPANY_LAYOUT), ("Personal Breakdown", PERSONAL_LAYOUT)):
+        flat.update({field: results[breakdown][key] for key, field in layout.items() if key in results[breakdown]})
+    flat.update({"Gross Income": flat["Project Total"], "Employee Pension": 0})
+    return True, flat
+
+def pack_results(results, tax_year=None, dividend_strategy="Distribute all profit after corporation tax"):
+    # Scalar result dicts into one table, e.g. to hand a loop's output to pandas or Arrow
+    values = np.full((len(RESULT_FIELDS), len(results)), np.nan)
+    outside = np.zeros(len(results), dtype=bool)
+    for row, result in enumerate(results):
+        outside[row], flat = _flatten(result)
+        for name, value in flat.items():
+            values[FIELD_INDEX[name], row] = value
+    return ResultTable(values, outside, get_tax_year(tax_year).label, dividend_strategy)
@@ -0,0 +1,140 @@
+# ======================
+# IR35 SCENARIO MATRIX
+# Many what-if scenarios over one project period, evaluated in a single batched call
+# ======================
+
+import numpy as np
+
+from ir35_batch import (
+    PLACEMENT_DEFAULTS,
+    calculate_margin_batch,
+    calculate_rates_batch,
+    calculate_working_days_batch,
+    ir35_tax_calculator_batch,
+    tax_years_by_region
+)
+
+# ----------
+# CONSTANTS
+# ----------
+FIXED_SALARY = "Fixed"
+OPTIMISED_SALARY = "Optimised"
+SALARY_STRATEGIES = [FIXED_SALARY, OPTIMISED_SALARY]
+
+SCENARIO_DEFAULTS = {
+    "calculation_mode": "Client Rate",
+    **PLACEMENT_DEFAULTS,
+    "salary_strategy": FIXED_SALARY
+}
+
+MATRIX_COLUMNS = [
+    "Scenario",
+    "Status",
+    "Tax Region",
+    "Days per Week",
+    "Working Days",
+    "Client Rate",
+    "Base Rate",
+    "Pay Rate",
+    "Margin Percentage",
+    "Employee Pension",
+    "Director Salary",
+    "VAT Registered",
+    "Client Total",
+    "Total Tax",
+    "Net Take-Home Pay",
+    "Daily Net",
+    "Take-Home Share"
+]
+
+# ----------
+# MATRIX
+# ----------
+def period_working_days(start_date, end_date, bank_holidays):
+    # Weekdays in the period are counted once; each days-per-week option only rescales that count
+    days_per_week = np.arange(1, 6)
+    return calculate_working_days_batch(
+        np.full(5, start_date, dtype="datetime64[D]"), np.full(5, end_date, dtype="datetime64[D]"),
+        days_per_week, bank_holidays
+    )
+
+def calculate_scenario_matrix(scenarios, start_date, end_date, bank_holidays):
+    import pandas as pd
+
+    from ir35_optimizer import optimise_salary_batch
+
+    count = len(scenarios)
+    columns = {key: np.broadcast_to(scenarios[key].to_numpy() if key in scenarios else value, count)
+               for key, value in SCENARIO_DEFAULTS.items()}
+    days_per_week = np.clip(columns["days_per_week"].astype(int), 1, 5)
+    if isinstance(bank_holidays, dict):
+        # One holiday list per tax region, so Scottish scenarios skip Scottish bank holidays
+        working_days = np.zeros(count, dtype=int)
+        for region in set(columns["tax_region"].tolist()):
+            if region not in bank_holidays:
+                raise ValueError(f"Unknown tax region: {region}")
+            rows = columns["tax_region"] == region
+            working_days[rows] = period_working_days(start_date, end_date, bank_holidays[region])[days_per_week[rows] - 1]
+    else:
+        working_days = period_working_days(start_date, end_date, bank_holidays)[days_per_week - 1]
+    client_rate, base_rate, pay_rate = calculate_rates_batch(
+        columns["calculation_mode"], scenarios["rate"].to_numpy(dtype=float), columns["margin_percent"], columns["status"]
+    )
+
+    outside = columns["status"] == "Outside IR35"
+    tax_years = tax_years_by_region(columns["tax_region"])
+    salary = columns["outside_salary"].astype(float)
+    optimise = outside & (columns["salary_strategy"] == OPTIMISED_SALARY)
+    if optimise.any():
+        salary = salary.copy()
+        salary[optimise] = optimise_salary_batch(
+            pay_rate[optimise], working_days[optimise], columns["allowable_expenses"][optimise],
+            columns["employer_pension_percent"][optimise], columns["student_loan"][optimise], tax_years[optimise]
+        )["Salary"]
+
+    results = ir35_tax_calculator_batch(
+        pay_rate,
+        working_days,
+        columns["employee_pension"],
+        columns["student_loan"],
+        columns["status"],
+        columns["vat_registered"],
+        columns["allowable_expenses"],
+        salary,
+        columns["employer_pension_percent"],
+        columns["outside_business_type"],
+        tax_years
+    )
+    margin = calculate_margin_batch(client_rate, base_rate, working_days)
+    net = results["Net Take-Home Pay"]
+    client_total = client_rate * working_days
+    total_tax = np.where(
+        outside,
+        results["Corporation Tax"] + results["Employer NI"] + results["Total Personal Tax"],
+        results["Income Tax"] + results["Employee NI"] + results["Student Loan Repayment"]
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily_net = np.where(working_days > 0, net / working_days, 0.0)
+        take_home_share = np.where(client_total > 0, net / client_total * 100, 0.0)
+
+    names = scenarios["name"].to_numpy() if "name" in scenarios else [None] * count
+    names = [name if isinstance(name, str) and name else f"Scenario {i + 1}" for i, name in enumerate(names)]
+    return pd.DataFrame({
+        "Scenario": names,
+        "Status": columns["status"],
+        "Tax Region": columns["tax_region"],
+        "Days per Week": days_per_week,
+        "Working Days": working_days,
+        "Client Rate": np.round(client_rate, 2),
+        "Base Rate": np.round(base_rate, 2),
+        "Pay Rate": np.round(pay_rate, 2),
+        "Margin Percentage": margin["Margin Percentage"],
+        "Employee Pension": np.where(outside, 0.0, columns["employee_pension"].astype(float)),
+        "Director Salary": np.where(outside, np.round(salary), np.nan),
+        "VAT Registered": outside & columns["vat_registered"].astype(bool),
+        "Client Total": np.round(client_total),
+        "Total Tax": np.round(total_tax),
+        "Net Take-Home Pay": net,
+        "Daily Net": np.round(daily_net),
+        "Take-Home Share": np.round(take_home_share, 1)
+    }, index=scenarios.index, columns=MATRIX_COLUMNS)
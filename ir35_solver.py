@@ -0,0 +1,219 @@
+# ======================
+# IR35 SOLVER
+# Client rate needed for a target net take-home, solved band by band
+# ======================
+
+from bisect import bisect_left
+
+import numpy as np
+
+from ir35_batch import (
+    LTD_COMPANY,
+    STUDENT_LOAN_PLANS,
+    calculate_base_rate_from_pay_batch,
+    calculate_client_rate_batch
+)
+from ir35_core import (
+    calculate_base_rate_from_pay,
+    calculate_client_rate,
+    calculate_dividend_tax,
+    calculate_employee_income_tax,
+    calculate_employee_ni,
+    calculate_ltd_company_finances,
+    calculate_student_loan_repayment,
+    get_tax_year
+)
+
+# Net pay is linear past the last band edge; one far point fixes that final slope
+FAR_GROSS = 10_000_000.0
+
+# ----------
+# UNROUNDED NET PAY
+# ----------
+def inside_net_income(gross_income, pension_contribution_percent=5, student_loan_plan="None", tax_year=None):
+    bands = get_tax_year(tax_year)
+    employee_pension = gross_income * (pension_contribution_percent / 100)
+    income_tax = calculate_employee_income_tax(gross_income - employee_pension, bands)
+    employee_ni = calculate_employee_ni(gross_income, bands)
+    student_loan = calculate_student_loan_repayment(gross_income, student_loan_plan)
+    return gross_income - (income_tax + employee_ni + student_loan + employee_pension)
+
+def outside_net_income(turnover, salary_amount=12570.0, allowable_expenses=0.0, employer_pension_percent=3.0,
+                       student_loan_plan="None", tax_year=None):
+    bands = get_tax_year(tax_year)
+    company = calculate_ltd_company_finances(
+        turnover, 1, allowable_expenses, salary_amount, employer_pension_percent, False, bands
+    )
+    dividends = company["Dividends Available"]
+    total_tax = (
+        calculate_employee_income_tax(salary_amount, bands)
+        + calculate_employee_ni(salary_amount, bands)
+        + calculate_dividend_tax(salary_amount, dividends, bands)
+        + calculate_student_loan_repayment(salary_amount + dividends, student_loan_plan)
+    )
+    return salary_amount + dividends - total_tax
+
+# ----------
+# PIECEWISE-LINEAR TABLES
+# ----------
+def _table(function, breakpoints, start=0.0):
+    xs = sorted({start, *[point for point in breakpoints if point > start]})
+    xs.append(max(xs[-1] * 2, FAR_GROSS))
+    return xs, [function(x) for x in xs]
+
+def _invert(xs, ys, target):
+    if target <= ys[0]:
+        return xs[0]
+    # Every segment is linear, so interpolating between its end points is exact
+    index = min(bisect_left(ys, target), len(ys) - 1)
+    x0, x1, y0, y1 = xs[index - 1], xs[index], ys[index - 1], ys[index]
+    return x0 + ((target - y0) * (x1 - x0) / (y1 - y0))
+
+def _inside_table(pension_contribution_percent, student_loan_plan, bands):
+    retained = 1 - (pension_contribution_percent / 100)
+    breakpoints = list(bands.employee_ni.thresholds)
+    if retained > 0:
+        breakpoints += [threshold / retained for threshold in bands.income_tax.thresholds]
+    if student_loan_plan in STUDENT_LOAN_PLANS:
+        breakpoints.append(STUDENT_LOAN_PLANS[student_loan_plan][0])
+    return _table(
+        lambda gross: inside_net_income(gross, pension_contribution_percent, student_loan_plan, bands),
+        breakpoints
+    )
+
+def _outside_table(salary_amount, allowable_expenses, employer_pension_percent, student_loan_plan, bands):
+    # Turnover below fixed costs leaves no profit, so net pay only starts to move at break-even
+    employer_ni = max(0, salary_amount - bands.employer_ni_threshold) * bands.employer_ni_rate
+    break_even = allowable_expenses + salary_amount + employer_ni + (salary_amount * (employer_pension_percent / 100))
+    corporation_tax_edges = [break_even, break_even + bands.lower_limit, break_even + bands.upper_limit]
+
+    # Dividend tax and student loan bend at fixed dividend amounts; map each back to turnover
+    def dividends(turnover):
+        return calculate_ltd_company_finances(
+            turnover, 1, allowable_expenses, salary_amount, employer_pension_percent, False, bands
+        )["Dividends Available"]
+
+    dividend_xs, dividend_ys = _table(dividends, corporation_tax_edges, break_even)
+    taxable_salary = max(0, salary_amount - bands.personal_allowance)
+    remaining_basic = max(0, bands.basic_band - taxable_salary)
+    tax_free = max(0, bands.personal_allowance - salary_amount) + bands.dividend_allowance
+    dividend_edges = [
+        tax_free,
+        tax_free + remaining_basic,
+        tax_free + remaining_basic + max(0, bands.higher_band - taxable_salary - remaining_basic)
+    ]
+    if student_loan_plan in STUDENT_LOAN_PLANS:
+        dividend_edges.append(STUDENT_LOAN_PLANS[student_loan_plan][0] - salary_amount)
+    breakpoints = corporation_tax_edges + [
+        _invert(dividend_xs, dividend_ys, edge) for edge in dividend_edges if edge > 0
+    ]
+
+    xs, ys = _table(
+        lambda turnover: outside_net_income(
+            turnover, salary_amount, allowable_expenses, employer_pension_percent, student_loan_plan, bands
+        ),
+        breakpoints,
+        break_even
+    )
+    return xs, ys, len(dividend_xs)
+
+def net_income_table(status="Inside IR35", pension_contribution_percent=5, student_loan_plan="None",
+                     allowable_expenses=0.0, salary_amount=12570.0, employer_pension_percent=3.0, tax_year=None):
+    bands = get_tax_year(tax_year)
+    if status == "Outside IR35":
+        xs, ys, extra_evaluations = _outside_table(
+            salary_amount, allowable_expenses, employer_pension_percent, student_loan_plan, bands
+        )
+        return xs, ys, len(xs) + extra_evaluations
+    xs, ys = _inside_table(pension_contribution_percent, student_loan_plan, bands)
+    return xs, ys, len(xs)
+
+# ----------
+# SOLVERS
+# ----------
+def _rates_from_gross(gross_income, working_days, margin_percent, status):
+    pay_rate = gross_income / working_days
+    base_rate = calculate_base_rate_from_pay(pay_rate, status)
+    return calculate_client_rate(base_rate, margin_percent), base_rate, pay_rate
+
+def solve_client_rate(target_net, working_days, margin_percent, status="Inside IR35", pension_contribution_percent=5,
+                      student_loan_plan="None", allowable_expenses=0.0, salary_amount=12570.0,
+                      employer_pension_percent=3.0, outside_business_type=LTD_COMPANY, tax_year=None):
+    if working_days <= 0:
+        raise ValueError("Working days must be positive")
+    if status == "Outside IR35" and outside_business_type != LTD_COMPANY:
+        raise ValueError(f"Unsupported Outside IR35 business type: {outside_business_type}")
+    xs, ys, evaluations = net_income_table(
+        status, pension_contribution_percent, student_loan_plan, allowable_expenses, salary_amount,
+        employer_pension_percent, tax_year
+    )
+    # Net pay never falls below its value at the table start: nothing for Inside, the salary-only take-home
+    # at break-even for Outside, which no client rate can undercut
+    if target_net < ys[0]:
+        raise ValueError(
+            f"Target net £{target_net:,.2f} is below the £{ys[0]:,.2f} minimum take-home for {status}"
+        )
+    client_rate, base_rate, pay_rate = _rates_from_gross(_invert(xs, ys, target_net), working_days, margin_percent, status)
+    return {
+        "Client Rate": client_rate,
+        "Base Rate": base_rate,
+        "Pay Rate": pay_rate,
+        "Target Net": target_net,
+        "Evaluations": evaluations
+    }
+
+def solve_client_rate_batch(target_net, working_days, margin_percent, status="Inside IR35",
+                            pension_contribution_percent=5, student_loan_plan="None", allowable_expenses=0.0,
+                            salary_amount=12570.0, employer_pension_percent=3.0, tax_year=None):
+    target_net, working_days, margin_percent, pension, expenses, salary, employer_pension, status, student_loan_plan = (
+        np.broadcast_arrays(
+            np.asarray(target_net, dtype=float),
+            np.asarray(working_days, dtype=float),
+            np.asarray(margin_percent, dtype=float),
+            np.asarray(pension_contribution_percent, dtype=float),
+            np.asarray(allowable_expenses, dtype=float),
+            np.asarray(salary_amount, dtype=float),
+            np.asarray(employer_pension_percent, dtype=float),
+            np.asarray(status, dtype=object),
+            np.asarray(student_loan_plan, dtype=object)
+        )
+    )
+    outside = status == "Outside IR35"
+    # Rows sharing the non-target inputs share one table of band edges
+    keys = list(zip(
+        outside.ravel().tolist(),
+        np.where(outside, 0.0, pension).ravel().tolist(),
+        student_loan_plan.ravel().tolist(),
+        np.where(outside, expenses, 0.0).ravel().tolist(),
+        np.where(outside, salary, 0.0).ravel().tolist(),
+        np.where(outside, employer_pension, 0.0).ravel().tolist()
+    ))
+    groups = {}
+    for row, key in enumerate(keys):
+        groups.setdefault(key, []).append(row)
+
+    gross_income = np.empty(target_net.size)
+    attainable = np.empty(target_net.size, dtype=bool)
+    targets = target_net.ravel()
+    evaluations = 0
+    for (is_outside, pension_percent, plan, expense, salary_value, employer_pension_percent), rows in groups.items():
+        xs, ys, count = net_income_table(
+            "Outside IR35" if is_outside else "Inside IR35", pension_percent, plan, expense, salary_value,
+            employer_pension_percent, tax_year
+        )
+        evaluations += count
+        gross_income[rows] = np.interp(targets[rows], ys, xs)
+        attainable[rows] = targets[rows] >= ys[0]
+
+    # Targets below the table start, as solve_client_rate rejects, get no rates rather than the break-even ones
+    attainable = attainable.reshape(target_net.shape)
+    gross_income = np.where(attainable, gross_income.reshape(target_net.shape), np.nan)
+    pay_rate = gross_income / working_days
+    base_rate = calculate_base_rate_from_pay_batch(pay_rate, status)
+    return {
+        "Client Rate": calculate_client_rate_batch(base_rate, margin_percent),
+        "Base Rate": base_rate,
+        "Pay Rate": pay_rate,
+        "Attainable": attainable,
+        "Evaluations": evaluations
+    }
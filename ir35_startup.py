@@ -0,0 +1,49 @@
+# ======================
+# IR35 STARTUP
+# Static assets and reference data loaded once per process in the background, off the first paint
+# ======================
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from bank_holidays import DEFAULT_REGION, get_bank_holidays
+
+# ----------
+# CONSTANTS
+# ----------
+LOGO_PATH = Path(__file__).resolve().parent / "B2e Logo.png"
+
+# Shared by every Streamlit session in the process
+_lock = threading.Lock()
+_warmup = {}
+
+# ----------
+# LOADERS
+# ----------
+def _read_logo():
+    try:
+        return LOGO_PATH.read_bytes()
+    except OSError:
+        return None
+
+def start_warmup():
+    if not _warmup:
+        with _lock:
+            if not _warmup:
+                executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ir35-warmup")
+                _warmup["logo"] = executor.submit(_read_logo)
+                _warmup["bank_holidays"] = executor.submit(get_bank_holidays, DEFAULT_REGION)
+                executor.shutdown(wait=False)
+    return _warmup
+
+# ----------
+# PUBLIC API
+# ----------
+def logo_bytes():
+    return start_warmup()["logo"].result()
+
+def warm_bank_holidays(region=DEFAULT_REGION):
+    # Only the first caller in the process waits on the initial load; later ones hit the provider's memory tier
+    start_warmup()["bank_holidays"].result()
+    return get_bank_holidays(region)
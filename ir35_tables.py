@@ -0,0 +1,48 @@
+# ======================
+# IR35 TABLES
+# Plain HTML for the small fixed-shape result tables (no pandas or Styler)
+# ======================
+
+from functools import lru_cache
+from html import escape
+
+from ir35_profiling import timed
+
+TABLE_CLASS = "ir35-table"
+
+@lru_cache(maxsize=4)
+def table_css(header_colour, stripe_colour, background_colour):
+    return f"""
+            table.{TABLE_CLASS} {{
+                width: 100%;
+                border-collapse: collapse;
+                border: 1px solid {header_colour};
+                margin-bottom: 1rem;
+            }}
+            table.{TABLE_CLASS} th {{
+                background-color: {header_colour};
+                color: {background_colour};
+                text-align: left;
+                padding: 0.25rem 0.5rem;
+            }}
+            table.{TABLE_CLASS} td {{
+                text-align: left;
+                padding: 0.25rem 0.5rem;
+            }}
+            table.{TABLE_CLASS} tr:nth-child(odd) td {{
+                background-color: {background_colour};
+            }}
+            table.{TABLE_CLASS} tr:nth-child(even) td {{
+                background-color: {stripe_colour};
+            }}
+    """
+
+@timed("render_table")
+def render_table(rows, columns, title=""):
+    caption = f"<caption>{escape(title)}</caption>" if title else ""
+    header = "".join(f"<th>{escape(str(column))}</th>" for column in columns)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{escape(str(cell))}</td>" for cell in row) + "</tr>"
+        for row in rows
+    )
+    return f'<table class="{TABLE_CLASS}">{caption}<thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>'
@@ -0,0 +1,109 @@
+# ======================
+# IR35 TAX CONFIGURATION
+# Versioned tax year files (one per tax year and region), validated when loaded
+# ======================
+
+import json
+import re
+from numbers import Real
+from pathlib import Path
+
+# ----------
+# CONSTANTS
+# ----------
+TAX_YEAR_DIR = Path(__file__).resolve().parent / "data" / "tax_years"
+CONFIG_FORMAT = 1
+TAX_REGIONS = ("rUK", "Scotland")
+DEFAULT_TAX_REGION = "rUK"
+# Bank holiday division (bank_holidays.REGIONS) whose holidays a tax region's working days skip
+BANK_HOLIDAY_DIVISIONS = {"rUK": "england-and-wales", "Scotland": "scotland"}
+
+TAX_YEAR_PATTERN = re.compile(r"^(\d{4})/(\d{2})$")
+
+# Section -> fields every config must give as numbers; rates are fractions, the rest amounts in pounds
+REQUIRED_FIELDS = {
+    "income_tax": ("personal_allowance", "basic_rate_limit", "higher_rate_limit"),
+    "dividend_tax": ("allowance", "basic_rate", "higher_rate", "additional_rate"),
+    "national_insurance": (
+        "employee_primary_threshold", "employee_upper_earnings_limit", "employee_main_rate",
+        "employee_additional_rate", "employer_secondary_threshold", "employer_rate"
+    ),
+    "corporation_tax": ("small_profits_rate", "main_rate", "lower_limit", "upper_limit", "marginal_relief_fraction")
+}
+# Earnings bands: either the three rUK rates, or an explicit band list (Scotland's six rates)
+UK_RATE_FIELDS = ("basic_rate", "higher_rate", "additional_rate")
+
+# ----------
+# VALIDATION
+# ----------
+def _number(config, section, field, source):
+    value = config[section].get(field)
+    if isinstance(value, bool) or not isinstance(value, Real):
+        raise ValueError(f"{source}: {section}.{field} must be a number, got {value!r}")
+    if value < 0:
+        raise ValueError(f"{source}: {section}.{field} must not be negative")
+    if field.endswith("rate") or field == "marginal_relief_fraction":
+        if value > 1:
+            raise ValueError(f"{source}: {section}.{field} is a fraction, got {value}")
+    return value
+
+def _increasing(values, name, source):
+    if any(high <= low for low, high in zip(values, values[1:])):
+        raise ValueError(f"{source}: {name} must be strictly increasing, got {list(values)}")
+
+def validate_tax_year(config, source="tax year config"):
+    if config.get("format") != CONFIG_FORMAT:
+        raise ValueError(f"{source}: unsupported format {config.get('format')!r}, expected {CONFIG_FORMAT}")
+    match = TAX_YEAR_PATTERN.match(str(config.get("tax_year", "")))
+    if not match or (int(match[1]) + 1) % 100 != int(match[2]):
+        raise ValueError(f"{source}: tax_year must look like 2025/26, got {config.get('tax_year')!r}")
+    if config.get("region") not in TAX_REGIONS:
+        raise ValueError(f"{source}: region must be one of {', '.join(TAX_REGIONS)}, got {config.get('region')!r}")
+    label = f"{config['tax_year']} ({config['region']})"
+    if config.get("tax_year_label") != label:
+        raise ValueError(f"{source}: tax_year_label must be {label!r}, got {config.get('tax_year_label')!r}")
+
+    for section, fields in REQUIRED_FIELDS.items():
+        if not isinstance(config.get(section), dict):
+            raise ValueError(f"{source}: missing section {section}")
+        for field in fields:
+            _number(config, section, field, source)
+
+    income_tax = config["income_tax"]
+    _increasing(
+        [income_tax["personal_allowance"], income_tax["basic_rate_limit"], income_tax["higher_rate_limit"]],
+        "income_tax allowance and rate limits", source
+    )
+    if "bands" in income_tax:
+        bands = income_tax["bands"]
+        if not isinstance(bands, list) or not bands:
+            raise ValueError(f"{source}: income_tax.bands must be a non-empty list")
+        for position, band in enumerate(bands):
+            for field in ("threshold", "rate"):
+                _number({"band": band}, "band", field, f"{source}: income_tax.bands[{position}]")
+        _increasing([band["threshold"] for band in bands], "income_tax.bands thresholds", source)
+    else:
+        for field in UK_RATE_FIELDS:
+            _number(config, "income_tax", field, source)
+
+    ni = config["national_insurance"]
+    _increasing([ni["employee_primary_threshold"], ni["employee_upper_earnings_limit"]], "employee NI thresholds", source)
+    corporation_tax = config["corporation_tax"]
+    _increasing([corporation_tax["lower_limit"], corporation_tax["upper_limit"]], "corporation_tax limits", source)
+    return config
+
+# ----------
+# LOADING
+# ----------
+def load_tax_years(directory=TAX_YEAR_DIR):
+    tax_years = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, encoding="utf-8") as file:
+            config = validate_tax_year(json.load(file), path.name)
+        label = config["tax_year_label"]
+        if label in tax_years:
+            raise ValueError(f"{path.name}: duplicate tax year {label}")
+        tax_years[label] = config
+    if not tax_years:
+        raise ValueError(f"No tax year configs found in {directory}")
+    return dict(sorted(tax_years.items()))
@@ -0,0 +1,195 @@
+# ======================
+# IR35 TAX YEARS
+# Placements split at 6 April, each part taxed with its own year's bands and allowances
+# ======================
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from ir35_batch import (
+    PLACEMENT_DEFAULTS,
+    calculate_base_rate_batch,
+    calculate_employer_deductions_batch,
+    count_business_days,
+    calculate_margin_batch,
+    calculate_pay_rate_batch,
+    ir35_tax_calculator_batch,
+    tax_years_by_region
+)
+from ir35_core import (
+    calculate_working_days,
+    compile_tax_year,
+    ir35_tax_calculator,
+    outside_disclaimer,
+    tax_year_for,
+    tax_year_start
+)
+from ir35_results import tax_year_labels
+from ir35_tax_config import DEFAULT_TAX_REGION
+
+# Per-day rates, the same in every year of a placement; every other number is an amount for the year
+RATE_FIELDS = ("Base Rate", "Pay Rate", "Daily Rate")
+
+# ----------
+# PARTITIONING
+# ----------
+def tax_year_name(start_year):
+    return f"{start_year}/{(start_year + 1) % 100:02d}"
+
+def tax_year_segments(start_date, end_date):
+    segments = []
+    if start_date >= end_date:
+        return segments
+    segment_start = start_date
+    while segment_start <= end_date:
+        start_year = tax_year_start(segment_start)
+        next_start = date(start_year + 1, 4, 6)
+        segment_end = min(end_date, next_start - timedelta(days=1))
+        segments.append((start_year, segment_start, segment_end))
+        segment_start = next_start
+    return segments
+
+def segment_working_days(start_date, end_date, days_per_week, bank_holidays):
+    # A segment can be a single day (a contract ending on 6 April), which the range count treats as empty
+    if start_date == end_date:
+        return min(int(start_date.weekday() < 5 and start_date not in bank_holidays), days_per_week)
+    return calculate_working_days(start_date, end_date, days_per_week, bank_holidays)
+
+# ----------
+# SINGLE PLACEMENT
+# ----------
+def calculate_by_tax_year(pay_rate, start_date, end_date, days_per_week, bank_holidays, region=DEFAULT_TAX_REGION,
+                          **calculator_args):
+    years = []
+    # A placement that ends before it starts still gets one zero-day year, as calculate_placements gives it
+    segments = tax_year_segments(start_date, end_date) or [(tax_year_start(start_date), start_date, end_date)]
+    for start_year, segment_start, segment_end in segments:
+        working_days = 0
+        if start_date < end_date:
+            working_days = segment_working_days(segment_start, segment_end, days_per_week, bank_holidays)
+        config = tax_year_for(segment_start, region)
+        years.append({
+            "Tax Year": tax_year_name(start_year),
+            "Tax Year Config": config,
+            "Start Date": segment_start,
+            "End Date": segment_end,
+            "Working Days": working_days,
+            "Results": ir35_tax_calculator(pay_rate, working_days, tax_year=config, **calculator_args)
+        })
+    return {
+        "Tax Years": years,
+        "Working Days": sum(year["Working Days"] for year in years),
+        "Net Take-Home Pay": sum(year["Results"]["Net Take-Home Pay"] for year in years)
+    }
+
+def _sum_results(results):
+    combined = {}
+    for key, value in results[0].items():
+        if isinstance(value, dict):
+            combined[key] = _sum_results([result[key] for result in results])
+        elif key in RATE_FIELDS or isinstance(value, str):
+            combined[key] = value
+        else:
+            combined[key] = sum(result[key] for result in results)
+    return combined
+
+def combine_tax_years(split):
+    # One result dict for the whole placement, as ir35_tax_calculator gives it, that adds up to the split
+    years = split["Tax Years"]
+    combined = _sum_results([year["Results"] for year in years])
+    if "Disclaimer" in combined:
+        combined["Disclaimer"] = outside_disclaimer(" and ".join(dict.fromkeys(year["Tax Year Config"] for year in years)))
+    return combined
+
+# ----------
+# BULK PLACEMENTS
+# ----------
+def segment_working_days_batch(start_dates, end_dates, start_year, days_per_week, bank_holidays,
+                               tax_region=DEFAULT_TAX_REGION):
+    year_start = np.datetime64(date(start_year, 4, 6), "D")
+    year_end = np.datetime64(date(start_year + 1, 4, 5), "D")
+    segment_start = np.maximum(start_dates, year_start)
+    segment_end = np.minimum(end_dates, year_end)
+    in_year = (start_dates < end_dates) & (segment_start <= segment_end)
+    weekdays = count_business_days(
+        segment_start, np.where(in_year, segment_end + np.timedelta64(1, "D"), segment_start), bank_holidays, tax_region
+    )
+    full_weeks, remaining_days = np.divmod(weekdays, 5)
+    working_days = (full_weeks * days_per_week) + np.minimum(remaining_days, days_per_week)
+    return in_year, segment_start, segment_end, np.where(in_year, working_days, 0)
+
+def calculate_placements_by_tax_year(df, bank_holidays):
+    import pandas as pd
+
+    columns = {key: np.broadcast_to(df[key].to_numpy() if key in df else value, len(df))
+               for key, value in PLACEMENT_DEFAULTS.items()}
+    start_dates = df["start_date"].to_numpy(dtype="datetime64[D]")
+    end_dates = df["end_date"].to_numpy(dtype="datetime64[D]")
+    client_rate = df["client_rate"].to_numpy(dtype=float)
+    base_rate = calculate_base_rate_batch(client_rate, columns["margin_percent"])
+    pay_rate = calculate_pay_rate_batch(base_rate, columns["status"])
+    inside = np.asarray(columns["status"], dtype=object) == "Inside IR35"
+    if not len(df):
+        return df.assign(**{"Tax Year": [], "Tax Year Config": []})
+
+    # Placements that end before they start get one zero-day row in the tax year they start in, so the split
+    # emits every row calculate_placements does
+    start_years = start_dates.astype("datetime64[Y]").astype(int) + 1970
+    april = ((start_years - 1970).astype("datetime64[Y]").astype("datetime64[M]") + 3).astype("datetime64[D]")
+    start_years -= start_dates < april + 5
+    empty = start_dates >= end_dates
+
+    frames = []
+    first_year = int(start_years.min())
+    last_year = max(tax_year_start(pd.Timestamp(end_dates.max()).date()), int(start_years.max()))
+    for start_year in range(first_year, last_year + 1):
+        in_year, segment_start, segment_end, working_days = segment_working_days_batch(
+            start_dates, end_dates, start_year, columns["days_per_week"], bank_holidays, columns["tax_region"]
+        )
+        in_year |= empty & (start_years == start_year)
+        if not in_year.any():
+            continue
+        rows = np.flatnonzero(in_year)
+        day = date(start_year, 4, 6)
+        configs = tax_years_by_region(
+            columns["tax_region"][rows], lambda region: compile_tax_year(tax_year_for(day, region))
+        )
+        results = ir35_tax_calculator_batch(
+            pay_rate[rows],
+            working_days[rows],
+            columns["employee_pension"][rows],
+            columns["student_loan"][rows],
+            columns["status"][rows],
+            columns["vat_registered"][rows],
+            columns["allowable_expenses"][rows],
+            columns["outside_salary"][rows],
+            columns["employer_pension_percent"][rows],
+            columns["outside_business_type"][rows],
+            tax_year=configs
+        )
+        margin = calculate_margin_batch(client_rate[rows], base_rate[rows], working_days[rows])
+        deductions = calculate_employer_deductions_batch(
+            base_rate[rows], working_days[rows], columns["employer_pension_percent"][rows]
+        )
+        deductions = {key: np.where(inside[rows], value, np.nan) for key, value in deductions.items()}
+        index = df.index[rows]
+        frames.append(pd.concat([
+            df.iloc[rows],
+            pd.DataFrame({
+                "Tax Year": tax_year_name(start_year),
+                "Tax Year Config": tax_year_labels(configs, rows.shape),
+                "Segment Start": segment_start[rows],
+                "Segment End": segment_end[rows],
+                "Base Rate": base_rate[rows],
+                "Pay Rate": pay_rate[rows],
+                **results,
+                **margin,
+                **deductions
+            }, index=index)
+        ], axis=1))
+
+    # One row per placement and tax year, placements kept in input order
+    combined = pd.concat(frames)
+    order = np.argsort(df.index.get_indexer(combined.index), kind="stable")
+    return combined.iloc[order]
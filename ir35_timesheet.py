@@ -0,0 +1,287 @@
+# ======================
+# IR35 TIMESHEETS
+# Payslip-style PAYE from a stream of timesheet entries: each contractor keeps year-to-date totals,
+# and every closed tax week adds one payslip instead of rerunning ir35_tax_calculator
+#
+#   python ir35_timesheet.py contractors.csv timesheets.csv payslips.csv
+# ======================
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from ir35_batch import STUDENT_LOAN_PLANS
+from ir35_core import (
+    calculate_base_rate,
+    calculate_pay_rate,
+    compile_tax_year,
+    tax_year_for,
+    tax_year_start
+)
+from ir35_tax_config import DEFAULT_TAX_REGION, TAX_REGIONS
+
+# ----------
+# CONSTANTS
+# ----------
+# Timesheet dates are whole days since the Unix epoch, as numpy datetime64[D] stores them
+EPOCH = date(1970, 1, 1)
+WEEKS_PER_YEAR = 52
+
+CONTRACTOR_DEFAULTS = {
+    "margin_percent": 23.0,
+    "employee_pension": 5.0,
+    "student_loan": "None",
+    "tax_region": DEFAULT_TAX_REGION,
+    "hours_per_day": 7.5
+}
+
+# Numeric columns when contractors and timesheets are read from CSV; ids, dates and plans are text
+CONTRACTOR_TYPES = {
+    "pay_rate": "float64",
+    "client_rate": "float64",
+    "margin_percent": "float64",
+    "employee_pension": "float64",
+    "hours_per_day": "float64"
+}
+TIMESHEET_TYPES = {"days": "float64", "hours": "float64"}
+
+PAYSLIP_FIELDS = [
+    "Contractor",
+    "Tax Year",
+    "Tax Week",
+    "Week Start",
+    "Days",
+    "Gross Pay",
+    "Employee Pension",
+    "Taxable Pay",
+    "Income Tax",
+    "Employee NI",
+    "Student Loan Repayment",
+    "Net Pay",
+    "Gross Pay YTD",
+    "Taxable Pay YTD",
+    "Income Tax YTD",
+    "Employee NI YTD",
+    "Student Loan YTD",
+    "Net Pay YTD"
+]
+
+# ----------
+# LEDGERS
+# ----------
+def _epoch_day(day):
+    return (day - EPOCH).days
+
+class ContractorLedger:
+    __slots__ = (
+        "contractor", "pay_rate", "pension_rate", "student_loan", "tax_region", "hours_per_day",
+        "bands", "year_start", "year_end", "week", "week_start", "week_end", "days", "ytd"
+    )
+
+    def __init__(self, contractor, pay_rate, employee_pension=5.0, student_loan="None",
+                 tax_region=DEFAULT_TAX_REGION, hours_per_day=7.5):
+        if tax_region not in TAX_REGIONS:
+            raise ValueError(f"Unknown tax region for contractor {contractor}: {tax_region}")
+        if student_loan != "None" and student_loan not in STUDENT_LOAN_PLANS:
+            raise ValueError(f"Unknown student loan plan for contractor {contractor}: {student_loan}")
+        if hours_per_day <= 0:
+            raise ValueError(f"Hours per day for contractor {contractor} must be positive: {hours_per_day}")
+        self.contractor = contractor
+        self.pay_rate = pay_rate
+        self.pension_rate = employee_pension / 100
+        self.student_loan = STUDENT_LOAN_PLANS.get(student_loan)
+        self.tax_region = tax_region
+        self.hours_per_day = hours_per_day
+        self.bands = None
+        self.year_start = None
+        self.year_end = None
+        # No open week until the first entry; day numbers compare below any real date
+        self.week = 0
+        self.week_start = self.week_end = -1
+        self.days = 0.0
+        self.ytd = [0.0] * 6
+
+    def add(self, day, days=0.0, hours=0.0):
+        # Constant work per entry: a range check while the week is open, one payslip when it closes
+        days = days + hours / self.hours_per_day
+        if self.week_start <= day <= self.week_end:
+            self.days += days
+            return None
+        if day < self.week_start:
+            raise ValueError(
+                f"Timesheet entries for contractor {self.contractor} must be in date order: "
+                f"{EPOCH + timedelta(days=day)} is before {EPOCH + timedelta(days=self.week_start)}"
+            )
+        payslip = self.close()
+        self._open_week(day)
+        self.days = days
+        return payslip
+
+    def _open_week(self, day):
+        if self.year_end is None or day > self.year_end:
+            start = EPOCH + timedelta(days=day)
+            start_year = tax_year_start(start)
+            self.year_start = _epoch_day(date(start_year, 4, 6))
+            self.year_end = _epoch_day(date(start_year + 1, 4, 5))
+            self.bands = compile_tax_year(tax_year_for(start, self.tax_region))
+            self.ytd = [0.0] * 6
+        self.week = (day - self.year_start) // 7 + 1
+        self.week_start = self.year_start + ((self.week - 1) * 7)
+        self.week_end = min(self.week_start + 6, self.year_end)
+
+    def close(self):
+        if not self.week:
+            return None
+        bands = self.bands
+        gross = self.pay_rate * self.days
+        pension = gross * self.pension_rate
+        taxable = gross - pension
+        ytd = self.ytd
+        ytd[0] += gross
+        ytd[1] += taxable
+
+        # PAYE is cumulative: tax due to date on taxable pay to date, against the allowance and bands earned so
+        # far (week n of 52). Scaling every threshold by a fraction scales the tax by it too, so the annual
+        # band table serves every week. A week that brings the total down gives a refund.
+        fraction = min(self.week, WEEKS_PER_YEAR) / WEEKS_PER_YEAR
+        income_tax = (fraction * bands.income_tax.tax(ytd[1] / fraction)) - ytd[2]
+        # NI and student loan are per pay period: the weekly share of the annual thresholds
+        employee_ni = bands.employee_ni.tax(gross * WEEKS_PER_YEAR) / WEEKS_PER_YEAR
+        student_loan = 0.0
+        if self.student_loan is not None:
+            threshold, rate = self.student_loan
+            student_loan = max(0.0, gross - (threshold / WEEKS_PER_YEAR)) * rate
+        net = taxable - income_tax - employee_ni - student_loan
+        ytd[2] += income_tax
+        ytd[3] += employee_ni
+        ytd[4] += student_loan
+        ytd[5] += net
+
+        # Raw values in PAYSLIP_FIELDS order; payslip_frame rounds days and pounds to two places and writes the week start as a date
+        payslip = (
+            self.contractor, bands.label, self.week, self.week_start, self.days, gross, pension, taxable,
+            income_tax, employee_ni, student_loan, net, *ytd
+        )
+        # An empty range, so a later entry in the same week reopens it rather than adding to a closed one
+        self.week = 0
+        self.week_end = self.week_start - 1
+        self.days = 0.0
+        return payslip
+
+    def year_to_date(self):
+        # Closed weeks only; the open week is added when it closes
+        return dict(zip(PAYSLIP_FIELDS[-6:], (round(total, 2) for total in self.ytd)))
+
+class TimesheetLedger:
+    def __init__(self, contractors):
+        self.contractors = contractors
+        self.entries = 0
+
+    @classmethod
+    def from_frame(cls, df):
+        columns = {key: df[key].to_numpy() if key in df else [value] * len(df) for key, value in CONTRACTOR_DEFAULTS.items()}
+        if "pay_rate" in df:
+            pay_rate = df["pay_rate"].to_numpy(dtype=float)
+        else:
+            # The same rates a placement derives: client rate less margin, less employer costs
+            pay_rate = [
+                calculate_pay_rate(calculate_base_rate(client_rate, margin))
+                for client_rate, margin in zip(df["client_rate"].to_numpy(dtype=float), columns["margin_percent"])
+            ]
+        contractors = {}
+        # Ids are matched as text, so a CSV and a Parquet file with the same ids line up
+        for row, contractor in enumerate(df["contractor_id"].astype(str).tolist()):
+            if contractor in contractors:
+                raise ValueError(f"Duplicate contractor {contractor}")
+            contractors[contractor] = ContractorLedger(
+                contractor, float(pay_rate[row]), float(columns["employee_pension"][row]),
+                columns["student_loan"][row], columns["tax_region"][row], float(columns["hours_per_day"][row])
+            )
+        return cls(contractors)
+
+    def ledger(self, contractor):
+        try:
+            return self.contractors[contractor]
+        except KeyError:
+            raise ValueError(f"Unknown contractor in timesheet: {contractor}") from None
+
+    def add(self, contractor, day, days=0.0, hours=0.0):
+        self.entries += 1
+        return self.ledger(str(contractor)).add(_epoch_day(day), days, hours)
+
+    def add_chunk(self, chunk):
+        # Columns are converted once per chunk; each entry is then a dict lookup and the ledger's range check
+        length = len(chunk)
+        days = chunk["days"].fillna(0).to_numpy(dtype=float) if "days" in chunk else np.zeros(length)
+        hours = chunk["hours"].fillna(0).to_numpy(dtype=float) if "hours" in chunk else np.zeros(length)
+        dates = chunk["date"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+        payslips = []
+        contractors = self.contractors
+        for contractor, day, day_count, hour_count in zip(
+            chunk["contractor_id"].astype(str).tolist(), dates.tolist(), days.tolist(), hours.tolist()
+        ):
+            ledger = contractors.get(contractor) or self.ledger(contractor)
+            payslip = ledger.add(day, day_count, hour_count)
+            if payslip is not None:
+                payslips.append(payslip)
+        self.entries += length
+        return payslips
+
+    def close(self):
+        # Closes every open week, e.g. at the end of a run
+        return [payslip for payslip in (ledger.close() for ledger in self.contractors.values()) if payslip is not None]
+
+def payslip_frame(payslips):
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(payslips, columns=PAYSLIP_FIELDS)
+    # A plain ISO date, as the placement exports write theirs, not a midnight timestamp
+    frame["Week Start"] = np.datetime_as_string(frame["Week Start"].to_numpy(dtype="datetime64[D]"), unit="D")
+    amounts = PAYSLIP_FIELDS[4:]
+    frame[amounts] = frame[amounts].round(2)
+    return frame
+
+# ----------
+# COMMAND LINE
+# ----------
+def run(contractors_path, timesheet_path, output_path, chunk_size=None):
+    import pandas as pd
+
+    from ir35_bulk import DEFAULT_CHUNK_SIZE, ChunkWriter, read_chunks
+
+    start = time.perf_counter()
+    contractors = pd.concat(read_chunks(contractors_path, DEFAULT_CHUNK_SIZE, CONTRACTOR_TYPES), ignore_index=True)
+    ledger = TimesheetLedger.from_frame(contractors)
+    writer = ChunkWriter(output_path)
+    try:
+        for chunk in read_chunks(timesheet_path, chunk_size or DEFAULT_CHUNK_SIZE, TIMESHEET_TYPES):
+            payslips = ledger.add_chunk(chunk)
+            if payslips:
+                writer.write(payslip_frame(payslips))
+        payslips = ledger.close()
+        if payslips:
+            writer.write(payslip_frame(payslips))
+    finally:
+        writer.close()
+    return ledger.entries, writer.rows, time.perf_counter() - start
+
+def main(argv=None):
+    from ir35_bulk import DEFAULT_CHUNK_SIZE
+
+    parser = argparse.ArgumentParser(description="Weekly payslips with year-to-date PAYE and NI from timesheet entries.")
+    parser.add_argument("contractors", help="Contractor terms (.csv or .parquet): contractor_id and pay_rate or client_rate")
+    parser.add_argument("timesheets", help="Timesheet entries (.csv or .parquet): contractor_id, date, days and/or hours")
+    parser.add_argument("output", help="Payslips file (.csv or .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Timesheet rows per chunk")
+    args = parser.parse_args(argv)
+
+    entries, payslips, seconds = run(args.contractors, args.timesheets, args.output, args.chunk_size)
+    print(f"Entries: {entries}", file=sys.stderr)
+    print(f"Payslips: {payslips}", file=sys.stderr)
+    print(f"Throughput: {entries / seconds:,.0f} entries/s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
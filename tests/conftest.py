@@ -0,0 +1,23 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# Before bank_holidays and ir35_cache are imported: no test reads or writes the user's cache
+os.environ["IR35_CACHE_DIR"] = tempfile.mkdtemp(prefix="ir35-tests-")
+
+import bank_holidays
+
+def _offline(timeout=None):
+    raise ConnectionError("tests never fetch from gov.uk")
+
+@pytest.fixture(autouse=True, scope="session")
+def offline_bank_holidays():
+    # With no disk cache and no network, the provider falls back to the packaged snapshot
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(bank_holidays, "fetch_bank_holidays", _offline)
+        yield
@@ -0,0 +1,110 @@
+# ======================
+# GOLDEN CASES
+# Built with whichever calculator is passed in: the tests run them against the current modules,
+# tests/update_golden.py against the calculator as it was at the baseline commit
+# ======================
+
+import hashlib
+import json
+import re
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+GOLDEN_PATH = ROOT / "tests" / "golden.json"
+TAX_YEARS_PATH = ROOT / "tests" / "tax_years.json"
+SNAPSHOT_PATH = ROOT / "data" / "bank_holidays.json"
+STUDENT_LOAN_PLANS = ["None", "Plan 1", "Plan 2", "Plan 4", "Plan 5", "Postgraduate Loan"]
+
+# The packaged snapshot, not the live provider, so golden values never depend on gov.uk
+with open(SNAPSHOT_PATH, encoding="utf-8") as f:
+    HOLIDAYS = frozenset(date.fromisoformat(event["date"]) for event in json.load(f)["england-and-wales"]["events"])
+
+# ----------
+# CASES
+# ----------
+def working_days_cases(calculator):
+    ranges = [
+        ("2025-04-06", "2026-04-05", 5), ("2025-04-06", "2026-04-05", 3), ("2025-12-20", "2026-01-05", 5),
+        ("2025-05-01", "2025-05-01", 5), ("2025-06-10", "2025-06-01", 5), ("2024-01-01", "2027-12-31", 4),
+        ("2025-03-28", "2025-04-22", 2), ("2026-08-01", "2026-08-31", 5)
+    ]
+    return {
+        f"{start}..{end}@{days}": calculator.calculate_working_days(
+            date.fromisoformat(start), date.fromisoformat(end), days, HOLIDAYS
+        )
+        for start, end, days in ranges
+    }
+
+def inside_cases(calculator):
+    cases = {}
+    for pay_rate in (0, 40, 57.1, 228.5, 350, 520, 850, 1400):
+        for plan in STUDENT_LOAN_PLANS:
+            for pension in (0, 5):
+                cases[f"{pay_rate}|{plan}|{pension}"] = calculator.ir35_tax_calculator(
+                    pay_rate, 220, pension, plan, "Inside IR35"
+                )
+    return cases
+
+def outside_cases(calculator):
+    cases = {}
+    for pay_rate in (100, 300, 616, 1200, 2500):
+        for salary in (0, 9100, 12570, 30000):
+            for vat, expenses in ((False, 0.0), (True, 2500.0)):
+                for plan in ("None", "Plan 2"):
+                    results = calculator.ir35_tax_calculator(pay_rate, 220, 0, plan, "Outside IR35", vat, expenses, salary)
+                    cases[f"{pay_rate}|{salary}|{vat}|{expenses}|{plan}"] = {
+                        key: value for key, value in results.items() if key != "Disclaimer"
+                    }
+    return cases
+
+def dividend_tax_cases(calculator):
+    return {
+        f"{salary}|{dividends}": calculator.calculate_dividend_tax(salary, dividends)
+        for salary in (0, 9100, 12570, 30000, 60000, 130000)
+        for dividends in (0, 400, 5000, 37700, 40000, 120000, 200000)
+    }
+
+def corporation_tax_cases(calculator):
+    return {
+        str(profit): calculator.calculate_corporation_tax(profit)
+        for profit in (-1000, 0, 1, 49999, 50000, 50001, 120000, 249999, 250000, 250001, 1000000)
+    }
+
+def pdf_digest(data):
+    # CreationDate is the only time-dependent field; it has a fixed width, so offsets are unaffected
+    return hashlib.sha256(re.sub(rb"/CreationDate \(D:\d{14}\)", b"/CreationDate (D:00000000000000)", data)).hexdigest()
+
+def pdf_cases(calculator):
+    cases = {}
+    for status in ("Inside IR35", "Outside IR35"):
+        scenario = calculator.calculate_scenario("Client Rate", 800, 20, 220, status, student_loan_plan="Plan 2")
+        cases[status] = pdf_digest(calculator.generate_pdf(
+            scenario["Results"], "Client Rate", scenario["Client Rate"], scenario["Base Rate"], scenario["Pay Rate"],
+            scenario["Margin"], scenario["Employer Deductions"], status
+        ))
+    return cases
+
+GOLDEN_CASES = {
+    "calculate_working_days": working_days_cases,
+    "ir35_tax_calculator (Inside IR35)": inside_cases,
+    "ir35_tax_calculator (Outside IR35)": outside_cases,
+    "calculate_dividend_tax": dividend_tax_cases,
+    "calculate_corporation_tax": corporation_tax_cases,
+    "generate_pdf": pdf_cases
+}
+
+def tax_year_cases(calculator, tax_years):
+    # Every configured tax year and region, so a data file edit shows up as a changed value
+    cases = {}
+    for label in tax_years:
+        for pay_rate in (57.1, 150, 300, 520, 850, 1400):
+            for status in ("Inside IR35", "Outside IR35"):
+                results = calculator.ir35_tax_calculator(pay_rate, 220, 5, "Plan 2", status, tax_year=label)
+                cases[f"{label}|{pay_rate}|{status}"] = {
+                    key: value for key, value in results.items() if key != "Disclaimer"
+                }
+    return cases
+
+def normalise(value):
+    return json.loads(json.dumps(value, default=float))
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+from ir35_api import INLINE_BATCH_ROWS, app
+from ir35_core import calculate_scenario, regional_tax_year
+
+PLACEMENT = {"client_rate": 500, "start_date": "2025-04-06", "end_date": "2026-01-01"}
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def test_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+def test_calculate_matches_scenario(client):
+    response = client.post("/calculate", json={"rate": 800, "margin_percent": 20, "working_days": 200})
+    assert response.status_code == 200
+    expected = calculate_scenario("Client Rate", 800, 20, 200, tax_year=regional_tax_year("rUK").label)
+    assert response.json() == json.loads(json.dumps(expected))
+
+def test_working_days_follow_tax_region(client):
+    body = {"rate": 800, "start_date": "2025-01-01", "end_date": "2025-12-31"}
+    england = client.post("/calculate", json=body).json()["Working Days"]
+    scotland = client.post("/calculate", json={**body, "tax_region": "Scotland"}).json()["Working Days"]
+    assert (england, scotland) == (253, 252)
+
+@pytest.mark.parametrize("path", ["/calculate", "/compare", "/pdf", "/batch"])
+@pytest.mark.parametrize("body", ["text", 5, None])
+def test_non_object_body_is_a_400(client, path, body):
+    response = client.post(path, json=body)
+    assert response.status_code == 400
+    assert "Invalid request" in response.json()["error"]
+
+@pytest.mark.parametrize("path", ["/calculate", "/compare", "/pdf"])
+def test_list_body_is_a_400_outside_batch(client, path):
+    assert client.post(path, json=[]).status_code == 400
+
+def test_malformed_json_is_a_400(client):
+    response = client.post("/calculate", content=b"{", headers={"content-type": "application/json"})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("extra, message", [
+    ({"calculation_mode": "Day Rate"}, "Unknown calculation mode"),
+    ({"student_loan": "Plan 9"}, "Unknown student loan plan"),
+    ({"status": "Outside IR35", "outside_business_type": "Sole Trader"}, "Unknown business type"),
+    ({"status": "Maybe"}, "Unknown IR35 status"),
+    ({"rate": -1}, "rate must be positive"),
+    ({"margin_percent": 100}, "margin_percent"),
+    ({"tax_region": "Wales"}, "Unknown tax region")
+])
+def test_calculate_rejects_bad_inputs(client, extra, message):
+    response = client.post("/calculate", json={"rate": 500, "working_days": 200, **extra})
+    assert response.status_code == 400
+    assert message in response.json()["error"]
+
+def test_calculate_rejects_missing_rate_and_reversed_dates(client):
+    assert client.post("/calculate", json={"working_days": 200}).status_code == 400
+    response = client.post("/calculate", json={"rate": 500, "start_date": "2025-06-01", "end_date": "2025-05-01"})
+    assert response.status_code == 400
+
+def test_compare_validates_choices(client):
+    body = {"inside_pay_rate": 400, "outside_base_rate": 500, "working_days": 200}
+    assert client.post("/compare", json=body).status_code == 200
+    response = client.post("/compare", json={**body, "outside_student_loan": "X"})
+    assert response.status_code == 400
+    assert "Unknown student loan plan" in response.json()["error"]
+
+def test_pdf(client):
+    response = client.post("/pdf", json={"rate": 800, "working_days": 200})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+
+@pytest.mark.parametrize("body", [[PLACEMENT], {"placements": [PLACEMENT]}])
+def test_batch_accepts_list_or_object(client, body):
+    response = client.post("/batch", json=body)
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["client_rate"] == 500
+
+@pytest.mark.parametrize("extra, message", [
+    ({"outside_business_type": "Sole Trader"}, "Unknown business type"),
+    ({"end_date": "2025-01-01"}, "end_date must be after start_date"),
+    ({"end_date": "2025-04-06"}, "end_date must be after start_date"),
+    ({"days_per_week": 6}, "days_per_week"),
+    ({"client_rate": 0}, "client_rate must be positive")
+])
+def test_batch_rejects_bad_placements(client, extra, message):
+    response = client.post("/batch", json=[PLACEMENT, {**PLACEMENT, **extra}])
+    assert response.status_code == 400
+    assert response.json()["error"].startswith("Invalid request: placement 1:")
+    assert message in response.json()["error"]
+
+def test_batch_rejects_missing_fields_and_non_list(client):
+    response = client.post("/batch", json=[{"client_rate": 1}])
+    assert response.status_code == 400
+    assert "missing start_date, end_date" in response.json()["error"]
+    assert client.post("/batch", json={"placements": 5}).status_code == 400
+
+def test_large_batch_streams_in_order(client):
+    placements = [{**PLACEMENT, "client_rate": 400 + index} for index in range(INLINE_BATCH_ROWS + 100)]
+    response = client.post("/batch", json={"placements": placements})
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["client_rate"] for row in rows] == [placement["client_rate"] for placement in placements]
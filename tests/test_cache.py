@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import ir35_cache
+from golden_cases import HOLIDAYS
+from ir35_bulk import run
+from ir35_cache import ROW_OVERHEAD_BYTES, ResultCache, chunk_digest, run_context
+
+def table(rows, offset=0):
+    return pa.table({"Client Rate": [float(offset + row) for row in range(rows)]})
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite")
+    yield cache
+    cache.close()
+
+def test_put_then_get_round_trips(cache):
+    assert cache.get("a") is None
+    cache.put("a", table(10))
+    assert cache.get("a").equals(table(10))
+    assert (cache.stats["Hits"], cache.stats["Misses"], cache.stats["Writes"]) == (1, 1, 1)
+    assert cache.report()["Chunks"] == 1
+
+def test_size_tracks_replaced_chunks(cache):
+    cache.put("a", table(10))
+    first = cache.size_bytes()
+    cache.put("a", table(10))
+    assert cache.size_bytes() == first
+    cache.put("b", table(10))
+    assert cache.size_bytes() == 2 * first
+    stored = cache.connection.execute("SELECT SUM(size) FROM results").fetchone()[0]
+    assert cache.size_bytes() == stored
+    assert first > ROW_OVERHEAD_BYTES
+
+def test_reopen_keeps_chunks(tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite")
+    cache.put("a", table(10))
+    cache.close()
+    cache = ResultCache(tmp_path / "results.sqlite")
+    assert cache.get("a").equals(table(10))
+    assert cache.stats["Invalidations"] == 0
+    cache.close()
+
+@pytest.mark.parametrize("patch", [
+    lambda monkeypatch: monkeypatch.setattr(ir35_cache, "CACHE_FORMAT", ir35_cache.CACHE_FORMAT + 1),
+    lambda monkeypatch: monkeypatch.setattr(ir35_cache, "TAX_YEARS", {})
+])
+def test_changed_config_invalidates(tmp_path, monkeypatch, patch):
+    cache = ResultCache(tmp_path / "results.sqlite")
+    cache.put("a", table(10))
+    cache.close()
+    patch(monkeypatch)
+    cache = ResultCache(tmp_path / "results.sqlite")
+    assert cache.stats["Invalidations"] == 1
+    assert cache.get("a") is None
+    assert cache.size_bytes() == 0
+    cache.close()
+
+def test_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    probe = ResultCache(tmp_path / "probe.sqlite")
+    probe.put("a", table(100))
+    size = probe.size_bytes()
+    probe.close()
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(ir35_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    # Room for three chunks; the fourth frees down to EVICT_TO of the limit, which takes two
+    cache = ResultCache(tmp_path / "results.sqlite", max_bytes=(3 * size) + 1)
+    for digest in "abc":
+        cache.put(digest, table(100))
+    monkeypatch.setattr(ir35_cache, "RECENCY_SECONDS", 0)
+    assert cache.get("a") is not None
+    cache.put("d", table(100))
+    assert cache.stats["Evictions"] == 2
+    assert [cache.get(digest) is not None for digest in "abcd"] == [True, False, False, True]
+    assert cache.size_bytes() == 2 * size <= cache.max_bytes * ir35_cache.EVICT_TO
+    cache.close()
+
+def test_clear_empties_the_cache(cache):
+    cache.put("a", table(10))
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.size_bytes() == 0
+
+def test_chunk_digest_follows_inputs_and_context(cache):
+    chunk = pd.DataFrame({"client_rate": [500.0, 600.0], "start_date": ["2025-04-06", "2025-05-01"]})
+    context = run_context(cache, HOLIDAYS, False)
+    digest = chunk_digest(chunk, context)
+    assert chunk_digest(chunk.copy(), context) == digest
+    assert chunk_digest(chunk.assign(client_rate=[500.0, 601.0]), context) != digest
+    assert chunk_digest(chunk, run_context(cache, HOLIDAYS, True)) != digest
+    assert chunk_digest(chunk, run_context(cache, set(HOLIDAYS) - {min(HOLIDAYS)}, False)) != digest
+
+def test_rerun_is_served_from_cache(tmp_path, cache):
+    source = str(tmp_path / "placements.csv")
+    pd.DataFrame({
+        "client_rate": [400.0 + index for index in range(50)],
+        "start_date": ["2025-04-06"] * 50,
+        "end_date": ["2026-01-01"] * 50
+    }).to_csv(source, index=False)
+    outputs = []
+    for name in ("first", "second"):
+        output = str(tmp_path / f"{name}.csv")
+        rows, _ = run(source, output, chunk_size=20, workers=0, region="england-and-wales", cache=cache)
+        assert rows == 50
+        with open(output, encoding="utf-8") as f:
+            outputs.append(f.read())
+    assert outputs[0] == outputs[1]
+    assert (cache.stats["Misses"], cache.stats["Hits"], cache.stats["Writes"]) == (3, 3, 3)
@@ -0,0 +1,181 @@
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from golden_cases import HOLIDAYS, STUDENT_LOAN_PLANS
+from ir35_batch import (
+    calculate_margin_batch,
+    calculate_placements,
+    calculate_working_days_batch,
+    ir35_tax_calculator_batch,
+    round_decimals
+)
+from ir35_bulk import ChunkWriter, read_chunks
+from ir35_core import TAX_YEARS, calculate_margin, calculate_scenario, calculate_working_days, ir35_tax_calculator
+from ir35_solver import solve_client_rate, solve_client_rate_batch
+from ir35_tax_years import calculate_by_tax_year, calculate_placements_by_tax_year
+
+SEED = 35
+SAMPLES = 2000
+
+# ----------
+# SCALAR REFERENCES
+# ----------
+def reference_working_days(start_date, end_date, days_per_week, bank_holidays):
+    if start_date >= end_date:
+        return 0
+    working_days = sum(
+        1 for day in range((end_date - start_date).days + 1)
+        if (start_date + timedelta(days=day)).weekday() < 5 and start_date + timedelta(days=day) not in bank_holidays
+    )
+    return ((working_days // 5) * days_per_week) + min(working_days % 5, days_per_week)
+
+def reference_inside_taxes(annual_income, pension_contribution_percent):
+    # The 2025/26 rUK thresholds exactly as the original calculator hardcoded them
+    taxable_income = annual_income - (annual_income * (pension_contribution_percent / 100))
+    if taxable_income <= 12570:
+        income_tax = 0
+    elif taxable_income <= 50270:
+        income_tax = (taxable_income - 12570) * 0.2
+    elif taxable_income <= 125140:
+        income_tax = (50270 - 12570) * 0.2 + (taxable_income - 50270) * 0.4
+    else:
+        income_tax = (50270 - 12570) * 0.2 + (125140 - 50270) * 0.4 + (taxable_income - 125140) * 0.45
+    if annual_income <= 12570:
+        ni_contribution = 0
+    elif annual_income <= 50270:
+        ni_contribution = (annual_income - 12570) * 0.08
+    else:
+        ni_contribution = (50270 - 12570) * 0.08 + (annual_income - 50270) * 0.02
+    return round(income_tax), round(ni_contribution)
+
+def random_rows(rng, count):
+    return [
+        (rng.uniform(0, 3000), rng.randint(0, 300), rng.choice([0, 5]), rng.choice(STUDENT_LOAN_PLANS),
+         rng.choice(["Inside IR35", "Outside IR35"]), rng.random() < 0.3, rng.choice([0.0, 1500.0]),
+         rng.choice([0.0, 9100.0, 12570.0, 40000.0]), rng.choice([0.0, 3.0]))
+        for _ in range(count)
+    ]
+
+def batch_columns(rows):
+    return [np.array(column, dtype=object if index in (3, 4) else None) for index, column in enumerate(zip(*rows))]
+
+def random_placements(rng, count):
+    starts = [date(2023, 1, 1) + timedelta(days=rng.randint(0, 1500)) for _ in range(count)]
+    ends = [start + timedelta(days=rng.randint(-10, 900)) for start in starts]
+    return pd.DataFrame({
+        "client_rate": [rng.uniform(200, 1500) for _ in starts],
+        "start_date": [start.isoformat() for start in starts],
+        "end_date": [end.isoformat() for end in ends],
+        "status": [rng.choice(["Inside IR35", "Outside IR35"]) for _ in starts]
+    })
+
+# ----------
+# CALCULATOR
+# ----------
+def test_inside_bands_match_hardcoded_thresholds():
+    rng = random.Random(SEED)
+    for _ in range(SAMPLES):
+        pay_rate, pension = rng.uniform(0, 3000), rng.choice([0, 3, 5, 8.5])
+        results = ir35_tax_calculator(pay_rate, 220, pension, "None", "Inside IR35")
+        assert (results["Income Tax"], results["Employee NI"]) == reference_inside_taxes(pay_rate * 220, pension)
+
+def test_batch_matches_scalar():
+    rows = random_rows(random.Random(SEED), SAMPLES)
+    batch = ir35_tax_calculator_batch(*batch_columns(rows))
+    for index, row in enumerate(rows):
+        scalar = ir35_tax_calculator(*row)
+        flat = {**scalar, **scalar.get("Company Breakdown", {})}
+        flat.update({key: value for key, value in scalar.get("Personal Breakdown", {}).items() if key == "Dividend Tax"})
+        for key, value in flat.items():
+            if key in batch and isinstance(value, (int, float)):
+                assert batch[key][index] == pytest.approx(value, rel=0, abs=1e-6), (key, row)
+
+def test_mixed_tax_years_match_scalar():
+    rng = random.Random(SEED)
+    rows = random_rows(rng, SAMPLES)
+    labels = [rng.choice(list(TAX_YEARS)) for _ in rows]
+    batch = ir35_tax_calculator_batch(*batch_columns(rows), tax_year=np.array(labels, dtype=object))
+    for index, (row, label) in enumerate(zip(rows, labels)):
+        assert batch["Net Take-Home Pay"][index] == ir35_tax_calculator(*row, tax_year=label)["Net Take-Home Pay"]
+
+def test_margin_batch_rounds_like_scalar():
+    # Percentages next to a tie, where np.round(x, 1) and round(x, 1) disagree
+    client_rate = np.full(2000, 1000.0)
+    base_rate = 1000.0 - np.arange(2000) * 0.5
+    batch = calculate_margin_batch(client_rate, base_rate, 220)
+    for index, (client, base) in enumerate(zip(client_rate.tolist(), base_rate.tolist())):
+        scalar = calculate_margin(client, base, 220)
+        assert {key: batch[key][index] for key in scalar} == scalar
+    assert round_decimals(0.45, 1) == round(0.45, 1)
+    assert round_decimals(np.array([0.05, 0.15]), 1).tolist() == [round(0.05, 1), round(0.15, 1)]
+
+# ----------
+# WORKING DAYS
+# ----------
+def test_working_days_match_day_walk():
+    rng = random.Random(SEED)
+    starts = [date(2023, 1, 1) + timedelta(days=rng.randint(0, 1500)) for _ in range(SAMPLES)]
+    ends = [start + timedelta(days=rng.randint(-10, 900)) for start in starts]
+    days = [rng.randint(1, 5) for _ in starts]
+    expected = [reference_working_days(*row, HOLIDAYS) for row in zip(starts, ends, days)]
+    assert [calculate_working_days(*row, HOLIDAYS) for row in zip(starts, ends, days)] == expected
+    assert calculate_working_days_batch(starts, ends, days, HOLIDAYS).tolist() == expected
+
+# ----------
+# TAX-YEAR SPLIT AND BULK RUNS
+# ----------
+def test_tax_year_split_matches_scalar():
+    frame = random_placements(random.Random(SEED), 500)
+    split = calculate_placements_by_tax_year(frame, HOLIDAYS).groupby(level=0)["Net Take-Home Pay"].sum()
+    for index, row in frame.iterrows():
+        inside = row["status"] == "Inside IR35"
+        scalar = calculate_by_tax_year(
+            row["client_rate"] * 0.77 / (1.185 if inside else 1), date.fromisoformat(row["start_date"]),
+            date.fromisoformat(row["end_date"]), 5, HOLIDAYS, status=row["status"],
+            pension_contribution_percent=5.0 if inside else 0.0
+        )
+        assert split.get(index, 0) == scalar["Net Take-Home Pay"]
+
+@pytest.mark.parametrize("split_tax_years", [False, True])
+def test_chunked_run_matches_single_chunk(tmp_path, split_tax_years):
+    # A first chunk of "None" student loans reads and writes the same as a single chunk
+    frame = random_placements(random.Random(SEED), 500)
+    frame = frame.assign(student_loan=["None"] * 250 + ["Plan 2"] * (len(frame) - 250))
+    source = str(tmp_path / "placements.csv")
+    frame.to_csv(source, index=False)
+    calculate = calculate_placements_by_tax_year if split_tax_years else calculate_placements
+    outputs = []
+    for chunk_size in (100, len(frame)):
+        output = str(tmp_path / f"results-{chunk_size}.csv")
+        writer = ChunkWriter(output)
+        try:
+            for chunk in read_chunks(source, chunk_size):
+                writer.write(calculate(chunk, HOLIDAYS))
+        finally:
+            writer.close()
+        with open(output, encoding="utf-8") as f:
+            outputs.append(f.read())
+    assert outputs[0] == outputs[1]
+
+# ----------
+# SOLVER
+# ----------
+def test_solved_rate_nets_target():
+    rng = random.Random(SEED)
+    for _ in range(500):
+        status, target = rng.choice(["Inside IR35", "Outside IR35"]), rng.uniform(30000, 200000)
+        solved = solve_client_rate(target, 220, 20, status)
+        net = calculate_scenario("Client Rate", solved["Client Rate"], 20, 220, status)["Results"]["Net Take-Home Pay"]
+        assert abs(net - target) <= 1
+
+def test_unattainable_target_is_flagged():
+    # Below the Outside salary-only take-home there is no rate; the batch flags it rather than returning break-even
+    with pytest.raises(ValueError):
+        solve_client_rate(1000, 220, 20, "Outside IR35")
+    solved = solve_client_rate_batch([1000, 50000], 220, 20, "Outside IR35")
+    assert solved["Attainable"].tolist() == [False, True]
+    assert np.isnan(solved["Client Rate"][0])
@@ -0,0 +1,95 @@
+import io
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from golden_cases import HOLIDAYS
+from ir35_core import calculate_scenario, regional_tax_year
+from ir35_export import (
+    DEDUCTION_FIELDS,
+    MARGIN_FIELDS,
+    WHOLE_EXPORT_FIELDS,
+    ResultWriter,
+    export_bytes,
+    export_format,
+    export_schema,
+    placement_batches,
+    scenario_batch,
+    tax_year_batches
+)
+from ir35_results import RESULT_FIELDS
+from ir35_tax_years import calculate_by_tax_year
+
+PLACEMENTS = pd.DataFrame({
+    "placement_id": ["p1", "p2", "p3"],
+    "client_rate": [500.0, 650.0, 800.0],
+    "start_date": ["2025-04-06", "2025-05-01", "2025-06-01"],
+    "end_date": ["2026-01-01", "2026-03-31", "2025-12-31"],
+    "status": ["Inside IR35", "Outside IR35", "Inside IR35"]
+})
+
+def read(data, format):
+    if format == "parquet":
+        return pq.read_table(io.BytesIO(data))
+    return pa.ipc.open_file(pa.py_buffer(data)).read_all()
+
+def test_schema_fields_and_types():
+    schema = export_schema()
+    numeric = ["Client Rate", "Base Rate"] + RESULT_FIELDS + MARGIN_FIELDS + DEDUCTION_FIELDS
+    assert schema.names == ["Name", "Status", "Tax Year"] + numeric
+    assert len(set(schema.names)) == len(schema.names)
+    for name in ("Name", "Status", "Tax Year"):
+        assert schema.field(name).type == pa.string()
+    for name in numeric:
+        assert schema.field(name).type == (pa.int64() if name in WHOLE_EXPORT_FIELDS else pa.float64())
+    assert schema.field("Margin Percentage").type == pa.float64()
+
+def test_placement_batches_follow_schema():
+    batches = list(placement_batches([PLACEMENTS[:2], PLACEMENTS[2:]], HOLIDAYS))
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    assert all(batch.schema.equals(export_schema()) for batch in batches)
+    table = pa.Table.from_batches(batches)
+    assert table.column("Name").to_pylist() == ["p1", "p2", "p3"]
+    assert table.column("Status").to_pylist() == PLACEMENTS["status"].tolist()
+    # Outside IR35 has no employer deductions
+    assert table.column("Total Employer NI").to_pylist()[1] is None
+    assert table.column("Total Employer NI").null_count == 1
+
+def test_scenario_batch_matches_scenario():
+    label = regional_tax_year("rUK").label
+    scenario = calculate_scenario("Client Rate", 800, 20, 200, tax_year=label)
+    batch = scenario_batch(
+        scenario["Results"], scenario["Client Rate"], scenario["Base Rate"], scenario["Pay Rate"], scenario["Margin"],
+        scenario["Employer Deductions"], label
+    )
+    row = batch.to_pylist()[0]
+    assert (row["Name"], row["Status"], row["Tax Year"]) == ("Scenario", "Inside IR35", label)
+    assert row["Net Take-Home Pay"] == round(scenario["Results"]["Net Take-Home Pay"])
+    assert row["Margin Percentage"] == scenario["Margin"]["Margin Percentage"]
+
+def test_tax_year_batches_give_one_row_per_year():
+    split = calculate_by_tax_year(600, date(2025, 10, 1), date(2026, 9, 30), 5, HOLIDAYS, status="Inside IR35")
+    batches = tax_year_batches(split, 800, 650, 600, "Inside IR35")
+    years = [year["Tax Year"] for year in split["Tax Years"]]
+    assert len(years) == 2
+    assert [batch.column("Tax Year")[0].as_py() for batch in batches] == [f"{year} (rUK)" for year in years]
+    assert [batch.column("Name")[0].as_py() for batch in batches] == [f"Inside IR35 {year}" for year in years]
+
+@pytest.mark.parametrize("format", ["parquet", "feather"])
+def test_export_round_trips(format):
+    batches = list(placement_batches([PLACEMENTS], HOLIDAYS))
+    table = read(export_bytes(batches, format), format)
+    assert table.schema.equals(export_schema())
+    assert table.equals(pa.Table.from_batches(batches))
+
+def test_export_format_from_path():
+    assert [export_format(path) for path in ("out.parquet", "out.FEATHER", "out.arrow", "out.ipc", "out")] == [
+        "parquet", "feather", "feather", "feather", "parquet"
+    ]
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError, match="Unknown export format"):
+        ResultWriter(io.BytesIO(), "csv")
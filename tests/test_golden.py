@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+import ir35_core
+import ir35_pdf
+from golden_cases import GOLDEN_CASES, GOLDEN_PATH, TAX_YEARS_PATH, normalise, tax_year_cases
+
+class CurrentCalculator:
+    calculate_working_days = staticmethod(ir35_core.calculate_working_days)
+    ir35_tax_calculator = staticmethod(ir35_core.ir35_tax_calculator)
+    calculate_dividend_tax = staticmethod(ir35_core.calculate_dividend_tax)
+    calculate_corporation_tax = staticmethod(ir35_core.calculate_corporation_tax)
+    calculate_scenario = staticmethod(ir35_core.calculate_scenario)
+    generate_pdf = staticmethod(ir35_pdf.generate_pdf)
+
+with open(GOLDEN_PATH, encoding="utf-8") as f:
+    GOLDEN = json.load(f)
+
+@pytest.mark.parametrize("name", list(GOLDEN_CASES))
+def test_matches_baseline(name):
+    current = normalise(GOLDEN_CASES[name](CurrentCalculator))
+    assert current.keys() == GOLDEN[name].keys()
+    changed = {case: (GOLDEN[name][case], value) for case, value in current.items() if GOLDEN[name][case] != value}
+    assert not changed
+
+def test_tax_years_unchanged():
+    with open(TAX_YEARS_PATH, encoding="utf-8") as f:
+        pinned = json.load(f)
+    current = normalise(tax_year_cases(ir35_core, ir35_core.TAX_YEARS))
+    assert current.keys() == pinned.keys()
+    changed = {case: (pinned[case], value) for case, value in current.items() if pinned[case] != value}
+    assert not changed
@@ -0,0 +1,56 @@
+from datetime import date
+
+from golden_cases import HOLIDAYS
+from ir35_core import calculate_scenario, calculate_working_days
+from ir35_graph import build_scenario_graph
+
+INPUTS = {
+    "start_date": date(2025, 5, 1), "end_date": date(2025, 12, 1), "days_per_week": 5, "bank_holidays": HOLIDAYS,
+    "calculation_mode": "Client Rate", "rate": 800.0, "margin_percent": 20.0, "status": "Inside IR35",
+    "employer_pension_percent": 3.0, "employee_pension": 5.0, "student_loan": "None", "vat_registered": False,
+    "allowable_expenses": 0.0, "outside_salary": 12570.0, "outside_business_type": None, "dividend_strategy": None,
+    "tax_region": "rUK"
+}
+
+def recomputed(graph, before):
+    return {name for name, count in graph.recompute_counts().items() if count != before[name]}
+
+def test_first_evaluation_computes_every_node():
+    graph = build_scenario_graph().evaluate(INPUTS)
+    assert set(graph.recompute_counts().values()) == {1}
+
+def test_unchanged_inputs_recompute_nothing():
+    graph = build_scenario_graph().evaluate(INPUTS)
+    before = graph.recompute_counts()
+    graph.evaluate(dict(INPUTS))
+    assert recomputed(graph, before) == set()
+
+def test_student_loan_leaves_working_days_and_margin():
+    graph = build_scenario_graph().evaluate(INPUTS)
+    before = graph.recompute_counts()
+    graph.evaluate({**INPUTS, "student_loan": "Plan 2"})
+    assert recomputed(graph, before) == {"tax_years", "results", "salary_optimum"}
+
+def test_margin_change_recomputes_rates_and_dependants():
+    graph = build_scenario_graph().evaluate(INPUTS)
+    before = graph.recompute_counts()
+    graph.evaluate({**INPUTS, "margin_percent": 25.0})
+    assert {"rates", "margin", "employer_deductions"} <= recomputed(graph, before)
+    assert "working_days" not in recomputed(graph, before)
+
+def test_unchanged_result_keeps_downstream_nodes():
+    # Moving the end date from a Saturday to the Sunday leaves the working days as they were
+    graph = build_scenario_graph().evaluate({**INPUTS, "end_date": date(2025, 11, 29)})
+    before = graph.recompute_counts()
+    version = graph.versions("working_days")
+    graph.evaluate({**INPUTS, "end_date": date(2025, 11, 30)})
+    assert calculate_working_days(INPUTS["start_date"], date(2025, 11, 29), 5, HOLIDAYS) == graph.value("working_days")
+    assert graph.versions("working_days") == version
+    assert recomputed(graph, before) == {"working_days", "tax_years"}
+
+def test_values_match_calculate_scenario():
+    graph = build_scenario_graph().evaluate({**INPUTS, "student_loan": "Plan 2", "margin_percent": 25.0})
+    scenario = calculate_scenario("Client Rate", 800.0, 25.0, graph.value("working_days"), "Inside IR35", 5.0, "Plan 2")
+    assert scenario["Results"] == graph.value("results")
+    assert scenario["Margin"] == graph.value("margin")
+    assert scenario["Employer Deductions"] == graph.value("employer_deductions")
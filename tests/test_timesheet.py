@@ -0,0 +1,100 @@
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from golden_cases import STUDENT_LOAN_PLANS
+from ir35_core import TAX_YEARS, ir35_tax_calculator
+from ir35_timesheet import PAYSLIP_FIELDS, ContractorLedger, TimesheetLedger, payslip_frame, run
+
+def epoch_day(day):
+    return (day - date(1970, 1, 1)).days
+
+@pytest.mark.parametrize("label", list(TAX_YEARS))
+def test_year_of_equal_weeks_matches_annual_calculation(label):
+    rng = random.Random(label)
+    bands = TAX_YEARS[label]
+    pay_rate, plan = rng.uniform(100, 1500), rng.choice(STUDENT_LOAN_PLANS)
+    ledger = ContractorLedger("check", pay_rate, 5.0, plan, bands["region"])
+    year_start = date(int(bands["tax_year"][:4]), 4, 6)
+    for week in range(52):
+        for day in range(5):
+            ledger.add(epoch_day(year_start + timedelta(days=(week * 7) + day)), 1.0)
+    ledger.close()
+    totals = ledger.year_to_date()
+    scalar = ir35_tax_calculator(pay_rate, 260, 5.0, plan, tax_year=label)
+    for total, key in (("Income Tax YTD", "Income Tax"), ("Employee NI YTD", "Employee NI"),
+                       ("Student Loan YTD", "Student Loan Repayment"), ("Net Pay YTD", "Net Take-Home Pay")):
+        assert totals[total] == pytest.approx(scalar[key], abs=1)
+
+def test_week_closes_into_one_payslip():
+    ledger = ContractorLedger("c1", 400.0, hours_per_day=8.0)
+    monday = date(2025, 4, 7)
+    assert ledger.add(epoch_day(monday), 1.0) is None
+    assert ledger.add(epoch_day(monday + timedelta(days=1)), hours=4.0) is None
+    payslip = dict(zip(PAYSLIP_FIELDS, ledger.add(epoch_day(monday + timedelta(days=7)), 1.0)))
+    assert payslip["Contractor"] == "c1"
+    assert payslip["Tax Week"] == 1
+    assert payslip["Days"] == 1.5
+    assert payslip["Gross Pay"] == 600.0
+    assert payslip["Gross Pay YTD"] == 600.0
+
+def test_new_tax_year_resets_totals():
+    ledger = ContractorLedger("c1", 400.0)
+    ledger.add(epoch_day(date(2026, 3, 30)), 5.0)
+    payslip = dict(zip(PAYSLIP_FIELDS, ledger.add(epoch_day(date(2026, 4, 6)), 1.0)))
+    assert payslip["Tax Year"] == "2025/26 (rUK)"
+    payslip = dict(zip(PAYSLIP_FIELDS, ledger.close()))
+    assert payslip["Tax Year"] == "2026/27 (rUK)"
+    assert payslip["Tax Week"] == 1
+    assert payslip["Gross Pay YTD"] == 400.0
+
+def test_entries_must_be_in_date_order():
+    ledger = ContractorLedger("c1", 400.0)
+    ledger.add(epoch_day(date(2025, 5, 12)), 1.0)
+    with pytest.raises(ValueError, match="date order"):
+        ledger.add(epoch_day(date(2025, 5, 1)), 1.0)
+
+@pytest.mark.parametrize("terms, message", [
+    ({"student_loan": "Plan 9"}, "Unknown student loan plan"),
+    ({"tax_region": "Wales"}, "Unknown tax region"),
+    ({"hours_per_day": 0}, "Hours per day"),
+    ({"hours_per_day": -7.5}, "Hours per day")
+])
+def test_invalid_terms_are_rejected(terms, message):
+    with pytest.raises(ValueError, match=message):
+        ContractorLedger("c1", 400.0, **terms)
+
+def test_unknown_and_duplicate_contractors_are_rejected():
+    with pytest.raises(ValueError, match="Duplicate contractor"):
+        TimesheetLedger.from_frame(pd.DataFrame({"contractor_id": ["a", "a"], "pay_rate": [400.0, 500.0]}))
+    ledger = TimesheetLedger.from_frame(pd.DataFrame({"contractor_id": ["a"], "pay_rate": [400.0]}))
+    with pytest.raises(ValueError, match="Unknown contractor"):
+        ledger.add("b", date(2025, 5, 1), 1.0)
+
+def test_payslip_frame_writes_iso_week_starts():
+    ledger = ContractorLedger("c1", 400.0)
+    ledger.add(epoch_day(date(2025, 4, 8)), 1.0)
+    frame = payslip_frame([ledger.close()])
+    assert frame.columns.tolist() == PAYSLIP_FIELDS
+    assert frame["Week Start"].tolist() == ["2025-04-06"]
+
+def test_run_writes_payslips(tmp_path):
+    contractors = tmp_path / "contractors.csv"
+    timesheets = tmp_path / "timesheets.csv"
+    output = tmp_path / "payslips.csv"
+    pd.DataFrame({"contractor_id": [1, 2], "client_rate": [600.0, 800.0], "student_loan": ["None", "Plan 2"]}).to_csv(
+        contractors, index=False
+    )
+    # Three working weeks from Monday 7 April 2025, tax weeks 1 to 3
+    days = [day for day in (date(2025, 4, 7) + timedelta(days=offset) for offset in range(19)) if day.weekday() < 5]
+    pd.DataFrame({
+        "contractor_id": [1, 2] * len(days),
+        "date": [day.isoformat() for day in days for _ in range(2)],
+        "days": [1.0] * (2 * len(days))
+    }).to_csv(timesheets, index=False)
+    entries, payslips, _ = run(str(contractors), str(timesheets), str(output), chunk_size=7)
+    assert (entries, payslips) == (30, 6)
+    frame = pd.read_csv(output)
+    assert frame.groupby("Contractor")["Tax Week"].apply(list).to_dict() == {1: [1, 2, 3], 2: [1, 2, 3]}
@@ -0,0 +1,82 @@
+# ======================
+# GOLDEN VALUES
+# golden.json comes from the calculator as it was at the baseline commit, so the tests compare the
+# current code with the original app rather than with itself. tax_years.json pins every configured
+# tax year and region, which the baseline did not have, from the current tree.
+#
+#   python tests/update_golden.py
+# ======================
+
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from golden_cases import GOLDEN_CASES, GOLDEN_PATH, ROOT, TAX_YEARS_PATH, normalise, tax_year_cases
+
+BASELINE_COMMIT = "56dc5e0"
+
+# Deliberate fixes to the baseline's hardcoded 2025/26 config; every other value is the original
+BASELINE_CORRECTIONS = {
+    # Employer NI for 2025/26 is 15% above £5,000, not the 2024/25 13.8% above £9,100
+    "national_insurance": {"employer_secondary_threshold": 5000, "employer_rate": 0.15}
+}
+
+def baseline_calculator():
+    source = subprocess.run(
+        ["git", "show", f"{BASELINE_COMMIT}:ir35_calculator.py"], cwd=ROOT, capture_output=True, check=True
+    ).stdout
+    with tempfile.NamedTemporaryFile("wb", suffix=".py", delete=False) as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location("baseline_calculator", f.name)
+    baseline = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(baseline)
+    Path(f.name).unlink()
+    for section, values in BASELINE_CORRECTIONS.items():
+        baseline.TAX_YEAR_CONFIG[section].update(values)
+    # The employer deductions read the pension rate from the session, as the app set it
+    baseline.st.session_state.employer_pension_percent = 3.0
+
+    def calculate_scenario(calculation_mode, rate, margin_percent, working_days, status, student_loan_plan):
+        base_rate = baseline.calculate_base_rate(rate, margin_percent)
+        pay_rate = baseline.calculate_pay_rate(base_rate, status)
+        return {
+            "Client Rate": rate,
+            "Base Rate": base_rate,
+            "Pay Rate": pay_rate,
+            "Results": baseline.ir35_tax_calculator(pay_rate, working_days, 5, student_loan_plan, status),
+            "Margin": baseline.calculate_margin(rate, base_rate, working_days),
+            "Employer Deductions": (
+                baseline.calculate_employer_deductions(base_rate, working_days) if status == "Inside IR35" else None
+            )
+        }
+
+    return SimpleNamespace(
+        calculate_working_days=baseline.calculate_working_days,
+        ir35_tax_calculator=baseline.ir35_tax_calculator,
+        calculate_dividend_tax=baseline.calculate_dividend_tax,
+        calculate_corporation_tax=baseline.calculate_corporation_tax,
+        calculate_scenario=calculate_scenario,
+        generate_pdf=baseline.generate_pdf
+    )
+
+def main():
+    import ir35_core
+
+    calculator = baseline_calculator()
+    golden = {name: normalise(build(calculator)) for name, build in GOLDEN_CASES.items()}
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        json.dump(golden, f, indent=1, sort_keys=True)
+    print(f"golden values from {BASELINE_COMMIT} written to {GOLDEN_PATH}")
+
+    with open(TAX_YEARS_PATH, "w", encoding="utf-8") as f:
+        json.dump(normalise(tax_year_cases(ir35_core, ir35_core.TAX_YEARS)), f, indent=1, sort_keys=True)
+    print(f"tax year values written to {TAX_YEARS_PATH}")
+
+if __name__ == "__main__":
+    main()